@@ -2,8 +2,9 @@ import logging
 import uuid
 import json
 from datetime import datetime
-from typing import Dict, List, Literal, Optional, Any
+from typing import Callable, Dict, List, Literal, Optional, Any
 from langgraph.graph import StateGraph, START, END
+from langgraph.config import get_stream_writer
 from nexus_insight.cognition.state import ResearchState, RawSource, Claim, Citation, ThoughtEntry
 from nexus_insight.cognition.prompts import Prompts
 from nexus_insight.infra.llm_router import LLMRouter
@@ -90,7 +91,7 @@ class Orchestrator:
     @trace_node("intake")
     async def node_intake(self, state: ResearchState) -> Dict:
         # Redact PII from user query
-        redacted_query = self.privacy_service.redact(state['query'])
+        redacted_query = await self.privacy_service.aredact(state['query'])
         
         llm = await self.llm_router.get_llm("fast")
         prompt = Prompts.INTAKE_PROMPT + f"\n\nUser Query: {redacted_query}"
@@ -147,7 +148,9 @@ class Orchestrator:
             queries=state["query_refinements"],
             modalities=modalities,
             pdf_urls=state.get("structured_output", {}).get("pdf_urls"),
-            video_urls=state.get("structured_output", {}).get("video_urls")
+            video_urls=state.get("structured_output", {}).get("video_urls"),
+            session_id=state.get("session_id"),
+            on_transcript=self._transcript_listener()
         )
         return {
             "raw_sources": sources,
@@ -160,6 +163,31 @@ class Orchestrator:
             )]
         }
 
+    @staticmethod
+    def _stream_writer() -> Callable[[Dict[str, Any]], None]:
+        """Writer for "custom" stream events from inside a node; a no-op outside a graph run"""
+        try:
+            return get_stream_writer()
+        except RuntimeError:
+            return lambda _: None
+
+    def _transcript_listener(self):
+        """
+        Forwards transcript lines to stream clients as they are decoded ("custom" stream
+        events) and starts claim extraction as soon as a transcript's first window is final.
+        """
+        write = self._stream_writer()
+
+        def on_transcript(source: RawSource, lines: List[str]):
+            write({"event": "progress", "data": {
+                "node": "explore",
+                "backend": "whisper",
+                "transcript": {"source_id": source.id, "url": source.url, "lines": lines}
+            }})
+            self.verifier.prefetch_claims(source)
+
+        return on_transcript
+
     @with_circuit_breaker("analyze")
     @trace_node("analyze")
     async def node_analyze(self, state: ResearchState) -> Dict:
@@ -175,7 +203,7 @@ class Orchestrator:
         verified, contr, tokens = await self.verifier.verify_claims(
             state["extracted_claims"], 
             state["raw_sources"],
-            search_func=self.researcher.pdf_tool.query_index
+            batch_search_func=self.researcher.pdf_tool.aquery_index_batch
         )
         
         # Calculate confidence
@@ -245,7 +273,12 @@ class Orchestrator:
     @trace_node("build_graph")
     async def node_build_graph(self, state: ResearchState) -> Dict[str, Any]:
         """EXTRACT entities and relationships for knowledge graph"""
-        res = await self.graph_extractor.extract_and_build(state.get("raw_sources", []), state["query"])
+        write = self._stream_writer()
+        res = await self.graph_extractor.extract_and_build(
+            state.get("raw_sources", []), state["query"], session_id=state.get("session_id"),
+            # Stream clients patch their view as each source's entities land
+            on_delta=lambda delta: write({"event": "graph", "data": delta})
+        )
         return {
             "graph_summary": res["summary"],
             "graph_data": res["data"],
@@ -325,4 +358,11 @@ class Orchestrator:
                 access_date=datetime.now().date(),
                 formatted_citation=f"{s.metadata.get('title', 'Unknown')}. Retrieved from {s.url}"
             ))
+        if state.get("session_id"):
+            await self.release_session(state["session_id"])
         return {"citations": citations, "current_node": "END"}
+
+    async def release_session(self, session_id: str):
+        """Free everything the session held: pinned indices, media jobs, its knowledge graph"""
+        await self.researcher.release_session(session_id)
+        self.graph_extractor.release_session(session_id)
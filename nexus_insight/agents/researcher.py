@@ -1,10 +1,13 @@
 import logging
 import asyncio
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional, Callable
 from nexus_insight.cognition.state import RawSource, ResearchState
-from nexus_insight.tools.web_search import WebSearchTool
+from nexus_insight.tools.web_search import WebSearchTool, normalize_url
 from nexus_insight.tools.pdf_engine import PDFEngine
 from nexus_insight.tools.media_analyzer import MediaAnalyzer
+from nexus_insight.cognition.fingerprint import NearDuplicateDetector
+from nexus_insight.config import settings
 
 from nexus_insight.tools.arxiv_tool import ArxivTool
 from nexus_insight.tools.pubmed_tool import PubmedTool
@@ -29,27 +32,41 @@ class ResearcherAgent:
         self.media_tool = media_tool
         self.arxiv_tool = arxiv_tool or ArxivTool()
         self.pubmed_tool = pubmed_tool or PubmedTool()
+        self.deduplicator = NearDuplicateDetector(threshold=settings.SOURCE_DEDUP_THRESHOLD)
 
-    async def explore(self, queries: List[str], modalities: List[str], pdf_urls: List[str] = None, video_urls: List[str] = None) -> List[RawSource]:
+    async def explore(
+        self,
+        queries: List[str],
+        modalities: List[str],
+        pdf_urls: List[str] = None,
+        video_urls: List[str] = None,
+        session_id: Optional[str] = None,
+        on_transcript: Optional[Callable[[RawSource, List[str]], None]] = None
+    ) -> List[RawSource]:
         """
         Parallel async execution of research tools.
+        `on_transcript` follows video transcripts while they are decoded.
         """
         tasks = []
+        queries = self._collapse_queries(queries)
 
-        # 1. Web Search
+        # 1. Web Search: gather all hits first so each unique URL is fetched once
         if "web" in modalities:
-            for q in queries:
-                tasks.append(self.web_tool.search(q))
+            tasks.append(self._explore_web(queries))
 
         # 2. PDF Processing
         if "pdf" in modalities and pdf_urls:
-            for url in pdf_urls:
-                tasks.append(self.pdf_tool.process_source(url))
+            for url in dict.fromkeys(pdf_urls):
+                tasks.append(self.pdf_tool.process_source(url, session_id=session_id))
+
+        # 2b. Document library: earlier PDFs matching the queries (GLOBAL_INDEX_ENABLED)
+        if "pdf" in modalities:
+            tasks.append(self.pdf_tool.library_sources(queries, settings.LIBRARY_SOURCES, session_id=session_id))
 
         # 3. Media Processing
         if "video" in modalities and video_urls:
-            for url in video_urls:
-                tasks.append(self.media_tool.process_video(url))
+            for url in dict.fromkeys(video_urls):
+                tasks.append(self.media_tool.process_video(url, session_id=session_id, on_transcript=on_transcript))
 
         # 4. Academic (arXiv + PubMed)
         if "academic" in modalities:
@@ -62,12 +79,61 @@ class ResearcherAgent:
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         all_sources = []
+        seen_urls = set()
+        seen_ids = set()
         for res in results:
-            if isinstance(res, list):
-                all_sources.extend(res)
-            elif isinstance(res, RawSource):
-                all_sources.append(res)
-            elif isinstance(res, Exception):
+            if isinstance(res, Exception):
                 logger.error(f"Tool execution failed: {res}")
+                continue
+            for source in (res if isinstance(res, list) else [res]):
+                if not isinstance(source, RawSource):
+                    continue
+                # The same paper or page can come back from several tools/sub-queries
+                # (an uploaded PDF may also come back from the library, under its own id)
+                key = normalize_url(source.url)
+                if key in seen_urls or source.id in seen_ids:
+                    continue
+                seen_urls.add(key)
+                seen_ids.add(source.id)
+                all_sources.append(source)
         
-        return all_sources
+        # Mirrors and syndicated copies would each cost a full claim extraction
+        return self.deduplicator.deduplicate(all_sources)
+
+    async def release_session(self, session_id: str):
+        """Release per-session resources held by the tools (pinned PDF indices, media jobs)."""
+        self.pdf_tool.release_session(session_id)
+        self.media_tool.release_session(session_id)
+
+    async def _explore_web(self, queries: List[str]) -> List[RawSource]:
+        """Run all searches, merge hits across sub-queries by normalized URL, then fetch."""
+        hit_lists = await asyncio.gather(*[self.web_tool.search_hits(q) for q in queries], return_exceptions=True)
+
+        unique_hits: Dict[str, Dict[str, Any]] = {}
+        total_hits = 0
+        for q, hits in zip(queries, hit_lists):
+            if isinstance(hits, Exception):
+                logger.error(f"Web search failed for '{q}': {hits}")
+                continue
+            total_hits += len(hits)
+            for hit in hits:
+                unique_hits.setdefault(normalize_url(hit["url"]), hit)
+
+        logger.info(f"Web search returned {total_hits} hits, {len(unique_hits)} unique URLs")
+        return await self.web_tool.fetch_many(list(unique_hits.values()))
+
+    @staticmethod
+    def _collapse_queries(queries: List[str], threshold: float = 0.8) -> List[str]:
+        """Drop sub-queries whose token set is near-identical (Jaccard >= threshold) to an earlier one."""
+        kept: List[str] = []
+        kept_tokens: List[set] = []
+        for q in queries:
+            tokens = set(re.findall(r"\w+", q.lower()))
+            if not tokens:
+                continue
+            if any(len(tokens & other) / len(tokens | other) >= threshold for other in kept_tokens):
+                logger.debug(f"Collapsing near-duplicate sub-query: {q}")
+                continue
+            kept.append(q)
+            kept_tokens.append(tokens)
+        return kept
@@ -1,9 +1,12 @@
+import asyncio
+import hashlib
 import logging
 import json
 from typing import List, Dict, Any, Optional, Callable
 from nexus_insight.cognition.state import Claim, RawSource, Contradiction, ContradictionSeverity, SourceType
 from nexus_insight.cognition.prompts import Prompts
 from nexus_insight.infra.llm_router import LLMRouter
+from nexus_insight.infra.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +15,36 @@ class ChainOfVerificationVerifier:
     Implements the 4-phase Chain-of-Verification (CoV) pattern.
     """
 
+    # Claim extraction only reads this much of a source
+    EXTRACTION_WINDOW = 10000
+
     def __init__(self, llm_router: LLMRouter):
         self.llm_router = llm_router
+        # Extractions started before the source was final, keyed by (source id, window hash)
+        self._prefetched = TTLCache(max_size=256, ttl=3600.0)
+
+    def _window_key(self, source: RawSource) -> tuple[str, str]:
+        window = source.content[:self.EXTRACTION_WINDOW]
+        return source.id, hashlib.blake2b(window.encode(), digest_size=16).hexdigest()
+
+    def prefetch_claims(self, source: RawSource) -> bool:
+        """
+        Starts claim extraction for a source that is still growing (a transcript being
+        decoded) once its extraction window is full, since the final source will produce
+        the same prompt. extract_claims later picks up the result instead of re-running it.
+        """
+        if len(source.content) < self.EXTRACTION_WINDOW:
+            return False
+        key = self._window_key(source)
+        if self._prefetched.get(key) is not None:
+            return False
+        self._prefetched.set(key, asyncio.ensure_future(self._prefetch(source)))
+        logger.info(f"Started early claim extraction for {source.id}")
+        return True
+
+    async def _prefetch(self, source: RawSource) -> tuple[List[Claim], int]:
+        llm = await self.llm_router.get_llm("reasoning")
+        return await self._extract_source(source, llm)
 
     async def extract_claims(self, sources: List[RawSource]) -> tuple[List[Claim], int]:
         """PHASE 1: Atomic Claim Extraction"""
@@ -24,30 +55,39 @@ class ChainOfVerificationVerifier:
         for source in sources:
             if not source.content:
                 continue
-                
-            prompt = Prompts.CLAIM_EXTRACTION_PROMPT + f"\n\nSource Content: {source.content[:10000]}"
-            try:
-                response = await llm.ainvoke(prompt)
-                total_tokens += response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
-                data = json.loads(response.content)
-                for c in data.get("claims", []):
-                    all_claims.append(Claim(
-                        id=f"claim-{hash(c['content'])}",
-                        content=c["content"],
-                        source_id=source.id,
-                        confidence=c.get("confidence", 0.5),
-                        supporting_quotes=c.get("quotes", [])
-                    ))
-            except Exception as e:
-                logger.error(f"Claim extraction failed for source {source.id}: {e}")
+
+            early = self._prefetched.pop(self._window_key(source))
+            claims, tokens = await (early if early is not None else self._extract_source(source, llm))
+            all_claims.extend(claims)
+            total_tokens += tokens
                 
         return all_claims, total_tokens
 
+    async def _extract_source(self, source: RawSource, llm) -> tuple[List[Claim], int]:
+        claims, tokens = [], 0
+        prompt = Prompts.CLAIM_EXTRACTION_PROMPT + f"\n\nSource Content: {source.content[:self.EXTRACTION_WINDOW]}"
+        try:
+            response = await llm.ainvoke(prompt)
+            tokens = response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
+            data = json.loads(response.content)
+            for c in data.get("claims", []):
+                claims.append(Claim(
+                    id=f"claim-{hash(c['content'])}",
+                    content=c["content"],
+                    source_id=source.id,
+                    confidence=c.get("confidence", 0.5),
+                    supporting_quotes=c.get("quotes", [])
+                ))
+        except Exception as e:
+            logger.error(f"Claim extraction failed for source {source.id}: {e}")
+        return claims, tokens
+
     async def verify_claims(
         self, 
         claims: List[Claim], 
         sources: List[RawSource],
-        search_func: Optional[Callable] = None
+        search_func: Optional[Callable] = None,
+        batch_search_func: Optional[Callable] = None
     ) -> tuple[List[Claim], List[Contradiction], int]:
         """PHASES 2, 3, & 4: Question Gen, Independent Verif, Final Decision"""
         verified_claims = []
@@ -58,28 +98,32 @@ class ChainOfVerificationVerifier:
         
         source_map = {s.id: s for s in sources}
 
+        # Phase 2: Question Generation for every claim first, so PDF retrieval can be batched
+        pending = []
         for claim in claims:
-            # Phase 2: Question Generation
             questions, q_tokens = await self._generate_questions(claim, llm_fast)
             total_tokens += q_tokens
-            
-            source = source_map.get(claim.source_id)
-            if not source:
-                continue
+            if claim.source_id in source_map:
+                pending.append((claim, questions))
+
+        pdf_hits = await self._retrieve_pdf_context(pending, sources, search_func, batch_search_func)
+        deep_search = bool(search_func or batch_search_func)
+
+        for (claim, questions), claim_hits in zip(pending, pdf_hits):
+            source = source_map[claim.source_id]
 
             # PHASE 3: Independent Verification (Anti-anchoring)
             # Logic: Check claim against ALL sources EXCEPT the origin source.
             other_sources = [s for s in sources if s.id != claim.source_id]
             
             results = []
-            for q in questions:
+            for q, hits in zip(questions, claim_hits):
                 # Find the best context from other sources
                 context = ""
                 for osource in other_sources:
-                    if osource.source_type == SourceType.PDF and search_func:
+                    if osource.source_type == SourceType.PDF and deep_search:
                         # Use deep search for PDFs
-                        chunks = search_func(osource.id, q)
-                        context += "\n".join(chunks)
+                        context += self._format_chunks(hits.get(osource.id, []))
                     else:
                         # Use stored snippet for web/other
                         context += osource.content or ""
@@ -104,6 +148,46 @@ class ChainOfVerificationVerifier:
                 
         return verified_claims, contradictions, total_tokens
 
+    async def _retrieve_pdf_context(
+        self,
+        pending: List[tuple[Claim, List[str]]],
+        sources: List[RawSource],
+        search_func: Optional[Callable],
+        batch_search_func: Optional[Callable]
+    ) -> List[List[Dict[str, List[str]]]]:
+        """
+        Per claim, per question: {pdf_source_id: chunks}, never searching the claim's origin.
+        With batch_search_func every question is embedded and searched in one call.
+        """
+        pdf_ids = [s.id for s in sources if s.source_type == SourceType.PDF]
+        empty = [[{} for _ in questions] for _, questions in pending]
+        if not pdf_ids or not (search_func or batch_search_func):
+            return empty
+
+        if batch_search_func:
+            flat_questions = [q for _, questions in pending for q in questions]
+            flat_exclude = [{claim.source_id} for claim, questions in pending for _ in questions]
+            try:
+                flat_hits = await batch_search_func(pdf_ids, flat_questions, exclude=flat_exclude)
+            except Exception as e:
+                logger.error(f"Batched PDF retrieval failed: {e}")
+                return empty
+            hits_iter = iter(flat_hits)
+            return [[next(hits_iter) for _ in questions] for _, questions in pending]
+
+        return [
+            [{sid: search_func(sid, q) for sid in pdf_ids if sid != claim.source_id} for q in questions]
+            for claim, questions in pending
+        ]
+
+    @staticmethod
+    def _format_chunks(chunks: List[str]) -> str:
+        """Join retrieved chunks, prefixing page citations where the chunk carries one"""
+        return "\n".join(
+            f"[p. {chunk.page}] {chunk}" if getattr(chunk, "page", None) else chunk
+            for chunk in chunks
+        )
+
     async def _generate_questions(self, claim: Claim, llm) -> tuple[List[str], int]:
         prompt = Prompts.VERIFICATION_QUESTION_PROMPT + f"\n\nClaim: {claim.content}"
         try:
@@ -1,7 +1,9 @@
 import uuid
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+from fastapi.responses import JSONResponse
 from sse_starlette.sse import EventSourceResponse
 from nexus_insight.api.schemas import ResearchRequest, FinalReport, SSEEvent
 from nexus_insight.api.auth import validate_api_key
@@ -11,6 +13,7 @@ from nexus_insight.agents.orchestrator import Orchestrator
 from nexus_insight.infra.llm_router import LLMRouter
 from nexus_insight.infra.cost_tracker import CostTracker
 from nexus_insight.cognition.memory import MemoryManager
+from nexus_insight.infra.warmup import WarmupManager
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1", tags=["research"])
@@ -18,13 +21,31 @@ router = APIRouter(prefix="/v1", tags=["research"])
 # These would typically be injected via a dependency injection framework
 # For this implementation, we assume they are initialized and available
 _orchestrator: Optional[Orchestrator] = None
-_llm_router = LLMRouter()
-_memory_manager = MemoryManager()
+_llm_router: Optional[LLMRouter] = None
+_memory_manager: Optional[MemoryManager] = None
+_warmup: Optional[WarmupManager] = None
 
 def set_orchestrator(orch: Orchestrator):
     global _orchestrator
     _orchestrator = orch
 
+def set_warmup(warmup: WarmupManager):
+    global _warmup
+    _warmup = warmup
+
+def _get_llm_router() -> LLMRouter:
+    # Built on first use so importing the routes module stays cheap
+    global _llm_router
+    if _llm_router is None:
+        _llm_router = _orchestrator.llm_router if _orchestrator else LLMRouter()
+    return _llm_router
+
+def _get_memory_manager() -> MemoryManager:
+    global _memory_manager
+    if _memory_manager is None:
+        _memory_manager = MemoryManager()
+    return _memory_manager
+
 @router.post("/research")
 @router.get("/research")
 async def start_research(
@@ -94,8 +115,12 @@ async def start_research(
     if is_stream:
         return EventSourceResponse(sse_generator(_run_research_stream(initial_state)))
     else:
-        result = await _orchestrator.graph.ainvoke(initial_state, config={"recursion_limit": 100})
-        _memory_manager.save_session(result)
+        try:
+            result = await _orchestrator.graph.ainvoke(initial_state, config={"recursion_limit": 100})
+        finally:
+            # Failed runs never reach finalize; free media jobs, pinned indices and the graph
+            await _orchestrator.release_session(session_id)
+        _get_memory_manager().save_session(result)
         return result
 
 async def _run_research_stream(state: ResearchState):
@@ -105,7 +130,13 @@ async def _run_research_stream(state: ResearchState):
     """
     full_state = state.copy()
     try:
-        async for output in _orchestrator.graph.astream(state, stream_mode="updates", config={"recursion_limit": 100}):
+        async for mode, output in _orchestrator.graph.astream(state, stream_mode=["updates", "custom"], config={"recursion_limit": 100}):
+            if mode == "custom":
+                # Emitted from inside a node, e.g. transcript lines while a video is decoded or
+                # knowledge-graph deltas while entities are extracted (the only graph events)
+                yield SSEEvent(**output)
+                continue
+
             # Accumulate updates into full_state
             for node_name, node_data in output.items():
                 for key, value in node_data.items():
@@ -124,9 +155,6 @@ async def _run_research_stream(state: ResearchState):
                         yield SSEEvent(event="source", data={"id": s.id, "type": s.source_type, "url": s.url})
                 
                 yield SSEEvent(event="progress", data={"node": node_name, "backend": "groq"})
-                
-                if "graph_data" in node_data:
-                    yield SSEEvent(event="graph", data=node_data["graph_data"])
 
                 if node_name == "finalize":
                     yield SSEEvent(event="result", data={
@@ -136,17 +164,22 @@ async def _run_research_stream(state: ResearchState):
                         "confidence_score": full_state.get("confidence_score", 0.0),
                         "faithfulness_score": full_state.get("faithfulness_score", 0.0),
                         "citations": [c.model_dump() for c in full_state.get("citations", [])],
-                        "total_tokens": full_state["total_tokens_used"],
-                        "graph": full_state.get("graph_data")
+                        "total_tokens": full_state["total_tokens_used"]
                     })
 
+    except (asyncio.CancelledError, GeneratorExit):
+        logger.info(f"Research stream {state['session_id']} closed by client")
+        raise
     except Exception as e:
         logger.error(f"Error in research stream: {e}")
         yield SSEEvent(event="error", data={"message": str(e)})
+    finally:
+        # Finished, failed or disconnected: stop media jobs, unpin indices nobody else needs, drop the graph
+        await _orchestrator.release_session(state["session_id"])
 
 @router.get("/session/{session_id}")
 async def get_session(session_id: str, api_key: str = Depends(validate_api_key)):
-    session = _memory_manager.load_session(session_id)
+    session = _get_memory_manager().load_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
@@ -155,5 +188,14 @@ async def get_session(session_id: str, api_key: str = Depends(validate_api_key))
 async def health_check():
     return {
         "status": "ok",
-        "backends": await _llm_router.get_backend_info()
+        "backends": await _get_llm_router().get_backend_info(),
+        "embedding": _orchestrator.researcher.pdf_tool.embeddings.get_stats() if _orchestrator else None
     }
+
+@router.get("/ready")
+async def readiness_check():
+    """503 until startup warm-up has finished; /health only reports liveness"""
+    if not _orchestrator or not _warmup:
+        return JSONResponse(status_code=503, content={"ready": False, "components": {}})
+    status = _warmup.get_status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
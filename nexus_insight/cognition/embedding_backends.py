@@ -0,0 +1,50 @@
+import re
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+Backend = Literal["torch", "onnx-int8"]
+
+def load_sentence_transformer(model_name: str, backend: Backend, onnx_dir: str = "", quantization: str = "avx2") -> "SentenceTransformer":
+    """
+    Loads `model_name` on the requested backend.
+
+    "onnx-int8" exports the model to ONNX once, applies dynamic int8 quantization for
+    the given CPU instruction set ("avx2", "avx512", "avx512_vnni", "arm64") and keeps the
+    result under `onnx_dir`, so later loads skip the export. Needs `optimum[onnxruntime]`.
+    """
+    # Imported here: torch/transformers dominate service import time otherwise
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    local_dir = Path(onnx_dir) / re.sub(r"[^\w.-]+", "_", model_name)
+    quantized = _find_quantized(local_dir, quantization)
+    if quantized is None:
+        # Deferred import: only needed for the one-time export
+        from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+        logger.info(f"Exporting {model_name} to int8 ONNX ({quantization}) in {local_dir}")
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save(str(local_dir))
+        export_dynamic_quantized_onnx_model(onnx_model, quantization, str(local_dir))
+        quantized = _find_quantized(local_dir, quantization)
+        if quantized is None:
+            raise RuntimeError(f"Quantized ONNX export of {model_name} produced no model file")
+
+    logger.info(f"Loading int8 ONNX model {quantized}")
+    return SentenceTransformer(
+        str(local_dir),
+        backend="onnx",
+        model_kwargs={"file_name": str(quantized.relative_to(local_dir))}
+    )
+
+def _find_quantized(local_dir: Path, quantization: str):
+    matches = sorted(local_dir.glob(f"onnx/model_*int8_{quantization}.onnx"))
+    return matches[0] if matches else None
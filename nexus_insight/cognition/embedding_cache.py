@@ -0,0 +1,121 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from nexus_insight.infra.concurrency import FileLock
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 16
+
+def content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=KEY_BYTES).digest()
+
+class EmbeddingCache:
+    """
+    Persistent text -> vector cache for one embedding model.
+
+    `<root>/<model>/vectors.f16` is an append-only float16 matrix read through a
+    memory map; `keys.bin` holds one content hash per row and is appended after the
+    vectors, so a key on disk always points at a complete row. Appends happen under
+    an flock, and every process catches up on rows other processes added before
+    reading, so worker processes share one cache.
+    """
+
+    def __init__(self, root: str, model_name: str):
+        self.root = Path(root) / re.sub(r"[^\w.-]+", "_", model_name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._n_rows = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """float32 vector per key, or None where the key is not cached"""
+        with self._lock:
+            self._refresh()
+            rows = [self._rows.get(key) for key in keys]
+            found = [r for r in rows if r is not None]
+            self.hits += len(found)
+            self.misses += len(rows) - len(found)
+            if not found:
+                return [None] * len(rows)
+            vectors = self._mapped()
+            return [None if r is None else vectors[r].astype(np.float32) for r in rows]
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float16)
+        with self._lock, FileLock(self.root / ".lock"):
+            if self.dim is None:
+                self._refresh()
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                (self.root / "meta.json").write_text(json.dumps({"model": self.model_name, "dim": self.dim}))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-d vectors for {self.model_name}, got {vectors.shape[1]}")
+            self._refresh()
+
+            fresh: Dict[bytes, int] = {}
+            for i, key in enumerate(keys):
+                if key not in self._rows and key not in fresh:
+                    fresh[key] = i
+            if not fresh:
+                return
+
+            vectors_path = self.root / "vectors.f16"
+            keys_path = self.root / "keys.bin"
+            # Drop vector rows a crashed writer appended without their keys, and a key it
+            # left half-written (it would shift every key appended after it)
+            if vectors_path.exists() and vectors_path.stat().st_size > self._n_rows * self.dim * 2:
+                os.truncate(vectors_path, self._n_rows * self.dim * 2)
+            if keys_path.exists() and keys_path.stat().st_size > self._n_rows * KEY_BYTES:
+                os.truncate(keys_path, self._n_rows * KEY_BYTES)
+            with open(vectors_path, "ab") as f:
+                vectors[list(fresh.values())].tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+            with open(keys_path, "ab") as f:
+                f.write(b"".join(fresh))
+            self._refresh()
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "entries": self._n_rows,
+                "bytes": self._n_rows * (self.dim or 0) * 2,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def _refresh(self):
+        """Index keys appended (by any process) since the last refresh"""
+        if self.dim is None:
+            try:
+                self.dim = json.loads((self.root / "meta.json").read_text())["dim"]
+            except (OSError, ValueError, KeyError):
+                return
+        path = self.root / "keys.bin"
+        if not path.exists() or path.stat().st_size < (self._n_rows + 1) * KEY_BYTES:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._n_rows * KEY_BYTES)
+            tail = f.read()
+        tail = tail[:len(tail) - len(tail) % KEY_BYTES]
+        for i in range(0, len(tail), KEY_BYTES):
+            self._rows.setdefault(tail[i:i + KEY_BYTES], self._n_rows)
+            self._n_rows += 1
+
+    def _mapped(self) -> np.memmap:
+        if self._vectors is None or len(self._vectors) < self._n_rows:
+            self._vectors = np.memmap(self.root / "vectors.f16", dtype=np.float16, mode="r", shape=(self._n_rows, self.dim))
+        return self._vectors
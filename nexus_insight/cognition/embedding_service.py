@@ -0,0 +1,159 @@
+import time
+import queue
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Literal, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Kind = Literal["query", "document", "warmup"]
+
+class _Request:
+    __slots__ = ("kind", "texts", "future")
+
+    def __init__(self, kind: Kind, texts: List[str]):
+        self.kind = kind
+        self.texts = texts
+        self.future: Future = Future()
+
+class EmbeddingService:
+    """
+    Micro-batching front end for an embedder.
+
+    Requests from any thread or event loop are queued; one worker thread, the only
+    thread that touches the model, waits up to `max_wait_ms` after the first request
+    (or until `max_batch` texts are queued) and runs a single encode per kind
+    (queries / documents) for the whole batch, then hands each caller its rows.
+    """
+
+    def __init__(self, embedder, max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.SimpleQueue[Optional[_Request]]" = queue.SimpleQueue()
+        self._stats_lock = threading.Lock()
+        self._queued_texts = 0
+        self._batches = 0
+        self._batch_sizes: Dict[int, int] = {}
+        self._queue_depths: Dict[int, int] = {}
+        self._worker = threading.Thread(target=self._run, name="nexus-embed", daemon=True)
+        self._worker.start()
+
+    # ---- submission -------------------------------------------------------
+
+    def submit(self, texts: List[str], kind: Kind = "query") -> Future:
+        request = _Request(kind, list(texts))
+        with self._stats_lock:
+            self._queued_texts += len(request.texts)
+        self._queue.put(request)
+        return request.future
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Blocking, for callers already off the event loop"""
+        return self.submit(texts, "query").result()
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return self.submit(texts, "document").result()
+
+    async def aembed_queries(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts, "query"))
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        return (await self.aembed_queries([text]))[0]
+
+    async def aembed_documents(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.wrap_future(self.submit(texts, "document"))
+
+    def warm_up(self) -> Future:
+        """Load the model on the worker thread without blocking the caller"""
+        return self.submit([], "warmup")
+
+    def close(self):
+        self._queue.put(None)
+
+    def get_stats(self) -> Dict:
+        """Queue depth (texts waiting) and power-of-two histograms of batch sizes and queue depth per batch"""
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queued_texts,
+                "batches": self._batches,
+                "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+                "queue_depth_histogram": dict(sorted(self._queue_depths.items()))
+            }
+
+    # ---- worker -----------------------------------------------------------
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._record(batch, size)
+            for kind in ("warmup", "query", "document"):
+                group = [r for r in batch if r.kind == kind]
+                if group:
+                    self._process(kind, group)
+            if stop:
+                return
+
+    def _process(self, kind: Kind, group: List[_Request]):
+        # Callers may have cancelled while queued
+        group = [r for r in group if r.future.set_running_or_notify_cancel()]
+        if not group:
+            return
+        try:
+            if kind == "warmup":
+                self.embedder.get_dimension()
+                for request in group:
+                    request.future.set_result(None)
+                return
+            texts = [t for r in group for t in r.texts]
+            if not texts:
+                vectors = np.empty((0, self.embedder.get_dimension()), dtype="float32")
+            elif kind == "query":
+                vectors = self.embedder.embed_queries(texts)
+            else:
+                vectors = self.embedder.encode_documents(texts)
+            vectors = np.asarray(vectors, dtype="float32")
+            start = 0
+            for request in group:
+                end = start + len(request.texts)
+                request.future.set_result(vectors[start:end])
+                start = end
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(group)} {kind} requests failed: {e}")
+            for request in group:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def _record(self, batch: List[_Request], size: int):
+        with self._stats_lock:
+            self._queue_depths[_bucket(self._queued_texts)] = self._queue_depths.get(_bucket(self._queued_texts), 0) + 1
+            self._queued_texts -= size
+            self._batches += 1
+            self._batch_sizes[_bucket(size)] = self._batch_sizes.get(_bucket(size), 0) + 1
+
+def _bucket(n: int) -> int:
+    """Smallest power of two >= n (0 stays 0)"""
+    return 1 << (n - 1).bit_length() if n > 0 else 0
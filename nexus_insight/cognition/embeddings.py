@@ -1,56 +1,132 @@
 import logging
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+from typing import TYPE_CHECKING, List, Dict, Optional
+import numpy as np
+from nexus_insight.cognition.embedding_cache import EmbeddingCache, content_key
+from nexus_insight.cognition.embedding_backends import Backend, load_sentence_transformer
 from nexus_insight.config import settings
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = logging.getLogger(__name__)
 
+def truncate_embeddings(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """Keep the leading `dim` components (Matryoshka-style) and re-normalize"""
+    vectors = np.ascontiguousarray(vectors[:, :dim], dtype="float32")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
 class LocalEmbedder:
     """
     Wraps sentence-transformers for local, free embedding generation.
     No API key required. Models downloaded once and cached locally.
+    The backend ("torch" or "onnx-int8") comes from EMBEDDING_BACKEND unless given.
+    Vectors are returned as float32 NumPy matrices, optionally truncated to
+    EMBEDDING_TRUNCATE_DIM leading dimensions.
     """
     
-    def __init__(self):
+    def __init__(self, backend: Optional[Backend] = None, use_cache: bool = True):
         self._model = None
         self.model_name = settings.EMBEDDING_MODEL
         self.fallback_model_name = settings.EMBEDDING_FALLBACK
+        self.backend: Backend = backend or settings.EMBEDDING_BACKEND
+        self.use_cache = use_cache
+        self.truncate_dim = settings.EMBEDDING_TRUNCATE_DIM
+        self._cache: Optional[EmbeddingCache] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
 
-    def _load_model(self) -> SentenceTransformer:
+    def _load_model(self) -> "SentenceTransformer":
         """Load on first call, cache in self._model"""
         if self._model is None:
             try:
-                logger.info(f"Loading embedding model: {self.model_name}")
-                self._model = SentenceTransformer(self.model_name)
+                logger.info(f"Loading embedding model: {self.model_name} ({self.backend})")
+                self._model = self._load_backend(self.model_name)
             except Exception as e:
                 logger.warning(f"Failed to load primary model {self.model_name}: {e}. Falling back to {self.fallback_model_name}")
-                self._model = SentenceTransformer(self.fallback_model_name)
+                self._model = self._load_backend(self.fallback_model_name)
                 self.model_name = self.fallback_model_name
         return self._model
 
+    def _load_backend(self, model_name: str) -> "SentenceTransformer":
+        if self.backend != "torch":
+            try:
+                return load_sentence_transformer(
+                    model_name, self.backend, settings.EMBEDDING_ONNX_DIR, settings.EMBEDDING_ONNX_QUANTIZATION
+                )
+            except Exception as e:
+                logger.warning(f"{self.backend} backend unavailable for {model_name}: {e}. Using torch")
+                self.backend = "torch"
+        return load_sentence_transformer(model_name, "torch")
+
+    def _get_cache(self) -> Optional[EmbeddingCache]:
+        """Cache for the model and backend actually loaded (quantized vectors differ from fp32)"""
+        if not settings.EMBEDDING_CACHE_DIR or not self.use_cache:
+            return None
+        cache_name = self.model_name if self.backend == "torch" else f"{self.model_name}@{self.backend}"
+        if self._cache is None or self._cache.model_name != cache_name:
+            self._cache = EmbeddingCache(settings.EMBEDDING_CACHE_DIR, cache_name)
+        return self._cache
+
+    def _finish(self, vectors: np.ndarray) -> np.ndarray:
+        full_dim = vectors.shape[1]
+        if self.truncate_dim and self.truncate_dim < full_dim:
+            return truncate_embeddings(vectors, self.truncate_dim)
+        return vectors.astype("float32", copy=False)
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Batch embed with progress logging for large sets"""
+        """List-of-floats form of encode_documents, for callers that need plain Python values"""
+        return self.encode_documents(texts).tolist()
+
+    def encode_documents(self, texts: List[str]) -> np.ndarray:
+        """Batch embed as a normalized float32 matrix; previously seen texts come from the cache"""
         model = self._load_model()
-        logger.info(f"Embedding {len(texts)} documents...")
-        embeddings = model.encode(texts, batch_size=32, normalize_embeddings=True)
-        return embeddings.tolist()
+        cache = self._get_cache()
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype="float32")
+        if cache is None:
+            logger.info(f"Embedding {len(texts)} documents...")
+            return self._finish(model.encode(texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True))
+
+        keys = [content_key(t) for t in texts]
+        vectors = cache.get_many(keys)
+        missing = {keys[i]: texts[i] for i, v in enumerate(vectors) if v is None}
+        if missing:
+            logger.info(f"Embedding {len(missing)} documents ({len(texts) - len(missing)} cached)...")
+            encoded = model.encode(list(missing.values()), batch_size=32, normalize_embeddings=True, convert_to_numpy=True)
+            # Round misses through float16 too, so a text embeds identically whether cached or not
+            encoded = encoded.astype("float16")
+            cache.put_many(list(missing), encoded)
+            fresh = dict(zip(missing, encoded.astype("float32")))
+            vectors = [fresh[key] if v is None else v for key, v in zip(keys, vectors)]
+        # The cache holds full-width vectors, so truncation settings can change without re-encoding
+        return self._finish(np.stack(vectors))
 
     def embed_query(self, text: str) -> List[float]:
         """Single query embedding, normalized"""
+        return self.embed_queries([text])[0].tolist()
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """Many queries in one encode call, as a normalized float32 matrix"""
         model = self._load_model()
-        embedding = model.encode([text], normalize_embeddings=True)[0]
-        return embedding.tolist()
+        embeddings = model.encode(texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True)
+        return self._finish(embeddings)
 
     def get_dimension(self) -> int:
-        """Return embedding dimension for FAISS index init"""
+        """Return embedding dimension for FAISS index init (after truncation)"""
         model = self._load_model()
-        return model.get_sentence_embedding_dimension()
+        full_dim = model.get_sentence_embedding_dimension()
+        return min(self.truncate_dim, full_dim) if self.truncate_dim else full_dim
 
     def get_model_info(self) -> Dict:
         """Return model name, dimension, device for health endpoint"""
         model = self._load_model()
         return {
             "model": self.model_name,
+            "backend": self.backend,
             "dimension": self.get_dimension(),
-            "device": str(model.device)
+            "device": str(model.device),
+            "cache": self._cache.get_stats() if self._cache else None
         }
@@ -0,0 +1,101 @@
+import re
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+import numpy as np
+from nexus_insight.cognition.state import RawSource
+
+logger = logging.getLogger(__name__)
+
+_BITS = 64
+_SHIFTS = np.arange(_BITS, dtype=np.uint64)
+_TOKEN_RE = re.compile(r"\w+")
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash over word shingles. Near-identical texts differ in only a few bits."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+    if not shingles:
+        return 0
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    bits = (hashes[:, None] >> _SHIFTS) & np.uint64(1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(shingles)
+    return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class NearDuplicateDetector:
+    """
+    Collapses near-duplicate sources (mirrors, syndicated copies) using SimHash.
+
+    Candidate pairs come from LSH banding: with at most `max_distance` differing bits,
+    two fingerprints must agree exactly on at least one of `max_distance + 1` bands,
+    so each source is only compared against its bucket neighbours (roughly linear).
+    """
+
+    def __init__(self, threshold: float = 0.90, min_tokens: int = 50):
+        self.max_distance = int((1.0 - threshold) * _BITS)
+        self.min_tokens = min_tokens
+        n_bands = self.max_distance + 1
+        width = _BITS // n_bands
+        self._bands: List[Tuple[int, int]] = [
+            (i * width, _BITS if i == n_bands - 1 else (i + 1) * width) for i in range(n_bands)
+        ]
+
+    def _band_keys(self, fp: int) -> List[Tuple[int, int]]:
+        return [(i, (fp >> lo) & ((1 << (hi - lo)) - 1)) for i, (lo, hi) in enumerate(self._bands)]
+
+    def deduplicate(self, sources: List[RawSource]) -> List[RawSource]:
+        """
+        Keeps the highest-trust copy of each near-duplicate group and records the
+        dropped URLs in its metadata['merged_urls']. Original order is preserved.
+        """
+        order = sorted(range(len(sources)), key=lambda i: sources[i].trust_score, reverse=True)
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        fingerprints: Dict[int, int] = {}
+        dropped = set()
+        merged: Dict[int, List[str]] = {}
+
+        for i in order:
+            source = sources[i]
+            if len(_TOKEN_RE.findall(source.content)) < self.min_tokens:
+                continue
+
+            fp = simhash(source.content)
+            keys = self._band_keys(fp)
+            match = None
+            for key in keys:
+                for j in buckets.get(key, []):
+                    if hamming(fp, fingerprints[j]) <= self.max_distance:
+                        match = j
+                        break
+                if match is not None:
+                    break
+
+            if match is not None:
+                merged.setdefault(match, []).append(source.url)
+                dropped.add(i)
+                logger.debug(f"Merged near-duplicate {source.url} into {sources[match].url}")
+                continue
+
+            fingerprints[i] = fp
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+
+        if dropped:
+            logger.info(f"Dropped {len(dropped)} near-duplicate sources out of {len(sources)}")
+        # Copies, not in-place edits: fetched sources are shared across sessions (SingleFlight)
+        return [
+            s.model_copy(update={"metadata": {**s.metadata, "merged_urls": s.metadata.get("merged_urls", []) + merged[i]}})
+            if i in merged else s
+            for i, s in enumerate(sources) if i not in dropped
+        ]
@@ -0,0 +1,181 @@
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from nexus_insight.infra.concurrency import FileLock
+
+logger = logging.getLogger(__name__)
+
+class GlobalKnowledgeGraph:
+    """
+    Persistent entity graph shared by every session, stored as flat arrays.
+
+    Entity names are interned to int ids (`entities.txt`, one per line; whitespace runs are
+    collapsed so no name can span lines) and edges are an append-only log of int32
+    (source, target) pairs (`edges.i32`); repeated pairs act as edge weights. Both logs
+    are appended under a file lock, so several worker processes can share one graph.
+
+    PageRank is refreshed on a background thread by power iteration warm-started from
+    the previous vector: a batch of new edges only perturbs it, so a few sweeps converge
+    instead of a cold recomputation. Readers only ever see the last published vector.
+    """
+
+    REFRESH_DELAY = 2.0
+
+    def __init__(self, root: str, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 30):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.damping = damping
+        self.tol = tol
+        self.max_iter = max_iter
+
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._entities_offset = 0
+        self._edges = np.zeros((0, 2), dtype=np.int32)
+        self._pagerank = np.zeros(0, dtype=np.float32)
+        self._last_sweeps = 0
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+
+        with self._lock:
+            self._catch_up()
+            saved = self._read_pagerank()
+            if saved is not None and len(saved) <= len(self._names):
+                self._pagerank = saved
+        self._worker = threading.Thread(target=self._refresh_loop, name="nexus-global-graph", daemon=True)
+        self._worker.start()
+        if len(self._pagerank) != len(self._names):
+            self._wake.set()
+
+    # ---- public API -------------------------------------------------------
+
+    def add_edges(self, edges: Iterable[Tuple[str, str]]):
+        """Append (source, target) entity pairs; PageRank catches up in the background"""
+        edges = [(s, t) for s, t in ((self._normalize(s), self._normalize(t)) for s, t in edges) if s and t]
+        if not edges:
+            return
+        with self._lock, FileLock(self.root / ".lock"):
+            # Other processes may have interned entities since we last looked
+            self._catch_up()
+            new_names = []
+            for name in {n for edge in edges for n in edge}:
+                if name not in self._ids:
+                    self._ids[name] = len(self._names)
+                    self._names.append(name)
+                    new_names.append(name)
+            if new_names:
+                data = "".join(f"{name}\n" for name in new_names).encode("utf-8")
+                with open(self.root / "entities.txt", "ab") as f:
+                    f.write(data)
+                self._entities_offset += len(data)
+            pairs = np.array([(self._ids[s], self._ids[t]) for s, t in edges], dtype=np.int32)
+            with open(self.root / "edges.i32", "ab") as f:
+                pairs.tofile(f)
+            self._edges = np.concatenate([self._edges, pairs])
+        self._wake.set()
+
+    def scores(self, entities: Iterable[str]) -> Dict[str, float]:
+        """Published PageRank of the given entities (unknown or not yet ranked: omitted)"""
+        pagerank = self._pagerank
+        result = {}
+        for name in entities:
+            i = self._ids.get(self._normalize(name))
+            if i is not None and i < len(pagerank):
+                result[name] = float(pagerank[i])
+        return result
+
+    def top(self, k: int = 10) -> List[Tuple[str, float]]:
+        pagerank = self._pagerank
+        if not len(pagerank):
+            return []
+        k = min(k, len(pagerank))
+        best = np.argpartition(-pagerank, k - 1)[:k]
+        best = best[np.argsort(-pagerank[best])]
+        return [(self._names[i], float(pagerank[i])) for i in best]
+
+    def refresh(self):
+        """Recompute PageRank now (the background thread does this after adds)"""
+        with self._lock:
+            self._catch_up()
+            edges, n, previous = self._edges, len(self._names), self._pagerank
+        if n == 0:
+            return
+        pagerank, sweeps = self._power_iteration(edges, n, previous)
+        with self._lock:
+            self._pagerank, self._last_sweeps = pagerank, sweeps
+        tmp = self.root / f".pagerank.f32.{os.getpid()}.tmp"
+        pagerank.tofile(tmp)
+        os.replace(tmp, self.root / "pagerank.f32")
+
+    def get_stats(self) -> Dict:
+        return {
+            "entities": len(self._names),
+            "edges": len(self._edges),
+            "ranked": len(self._pagerank),
+            "last_sweeps": self._last_sweeps
+        }
+
+    # ---- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        # str.split() breaks on every character splitlines() does (\r, \x0b, \u2028, ...)
+        return " ".join(name.split())
+
+    def _power_iteration(self, edges: np.ndarray, n: int, previous: np.ndarray) -> Tuple[np.ndarray, int]:
+        src, dst = edges[:, 0], edges[:, 1]
+        out_degree = np.bincount(src, minlength=n).astype(np.float64)
+        dangling = out_degree == 0
+        inv_degree = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+        # Warm start: previous scores, new entities at the uniform share, renormalized
+        rank = np.full(n, 1.0 / n)
+        rank[:len(previous)] = previous
+        rank /= rank.sum()
+
+        sweeps = 0
+        for sweeps in range(1, self.max_iter + 1):
+            flow = np.bincount(dst, weights=rank[src] * inv_degree[src], minlength=n)
+            new_rank = (1 - self.damping) / n + self.damping * (flow + rank[dangling].sum() / n)
+            delta = np.abs(new_rank - rank).sum()
+            rank = new_rank
+            if delta < self.tol:
+                break
+        return rank.astype(np.float32), sweeps
+
+    def _catch_up(self):
+        """Load entities and edges appended since the last call (possibly by other processes)"""
+        path = self.root / "entities.txt"
+        if path.exists() and path.stat().st_size > self._entities_offset:
+            with open(path, "rb") as f:
+                f.seek(self._entities_offset)
+                tail = f.read()
+            complete = tail[:tail.rfind(b"\n") + 1]
+            self._entities_offset += len(complete)
+            for name in complete.decode("utf-8").splitlines():
+                self._ids[name] = len(self._names)
+                self._names.append(name)
+
+        path = self.root / "edges.i32"
+        rows = os.path.getsize(path) // 8 if path.exists() else 0
+        if rows > len(self._edges):
+            tail = np.fromfile(path, dtype=np.int32, count=(rows - len(self._edges)) * 2, offset=len(self._edges) * 8)
+            self._edges = np.concatenate([self._edges, tail.reshape(-1, 2)])
+
+    def _read_pagerank(self) -> Optional[np.ndarray]:
+        path = self.root / "pagerank.f32"
+        return np.fromfile(path, dtype=np.float32) if path.exists() else None
+
+    def _refresh_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.REFRESH_DELAY)  # Coalesce bursts of adds into one refresh
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Global graph PageRank refresh failed: {e}")
@@ -1,11 +1,16 @@
+import asyncio
 import logging
 import json
 import networkx as nx
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from nexus_insight.cognition.state import RawSource
+from nexus_insight.cognition.embedding_cache import content_key
+from nexus_insight.cognition.global_graph import GlobalKnowledgeGraph
+from nexus_insight.infra.cache import TTLCache
 from nexus_insight.infra.llm_router import LLMRouter
 from nexus_insight.infra.otel import trace_node
+from nexus_insight.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -16,16 +21,65 @@ class GraphEdge(BaseModel):
     context: str
 
 class GraphExtractor:
-    def __init__(self, llm_router: LLMRouter):
+    """
+    Builds one bounded knowledge graph per session (at most GRAPH_SESSION_MAX_EDGES edges,
+    GRAPH_MAX_SESSIONS graphs, idle ones expire), so analysis cost does not grow with
+    uptime and sessions never see each other's entities. With GLOBAL_GRAPH_ENABLED every
+    edge is also appended to a persistent GlobalKnowledgeGraph.
+
+    Extraction covers the GRAPH_MAX_SOURCES most trusted sources: short ones are packed
+    into shared prompts, batches run concurrently (GRAPH_EXTRACTION_CONCURRENCY) and
+    triples are cached by content hash.
+
+    Clients get a bounded view: the GRAPH_VIEW_MAX_NODES most central nodes with layout
+    positions computed here, streamed as add/remove deltas while extraction runs.
+    """
+
+    LAYOUT_SCALE = 400        # spring_layout coordinates (about -1..1) to Vis.js pixels
+    LAYOUT_ITERATIONS = 50
+
+    def __init__(self, llm_router: LLMRouter, global_graph: Optional[GlobalKnowledgeGraph] = None):
         self.llm_router = llm_router
-        self.graph = nx.DiGraph()
+        self.max_edges = settings.GRAPH_SESSION_MAX_EDGES
+        self._sessions = TTLCache(max_size=settings.GRAPH_MAX_SESSIONS, ttl=settings.GRAPH_SESSION_TTL)
+        # Extracted triples by content hash, shared across sessions and source revisions
+        self._triples = TTLCache(max_size=settings.GRAPH_TRIPLE_CACHE_SIZE, ttl=settings.GRAPH_TRIPLE_CACHE_TTL)
+        self._semaphore = asyncio.Semaphore(settings.GRAPH_EXTRACTION_CONCURRENCY)
+        self.global_graph = global_graph
+        if self.global_graph is None and settings.GLOBAL_GRAPH_ENABLED:
+            self.global_graph = GlobalKnowledgeGraph(settings.GLOBAL_GRAPH_DIR)
+
+    def session_graph(self, session_id: Optional[str]) -> nx.DiGraph:
+        """The session's graph, created on first use; without a session id a throwaway graph"""
+        if session_id is None:
+            return nx.DiGraph()
+        graph = self._sessions.get(session_id)
+        if graph is None:
+            graph = nx.DiGraph()
+        # Re-set on every use so active sessions do not expire
+        self._sessions.set(session_id, graph)
+        return graph
+
+    def release_session(self, session_id: str):
+        self._sessions.pop(session_id)
 
     @trace_node("graph_extraction")
-    async def extract_and_build(self, sources: List[RawSource], query: str) -> Dict[str, Any]:
+    async def extract_and_build(
+        self,
+        sources: List[RawSource],
+        query: str,
+        session_id: Optional[str] = None,
+        on_delta: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
-        Parses sources to extract entities and builds a NetworkX Knowledge Graph.
+        Parses sources to extract entities and builds the session's NetworkX Knowledge Graph.
         Returns a dictionary with 'summary', 'data' (nodes/edges), and 'tokens'.
+
+        With `on_delta`, changes to the exported view (see graph_delta) are reported each
+        time a source's triples are added, while the remaining batches are still running.
         """
+        graph = self.session_graph(session_id)
+        new_edges = []
         total_tokens = 0
         if not sources:
             return {
@@ -34,76 +88,229 @@ class GraphExtractor:
                 "tokens": 0
             }
 
-        llm = await self.llm_router.get_llm("fast")
-        
-        # Limit to top 3 sources to save tokens for fast extraction
-        texts_to_process = [s.content[:1500] for s in sources[:3]]
-        
-        for idx, text in enumerate(texts_to_process):
-            prompt = (
-                f"You are a Knowledge Graph extraction engine.\n"
-                f"Given the following text, extract 3 to 5 key entity relationships relevant to the query: '{query}'.\n\n"
-                f"Text: {text}\n\n"
-                f"Respond ONLY with a valid JSON array of objects in this exact format:\n"
-                f"[{{\"source_entity\": \"EntityA\", \"target_entity\": \"EntityB\", \"relationship\": \"caused by\", \"context\": \"brief detail\"}}]"
-            )
-            
-            try:
-                response = await llm.ainvoke(prompt)
-                total_tokens += response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
-                data = json.loads(response.content)
-                
-                for rel in data:
-                    src = rel.get("source_entity", "").strip().upper()
-                    tgt = rel.get("target_entity", "").strip().upper()
-                    if src and tgt:
-                        self.graph.add_edge(
-                            src, tgt, 
-                            relationship=rel.get("relationship", "related"),
-                            context=rel.get("context", "")
-                        )
-            except Exception as e:
-                logger.warning(f"Failed to parse graph edges for source {idx}: {e}")
-                continue
+        # Sources arrive most trusted first, so they win when the session graph is full
+        async for triples, tokens in self._extract_triples(self._select_sources(sources), query):
+            total_tokens += tokens
+            added = self._add_triples(graph, triples)
+            new_edges.extend(added)
+            if on_delta and added:
+                # PageRank + layout are CPU work; keep them off the event loop. The next triples
+                # are only added once this returns, so the thread has the graph to itself.
+                on_delta(await asyncio.to_thread(self.graph_delta, graph))
+
+        if self.global_graph is not None and new_edges:
+            self.global_graph.add_edges(new_edges)
 
-        if self.graph.number_of_nodes() == 0:
+        if graph.number_of_nodes() == 0:
             return {
                 "summary": "Graph built, but no strong semantic connections were found.",
-                "data": {"nodes": [], "edges": []}
+                "data": {"nodes": [], "edges": []},
+                "tokens": total_tokens
             }
 
+        summary, data = await asyncio.to_thread(lambda: (self._summarize_graph(graph), self.export_graph_data(graph)))
         return {
-            "summary": self._summarize_graph(),
-            "data": self.export_graph_data(),
+            "summary": summary,
+            "data": data,
             "tokens": total_tokens
         }
 
-    def export_graph_data(self) -> Dict[str, Any]:
+    def _add_triples(self, graph: nx.DiGraph, triples: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        added = []
+        for rel in triples:
+            src = rel.get("source_entity", "").strip().upper()
+            tgt = rel.get("target_entity", "").strip().upper()
+            if not (src and tgt):
+                continue
+            if graph.number_of_edges() >= self.max_edges and not graph.has_edge(src, tgt):
+                logger.debug(f"Session graph full ({self.max_edges} edges); dropping {src} -> {tgt}")
+                continue
+            graph.add_edge(
+                src, tgt,
+                relationship=rel.get("relationship", "related"),
+                context=rel.get("context", "")
+            )
+            added.append((src, tgt))
+        if added:
+            graph.graph["revision"] = graph.graph.get("revision", 0) + 1
+        return added
+
+    @staticmethod
+    def _select_sources(sources: List[RawSource]) -> List[RawSource]:
+        """The GRAPH_MAX_SOURCES most trusted sources with content"""
+        usable = [s for s in sources if s.content and s.content.strip()]
+        return sorted(usable, key=lambda s: s.trust_score, reverse=True)[:settings.GRAPH_MAX_SOURCES]
+
+    async def _extract_triples(self, sources: List[RawSource], query: str) -> AsyncIterator[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Yields (triples, tokens) per distinct source text, in source order. Triples are cached
+        per content hash; the rest are packed into batches of up to GRAPH_BATCH_CHARS and
+        extracted concurrently. A source is yielded once its batch and all earlier ones are done.
+        """
+        keys: Dict[bytes, str] = {}
+        for source in sources:
+            text = source.content[:settings.GRAPH_SOURCE_CHARS]
+            keys.setdefault(content_key(text), text)
+
+        pending = [(key, text) for key, text in keys.items() if self._triples.get(key) is None]
+        tasks: Dict[bytes, asyncio.Task] = {}
+        if pending:
+            llm = await self.llm_router.get_llm("fast")
+            for batch in self._pack(pending):
+                task = asyncio.create_task(self._extract_batch(llm, batch, query))
+                for key, _ in batch:
+                    tasks[key] = task
+
+        counted = set()
+        try:
+            for key in keys:
+                tokens = 0
+                task = tasks.get(key)
+                if task is not None:
+                    tokens = await task
+                    if task in counted:
+                        tokens = 0
+                    counted.add(task)
+                yield self._triples.get(key) or [], tokens
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    @staticmethod
+    def _pack(items: List[Tuple[bytes, str]]) -> List[List[Tuple[bytes, str]]]:
+        """Greedily groups texts into prompts of at most GRAPH_BATCH_CHARS (one long text may stand alone)"""
+        batches, current, size = [], [], 0
+        for item in items:
+            if current and size + len(item[1]) > settings.GRAPH_BATCH_CHARS:
+                batches.append(current)
+                current, size = [], 0
+            current.append(item)
+            size += len(item[1])
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _extract_batch(self, llm, batch: List[Tuple[bytes, str]], query: str) -> int:
+        """One LLM call for a batch of texts; caches the triples of each. Returns tokens used."""
+        numbered = "\n\n".join(f"[{i}] {text}" for i, (_, text) in enumerate(batch))
+        prompt = (
+            f"You are a Knowledge Graph extraction engine.\n"
+            f"For EACH of the following numbered texts, extract 3 to 5 key entity relationships relevant to the query: '{query}'.\n\n"
+            f"Texts:\n{numbered}\n\n"
+            f"Respond ONLY with a valid JSON array of objects in this exact format, where \"text\" is the number of the text the relationship comes from:\n"
+            f"[{{\"text\": 0, \"source_entity\": \"EntityA\", \"target_entity\": \"EntityB\", \"relationship\": \"caused by\", \"context\": \"brief detail\"}}]"
+        )
+
+        async with self._semaphore:
+            try:
+                response = await llm.ainvoke(prompt)
+            except Exception as e:
+                logger.warning(f"Graph extraction failed for a batch of {len(batch)} sources: {e}")
+                return 0
+
+        # The call was paid for even if its output turns out to be unusable
+        tokens = response.response_metadata.get("token_usage", {}).get("total_tokens", 0)
+        try:
+            data = json.loads(response.content)
+        except ValueError as e:
+            logger.warning(f"Failed to parse graph edges for a batch of {len(batch)} sources: {e}")
+            return tokens
+        if not isinstance(data, list):
+            logger.warning(f"Graph extraction returned {type(data).__name__}, expected a list; batch not cached")
+            return tokens
+
+        per_text: List[List[Dict[str, Any]]] = [[] for _ in batch]
+        for rel in data:
+            if not isinstance(rel, dict):
+                continue
+            # Relations without a usable text number are dropped rather than pinned on text 0
+            try:
+                idx = int(rel["text"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 0 <= idx < len(batch):
+                per_text[idx].append(rel)
+        for (key, _), rels in zip(batch, per_text):
+            self._triples.set(key, rels)
+        return tokens
+
+    def export_graph_data(self, graph: nx.DiGraph) -> Dict[str, Any]:
         """
-        Exports the NetworkX graph to a format compatible with Vis.js
+        Exports the NetworkX graph to a format compatible with Vis.js: the
+        GRAPH_VIEW_MAX_NODES most central nodes, with layout positions precomputed
         """
-        nodes = []
-        for node in self.graph.nodes():
-            nodes.append({"id": node, "label": node, "title": node})
-        
-        edges = []
-        for u, v, data in self.graph.edges(data=True):
-            edges.append({
-                "from": u, 
-                "to": v, 
+        view = self._view(graph)
+        return {"nodes": list(view["nodes"].values()), "edges": list(view["edges"].values())}
+
+    def graph_delta(self, graph: nx.DiGraph) -> Dict[str, Any]:
+        """
+        Changes to the exported view since the last delta of this graph:
+        {"nodes": {"upsert": [...], "remove": [ids]}, "edges": {...}}
+        """
+        sent = graph.graph.get("sent", {"nodes": {}, "edges": {}})
+        view = self._view(graph)
+        graph.graph["sent"] = view
+        delta = {}
+        for kind in ("nodes", "edges"):
+            old, new = sent[kind], view[kind]
+            delta[kind] = {
+                "upsert": [item for item_id, item in new.items() if old.get(item_id) != item],
+                "remove": [item_id for item_id in old if item_id not in new]
+            }
+        return delta
+
+    def _view(self, graph: nx.DiGraph) -> Dict[str, Any]:
+        """Pruned, laid-out view of the graph, recomputed only after the graph changed"""
+        revision = graph.graph.get("revision", 0)
+        view = graph.graph.get("view")
+        if view is not None and view["revision"] == revision:
+            return view
+
+        centrality = nx.pagerank(graph) if graph.number_of_edges() else {n: 1.0 for n in graph}
+        keep = sorted(centrality, key=centrality.get, reverse=True)[:settings.GRAPH_VIEW_MAX_NODES]
+        shown = graph.subgraph(keep)
+
+        # Nodes already placed stay put; only newcomers are laid out around them
+        pos = graph.graph.setdefault("pos", {})
+        placed = [n for n in keep if n in pos]
+        if len(placed) < len(keep):
+            pos.update(nx.spring_layout(
+                shown,
+                pos={n: pos[n] for n in placed} or None,
+                fixed=placed or None,
+                iterations=self.LAYOUT_ITERATIONS,
+                seed=0
+            ))
+
+        nodes = {}
+        for node in keep:
+            x, y = pos[node]
+            nodes[node] = {
+                "id": node, "label": node, "title": node,
+                "value": round(centrality[node] * len(centrality), 2),  # 1.0 = average node
+                "x": int(x * self.LAYOUT_SCALE), "y": int(y * self.LAYOUT_SCALE)
+            }
+        edges = {}
+        for u, v, data in shown.edges(data=True):
+            edges[f"{u}->{v}"] = {
+                "id": f"{u}->{v}",
+                "from": u,
+                "to": v,
                 "label": data.get("relationship", ""),
                 "title": data.get("context", "")
-            })
-            
-        return {"nodes": nodes, "edges": edges}
+            }
+
+        view = {"revision": revision, "nodes": nodes, "edges": edges}
+        graph.graph["view"] = view
+        return view
 
-    def _summarize_graph(self) -> str:
+    def _summarize_graph(self, graph: nx.DiGraph) -> str:
         """
-        Analyzes the NetworkX graph using PageRank to find central themes.
+        Analyzes the session graph using PageRank to find central themes.
         """
         try:
-            # Calculate node importance
-            centrality = nx.pagerank(self.graph)
+            # Calculate node importance (bounded: the session graph is capped)
+            centrality = nx.pagerank(graph)
             
             # Get top 5 most important entities
             top_nodes = sorted(centrality.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -114,9 +321,17 @@ class GraphExtractor:
                 summary += f"- {node} (Centrality: {score:.2f})\n"
                 
             summary += "\n**Key Semantic Pathways:**\n"
-            edges = list(self.graph.edges(data=True))[:5] # Sample paths
+            edges = list(graph.edges(data=True))[:5] # Sample paths
             for u, v, data in edges:
                 summary += f"- {u} --[{data['relationship']}]--> {v} ({data['context'][:50]}...)\n"
+
+            if self.global_graph is not None:
+                # Precomputed library-wide ranks: a dictionary lookup per session node
+                known = sorted(self.global_graph.scores(graph.nodes()).items(), key=lambda x: x[1], reverse=True)[:5]
+                if known:
+                    summary += "\n**Library-wide Prominence:**\n"
+                    for node, score in known:
+                        summary += f"- {node} (Global PageRank: {score:.4f})\n"
                 
             return summary
             
@@ -69,7 +69,7 @@ class ResearchState(TypedDict):
     
     # ADVANCED AI: GRAPHRAG & DEBATE
     graph_summary: Optional[str]               # Synthesized Knowledge Graph context
-    graph_data: Optional[Dict[str, Any]]       # Raw nodes and edges for Vis.js {"nodes": [], "edges": []}
+    graph_data: Optional[Dict[str, Any]]       # Pruned, laid-out nodes and edges for Vis.js {"nodes": [], "edges": []}
     debate_log: Annotated[List[Dict[str, str]], operator.add] # [{"role": "proposer", "content": "..."}]
 
     # LOOP CONTROL
@@ -1,5 +1,5 @@
 import os
-from typing import Literal
+from typing import List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -23,16 +23,73 @@ class Settings(BaseSettings):
     # Embeddings (local, no key needed)
     EMBEDDING_MODEL: str = "BAAI/bge-m3"
     EMBEDDING_FALLBACK: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BACKEND: Literal["torch", "onnx-int8"] = "torch"  # onnx-int8 needs optimum[onnxruntime]
+    EMBEDDING_ONNX_DIR: str = "data/onnx"            # Exported/quantized ONNX models are kept here
+    EMBEDDING_ONNX_QUANTIZATION: Literal["avx2", "avx512", "avx512_vnni", "arm64"] = "avx2"
+    EMBEDDING_TRUNCATE_DIM: int = 0                  # Keep only the leading N dimensions (Matryoshka); 0 = full
+    EMBED_BATCH_MAX: int = 64                        # Texts per micro-batched encode
+    EMBED_BATCH_WAIT_MS: float = 5.0                 # How long the first request waits for company
+    EMBEDDING_CACHE_DIR: str = "data/embeddings"    # Content-hash keyed vector cache; empty disables it
     
     # Web Search (free)
     SEARXNG_URL: str = "http://searxng:8888"
     DDG_RATE_LIMIT_DELAY: float = 1.1
+    DDG_THROTTLE_COOLDOWN: float = 30.0     # Skip DDG for this long after a rate-limit response
+    SEARCH_CACHE_SIZE: int = 2048
+    SEARCH_CACHE_TTL: float = 3600.0        # Results younger than this are fresh
+    SEARCH_CACHE_STALE_TTL: float = 86400.0 # Older results are served stale while refreshing
+    TRUST_LIST_PATH: str = ""               # Optional `domain<TAB>score` file (.gz ok)
+    BLOCK_LIST_PATH: str = ""               # Optional `domain` per line blocklist (.gz ok)
+    FETCH_MAX_IN_FLIGHT: int = 16          # Global page-fetch limit across all sessions
+    FETCH_PER_DOMAIN_CONCURRENCY: int = 2
+    FETCH_DOMAIN_MIN_INTERVAL: float = 0.5  # Seconds between request starts to one domain
+    FETCH_BACKOFF_MAX: float = 60.0
+    SOURCE_DEDUP_THRESHOLD: float = 0.90   # SimHash similarity above which sources are merged
     
+    # PDF index store (persistent, content-hash keyed)
+    INDEX_STORE_DIR: str = "data/indices"
+    INDEX_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # In-memory LRU budget for hot indices
+    INDEX_SESSION_REF_TTL: float = 3600.0            # Session pins expire after this many seconds
+    INDEX_VECTOR_STORAGE: Literal["float32", "float16", "int8"] = "float32"  # Compressed storage trades a little recall
+    GLOBAL_INDEX_ENABLED: bool = False               # One ANN index over every ingested document
+    GLOBAL_INDEX_KIND: Literal["hnsw", "ivfpq"] = "hnsw"
+    GLOBAL_INDEX_NPROBE: int = 16                    # IVF-PQ recall/latency knob
+    GLOBAL_INDEX_EF_SEARCH: int = 64                 # HNSW recall/latency knob
+    GLOBAL_INDEX_TRAIN_MIN: int = 20_000             # IVF-PQ trains once the library has this many chunks
+    LIBRARY_SOURCES: int = 3                         # Earlier library documents added to PDF research sessions
+    PDF_PARSE_WORKERS: int = 4                       # Processes for page extraction of large PDFs
+    PDF_PARALLEL_MIN_PAGES: int = 64                 # Smaller documents are parsed on one thread
+    RETRIEVAL_MODE: Literal["hybrid", "dense", "lexical"] = "hybrid"  # Lexical is used until the embedder loads
+    RETRIEVAL_CANDIDATES: int = 4                    # Hybrid fuses k x this many candidates per retriever
+    RRF_K: int = 60                                  # Reciprocal-rank fusion damping constant
+    GRAPH_SESSION_MAX_EDGES: int = 500               # Knowledge-graph edges kept per session
+    GRAPH_MAX_SESSIONS: int = 256                    # Session graphs held in memory (LRU)
+    GRAPH_SESSION_TTL: float = 3600.0                # Idle session graphs expire after this many seconds
+    GRAPH_MAX_SOURCES: int = 12                      # Most trusted sources fed to entity extraction
+    GRAPH_SOURCE_CHARS: int = 1500                   # Characters of each source sent to the extractor
+    GRAPH_BATCH_CHARS: int = 4000                    # Short sources are packed into one prompt up to this size
+    GRAPH_EXTRACTION_CONCURRENCY: int = 4            # Extraction prompts in flight (shared by all sessions)
+    GRAPH_TRIPLE_CACHE_SIZE: int = 4096              # Extracted triples cached by source content hash
+    GRAPH_TRIPLE_CACHE_TTL: float = 86400.0
+    GRAPH_VIEW_MAX_NODES: int = 100                  # Most central nodes sent to the browser
+    GLOBAL_GRAPH_ENABLED: bool = False               # Persistent cross-session entity graph with PageRank
+    GLOBAL_GRAPH_DIR: str = "data/graph"
+    
+    # Startup: models preloaded in the background; /v1/ready turns 200 once they finish
+    WARMUP_COMPONENTS: List[str] = ["embedder", "privacy"]  # Also available: "whisper"
+
     # Media (local)
     WHISPER_MODEL: Literal["tiny", "base", "small", "medium", "large-v3"] = "base"
+    MEDIA_WORKERS: int = 1                           # Transcription processes (each holds a Whisper model)
+    MEDIA_QUEUE_SIZE: int = 8                        # Jobs waiting beyond the busy workers; more are rejected
+    MEDIA_TRANSCRIBE_MODE: Literal["single", "chunked"] = "chunked"  # Chunked splits speech at silences (VAD)
+    MEDIA_TRANSCRIBE_PARALLELISM: int = 2            # Segments decoded concurrently per worker (chunked mode)
+    MEDIA_SEGMENT_MAX_SECONDS: float = 120.0         # Upper bound on one VAD segment
+    MEDIA_PROGRESS_INTERVAL: float = 0.5             # Seconds between transcript progress polls
     
     # Infrastructure (free/self-hosted)
     REDIS_URL: str = "redis://localhost:6379"
+    REDIS_MAX_CONNECTIONS: int = 32                  # Shared async pool (per event loop)
     OTEL_EXPORTER_ENDPOINT: str = "http://otel-collector:4317"
     
     # Agent Behavior
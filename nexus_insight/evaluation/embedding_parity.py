@@ -0,0 +1,101 @@
+import json
+import time
+import argparse
+import logging
+import resource
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from nexus_insight.cognition.embeddings import LocalEmbedder
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TEXTS = [
+    "Lithium-ion battery pack prices fell 14% in 2023 to $139/kWh.",
+    "The WHO declared the end of the COVID-19 global health emergency on 5 May 2023.",
+    "Solar photovoltaic capacity additions exceeded 400 GW worldwide last year.",
+    "CRISPR-Cas9 enables targeted edits to genomic DNA in living cells.",
+    "Central banks raised interest rates to curb inflation throughout 2022.",
+    "The James Webb Space Telescope observes primarily in the infrared spectrum.",
+    "Offshore wind farms face rising costs from supply chain constraints.",
+    "Transformer models use self-attention to weigh relationships between tokens.",
+]
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """Row-wise cosine similarity between two embeddings of the same texts"""
+    ref = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    cand = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cos = np.sum(ref * cand, axis=1)
+    return {"mean": float(cos.mean()), "min": float(cos.min()), "p05": float(np.percentile(cos, 5))}
+
+def neighbour_agreement(reference: np.ndarray, candidate: np.ndarray, k: int = 5) -> float:
+    """Mean overlap of each text's k nearest neighbours under the two embeddings"""
+    k = min(k, len(reference) - 1)
+    if k <= 0:
+        return 1.0
+    def neighbours(x):
+        sims = x @ x.T
+        np.fill_diagonal(sims, -np.inf)
+        return np.argsort(-sims, axis=1)[:, :k]
+    ref, cand = neighbours(reference), neighbours(candidate)
+    return float(np.mean([len(set(a) & set(b)) / k for a, b in zip(ref.tolist(), cand.tolist())]))
+
+def benchmark_backends(
+    texts: Sequence[str],
+    backends: Sequence[str] = ("torch", "onnx-int8"),
+    repeats: int = 3
+) -> Dict[str, Dict]:
+    """
+    Load time, encode throughput and peak RSS per backend, plus cosine parity and
+    neighbour agreement of every backend against the first one. Peak RSS is process-wide,
+    so run one backend per process for a clean memory comparison.
+    """
+    texts = list(texts)
+    report: Dict[str, Dict] = {}
+    reference: Optional[np.ndarray] = None
+
+    for backend in backends:
+        embedder = LocalEmbedder(backend=backend, use_cache=False)
+        start = time.perf_counter()
+        embedder.get_dimension()
+        load_seconds = time.perf_counter() - start
+        if embedder.backend != backend:
+            report[backend] = {"available": False}
+            continue
+
+        vectors = embedder.encode_documents(texts)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            vectors = embedder.encode_documents(texts)
+        elapsed = time.perf_counter() - start
+
+        entry = {
+            "available": True,
+            "model": embedder.model_name,
+            "load_seconds": round(load_seconds, 3),
+            "texts_per_second": round(len(texts) * repeats / elapsed, 1),
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        }
+        if reference is None:
+            reference = vectors
+        else:
+            entry["cosine_vs_reference"] = cosine_parity(reference, vectors)
+            entry["neighbour_agreement"] = neighbour_agreement(reference, vectors)
+        report[backend] = entry
+    return report
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare embedding backends for speed and parity")
+    parser.add_argument("--texts", help="File with one text per line (defaults to built-in samples)")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx-int8"])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    texts = SAMPLE_TEXTS * 16
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    print(json.dumps(benchmark_backends(texts, args.backends, args.repeats), indent=2))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
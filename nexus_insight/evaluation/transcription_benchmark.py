@@ -0,0 +1,57 @@
+import json
+import time
+import argparse
+import logging
+from typing import Dict, List, Optional, Sequence
+from nexus_insight.tools.media_worker import SAMPLING_RATE, decode_pcm, load_model, transcribe, transcribe_chunked
+
+logger = logging.getLogger(__name__)
+
+def benchmark_transcription(
+    audio_path: str,
+    model_size: str = "base",
+    parallelism: Sequence[int] = (2, 4),
+    max_segment_seconds: float = 120.0
+) -> Dict[str, Dict]:
+    """
+    Wall-clock time of the single-pass decode against VAD-chunked decoding at each
+    parallelism level, on the same file. The file is decoded to PCM once up front, so
+    model loading and audio decoding are excluded from the timings.
+    """
+    audio = decode_pcm(audio_path)
+    duration = len(audio) / SAMPLING_RATE
+    runs = [("single", 1)] + [(f"chunked-x{p}", p) for p in parallelism]
+    report: Dict[str, Dict] = {}
+    baseline: Optional[float] = None
+
+    for name, workers in runs:
+        load_model(model_size, workers)
+        start = time.perf_counter()
+        if name == "single":
+            transcript = transcribe(audio, model_size)
+        else:
+            transcript = transcribe_chunked(audio, model_size, parallelism=workers, max_segment_seconds=max_segment_seconds)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        report[name] = {
+            "seconds": round(elapsed, 2),
+            "audio_seconds": round(duration, 1),
+            "realtime_factor": round(duration / elapsed, 2),
+            "speedup": round(baseline / elapsed, 2),
+            "lines": transcript.count("\n") + 1 if transcript else 0
+        }
+        logger.info(f"{name}: {report[name]}")
+    return report
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare single-pass and VAD-chunked transcription")
+    parser.add_argument("audio", help="Audio or video file to transcribe")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--parallelism", nargs="+", type=int, default=[2, 4])
+    parser.add_argument("--max-segment-seconds", type=float, default=120.0)
+    args = parser.parse_args(argv)
+    print(json.dumps(benchmark_transcription(args.audio, args.model, args.parallelism, args.max_segment_seconds), indent=2))
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
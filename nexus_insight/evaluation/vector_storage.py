@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from nexus_insight.cognition.embeddings import truncate_embeddings
+from nexus_insight.tools.index_store import new_ip_index, index_nbytes
+
+logger = logging.getLogger(__name__)
+
+def measure_storage_recall(
+    documents: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    storages: Sequence[str] = ("float32", "float16", "int8"),
+    truncate_dims: Sequence[Optional[int]] = (None,)
+) -> List[Dict]:
+    """
+    Recall@k of each (storage, truncation) option against exact full-precision, full-width
+    search over the same normalized embeddings, with index bytes and compression ratio.
+    """
+    documents = np.ascontiguousarray(documents, dtype="float32")
+    queries = np.ascontiguousarray(queries, dtype="float32")
+    k = min(k, len(documents))
+
+    baseline = new_ip_index(documents.shape[1])
+    baseline.add(documents)
+    _, truth = baseline.search(queries, k)
+    baseline_bytes = index_nbytes(baseline)
+
+    report = []
+    for dim in truncate_dims:
+        docs = truncate_embeddings(documents, dim) if dim else documents
+        qs = truncate_embeddings(queries, dim) if dim else queries
+        for storage in storages:
+            index = new_ip_index(docs.shape[1], storage)
+            if not index.is_trained:
+                index.train(docs)
+            index.add(docs)
+            _, found = index.search(qs, k)
+            recall = np.mean([len(set(t) & set(f)) / k for t, f in zip(truth.tolist(), found.tolist())])
+            report.append({
+                "storage": storage,
+                "dimension": docs.shape[1],
+                "recall_at_k": round(float(recall), 4),
+                "index_bytes": index_nbytes(index),
+                "compression": round(baseline_bytes / max(index_nbytes(index), 1), 2)
+            })
+    return report
@@ -0,0 +1,69 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+class TTLCache:
+    """
+    In-process LRU cache with a per-entry TTL.
+
+    Entries older than `ttl` but younger than `ttl + stale_ttl` are still returned
+    by get_entry() flagged as stale, so callers can serve them immediately and
+    refresh in the background (stale-while-revalidate). Thread-safe.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0, stale_ttl: float = 0.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """Returns (value, is_stale) or None if missing/expired."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            age = now - stored_at
+            if age > self.ttl + self.stale_ttl:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value, age > self.ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Returns a fresh value or None."""
+        entry = self.get_entry(key)
+        if entry is None or entry[1]:
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> dict:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,64 @@
+import asyncio
+import fcntl
+import logging
+import multiprocessing
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+def worker_context() -> multiprocessing.context.BaseContext:
+    """
+    Start method for worker process pools. Pools are created lazily, after model,
+    embedding and event-loop threads exist, and forking a multithreaded process can
+    deadlock on locks held by other threads; forkserver forks workers from a clean
+    single-threaded server instead (spawn where forkserver is unavailable).
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one in-flight task.
+    Every caller awaits the same result; the entry is dropped once it settles,
+    so later calls start fresh.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            logger.debug(f"Joining in-flight call for {key}")
+        # Shield so one cancelled caller does not cancel the work for everyone else
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+class FileLock:
+    """Exclusive advisory (flock) lock shared by worker processes appending to one file set"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self):
+        self._f = open(self.path, "a")
+        fcntl.flock(self._f, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        fcntl.flock(self._f, fcntl.LOCK_UN)
+        self._f.close()
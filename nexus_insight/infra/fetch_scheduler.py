@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+class DomainBackoffError(Exception):
+    """Raised when a domain is backing off for longer than the caller is willing to wait."""
+    pass
+
+class _PriorityGate:
+    """Counting semaphore that hands free slots to the highest-priority waiter first."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: float):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed to us just before cancellation
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # Slot passes directly to the waiter
+                return
+        self.active -= 1
+
+class _DomainState:
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.next_allowed = 0.0
+        self.blocked_until = 0.0
+        self.strikes = 0
+        self.active = 0
+        self.users = 0  # Callers inside slot(), waiting or fetching
+
+class FetchScheduler:
+    """
+    Politeness-aware scheduler for outbound page fetches, shared by all sessions.
+
+    - Per-domain concurrency limit and minimum spacing between request starts.
+    - Global in-flight limit; queued fetches are admitted by priority (expected trust).
+    - Automatic exponential backoff when a domain answers 429/503 (honours Retry-After).
+    """
+
+    BACKOFF_STATUS = (429, 503)
+    _MAX_IDLE_DOMAINS = 1024
+
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        per_domain: int = 2,
+        min_interval: float = 0.5,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0
+    ):
+        self.per_domain = per_domain
+        self.min_interval = min_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._gate = _PriorityGate(max_in_flight)
+        self._domains: Dict[str, _DomainState] = {}
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        host = (urlsplit(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _domain(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            if len(self._domains) >= self._MAX_IDLE_DOMAINS:
+                self._prune()
+            state = self._domains[domain] = _DomainState(self.per_domain)
+        return state
+
+    def _prune(self):
+        now = time.monotonic()
+        for domain, state in list(self._domains.items()):
+            # A state with queued callers must survive, or a new one would bypass its semaphore
+            if state.users == 0 and state.blocked_until < now and state.next_allowed < now:
+                del self._domains[domain]
+
+    @asynccontextmanager
+    async def slot(self, url: str, priority: float = 0.5, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Waits for a domain slot, its politeness delay, and a global slot, in that order.
+        Raises DomainBackoffError instead of waiting out a backoff longer than max_wait.
+        """
+        domain = self.domain_of(url)
+        state = self._domain(domain)
+        state.users += 1
+
+        try:
+            async with state.semaphore:
+                now = time.monotonic()
+                blocked_for = state.blocked_until - now
+                if max_wait is not None and blocked_for > max_wait:
+                    raise DomainBackoffError(f"{domain} is backing off for another {blocked_for:.1f}s")
+
+                start_at = max(now, state.next_allowed, state.blocked_until)
+                state.next_allowed = start_at + self.min_interval
+                if start_at > now:
+                    await asyncio.sleep(start_at - now)
+
+                await self._gate.acquire(priority)
+                state.active += 1
+                try:
+                    yield
+                finally:
+                    state.active -= 1
+                    self._gate.release()
+        finally:
+            state.users -= 1
+
+    def record_response(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed response status back so throttling domains are backed off automatically."""
+        state = self._domain(self.domain_of(url))
+        if status_code in self.BACKOFF_STATUS:
+            state.strikes += 1
+            delay = min(self.backoff_base * (2 ** (state.strikes - 1)), self.backoff_max)
+            if retry_after and retry_after.isdigit():
+                delay = min(max(delay, float(retry_after)), self.backoff_max)
+            state.blocked_until = time.monotonic() + delay
+            logger.warning(f"{self.domain_of(url)} returned {status_code}; backing off {delay:.1f}s")
+        elif status_code < 400:
+            state.strikes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        now = time.monotonic()
+        return {
+            "in_flight": self._gate.active,
+            "queued": self._gate.queued,
+            "domains_tracked": len(self._domains),
+            "domains_backing_off": sum(1 for s in self._domains.values() if s.blocked_until > now)
+        }
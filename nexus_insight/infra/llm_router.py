@@ -1,13 +1,12 @@
 import logging
 import asyncio
 import time
-from typing import Dict, Union, Literal, Optional, Any
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_core.language_models.chat_models import BaseChatModel
-from groq import RateLimitError, APIStatusError
+from typing import TYPE_CHECKING, Dict, Union, Literal, Optional, Any
 from nexus_insight.config import settings
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 logger = logging.getLogger(__name__)
 
 class NexusLLMUnavailableError(Exception):
@@ -38,7 +37,7 @@ class LLMRouter:
     def __init__(self):
         self._current_backend = "groq" if settings.LLM_MODE in ["groq", "auto"] else "ollama"
 
-    async def get_llm(self, task_type: Literal["fast", "reasoning"]) -> BaseChatModel:
+    async def get_llm(self, task_type: Literal["fast", "reasoning"]) -> "BaseChatModel":
         """
         Returns appropriate LangChain chat model.
         Checks Groq availability first, falls back to Ollama.
@@ -53,7 +52,10 @@ class LLMRouter:
         # Auto mode: Return a resilient wrapper
         return ResilientLLMWrapper(self, task_type)
 
-    def _get_groq_llm(self, task_type: str) -> BaseChatModel:
+    def _get_groq_llm(self, task_type: str) -> "BaseChatModel":
+        # LangChain provider packages are imported on first use, not at service import
+        from langchain_groq import ChatGroq
+
         model_name = self.TASK_MODEL_MAP[task_type]["groq"]
         return ChatGroq(
             model=model_name,
@@ -62,7 +64,9 @@ class LLMRouter:
             max_retries=2
         )
 
-    async def _get_ollama_llm(self, task_type: str) -> BaseChatModel:
+    async def _get_ollama_llm(self, task_type: str) -> "BaseChatModel":
+        from langchain_ollama import ChatOllama
+
         if not await self._check_ollama_available():
             raise NexusLLMUnavailableError("Ollama is not reachable and Groq is disabled/unavailable.")
         
@@ -119,6 +123,8 @@ class ResilientLLMWrapper:
 
     async def ainvoke(self, input: Any, **kwargs) -> Any:
         if self.active_backend == "groq":
+            from groq import RateLimitError, APIStatusError
+
             try:
                 llm = self.router._get_groq_llm(self.task_type)
                 return await llm.ainvoke(input, **kwargs)
@@ -1,55 +1,165 @@
+import re
+import asyncio
+import hashlib
 import logging
-from presidio_analyzer import AnalyzerEngine
-from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from nexus_insight.infra.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+# Only real phone shapes, so years, figures and numeric lists are left alone
+PHONE = re.compile(
+    r"(?<![\w+.,-])(?<!\d )(?:"
+    r"\+\d{1,3}[\s.-]?(?:\(\d{1,4}\)[\s.-]?)?\d{2,4}(?:[\s.-]?\d{2,4}){2,4}"  # +44 20 7946 0958
+    r"|\(\d{2,4}\)[\s.-]?\d{3,4}[\s.-]?\d{3,4}"                             # (415) 555-0132
+    r"|\d{3}(?P<nanp>[-. ])\d{3}(?P=nanp)\d{4}"                                 # 415-555-0132
+    r"|0\d{2,4}(?P<trunk>[-. ])\d{3,4}(?P=trunk)\d{4}"                          # 020 7946 0958
+    r")(?!\w|[-.]\d| \d)"
+)
+# Any capitalized token may start a name or place, including at the start of a sentence;
+# only texts whose capitalized tokens are all common function words skip the NER
+CAPITALIZED = re.compile(r"\b[A-Z][\w'-]*")
+NON_NAMES = frozenset("""
+    a an the this that these those it its i we you he she they my our your their
+    what which who whom whose when where why how is are was were be been do does did
+    can could should would will shall may might must has have had
+    and or but if then so because as at by for from in into of on to with about after
+    before between during over under not no yes please also there here
+    all any each every some many much more most other such
+    list compare explain summarize summarise describe find show give tell analyze analyse
+""".split())
+
+ENTITY_TAGS = {"PERSON": "<PERSON>", "GPE": "<LOCATION>", "LOC": "<LOCATION>", "FAC": "<LOCATION>"}
+
+Span = Tuple[int, int, str]
+
 class PrivacyService:
     """
     Service for redacting PII from text before sending to external LLMs.
-    Uses Microsoft Presidio with spaCy.
+
+    Tiered: compiled regexes replace emails and phone numbers; spaCy NER (loaded on first
+    use or by warm_up) only runs on texts with a capitalized token that is not a common
+    function word, batched through
+    `nlp.pipe`. Recent results are kept in an LRU cache. Without the spaCy model only the
+    regex tier is applied.
     """
-    
-    def __init__(self):
-        try:
-            from presidio_analyzer.nlp_engine import NlpEngineProvider
-            
-            # Configure to use small model to save 400MB and improve speed
-            configuration = {
-                "nlp_engine_name": "spacy",
-                "models": [{"lang_code": "en", "model_name": "en_core_web_sm"}],
-            }
-            provider = NlpEngineProvider(nlp_configuration=configuration)
-            nlp_engine = provider.create_engine()
-            
-            self.analyzer = AnalyzerEngine(nlp_engine=nlp_engine)
-            self.anonymizer = AnonymizerEngine()
-            # Define standard operators
-            self.operators = {
-                "PERSON": OperatorConfig("replace", {"new_value": "<PERSON>"}),
-                "EMAIL_ADDRESS": OperatorConfig("replace", {"new_value": "<EMAIL>"}),
-                "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "<PHONE>"}),
-                "LOCATION": OperatorConfig("replace", {"new_value": "<LOCATION>"}),
-            }
-        except Exception as e:
-            logger.error(f"Failed to initialize Presidio: {e}. Privacy redaction will be disabled.")
-            self.analyzer = None
-            self.anonymizer = None
+
+    def __init__(self, model_name: str = "en_core_web_sm", cache_size: int = 4096, batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.nlp = None
+        self._cache = TTLCache(max_size=cache_size, ttl=3600.0)
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self.stats = {"texts": 0, "ner_texts": 0}
+
+    def warm_up(self):
+        """Load the spaCy model ahead of the first request"""
+        self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                import spacy
+
+                # Only the entity recognizer is needed; the parser and tagger dominate runtime
+                self.nlp = spacy.load(self.model_name, exclude=["parser", "tagger", "attribute_ruler", "lemmatizer"])
+                self.nlp.max_length = 2_000_000
+            except Exception as e:
+                logger.error(f"Failed to load spaCy model {self.model_name}: {e}. Only emails and phone numbers will be redacted.")
+                self.nlp = None
+            self._loaded = True
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
 
     def redact(self, text: str) -> str:
         """Redacts PII from the given text."""
-        if not text or not self.analyzer:
-            return text
-            
-        try:
-            results = self.analyzer.analyze(text=text, language='en', entities=list(self.operators.keys()))
-            anonymized_result = self.anonymizer.anonymize(
-                text=text,
-                analyzer_results=results,
-                operators=self.operators
-            )
-            return anonymized_result.text
-        except Exception as e:
-            logger.warning(f"Redaction failed: {e}")
+        return self.redact_batch([text])[0]
+
+    def redact_batch(self, texts: Sequence[str]) -> List[str]:
+        """Redacts many texts; NER runs once over the ones that need it"""
+        results: List[Optional[str]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text:
+                results[i] = text
+                continue
+            key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+            cached = self._cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            keys = list(pending)
+            unique = [texts[pending[key][0]] for key in keys]
+            for key, redacted in zip(keys, self._redact_uncached(unique)):
+                self._cache.set(key, redacted)
+                for i in pending[key]:
+                    results[i] = redacted
+        return results
+
+    async def aredact(self, text: str) -> str:
+        return (await self.aredact_batch([text]))[0]
+
+    async def aredact_batch(self, texts: Sequence[str]) -> List[str]:
+        """redact_batch on a worker thread, keeping NER off the event loop"""
+        return await asyncio.to_thread(self.redact_batch, list(texts))
+
+    def _redact_uncached(self, texts: List[str]) -> List[str]:
+        self.stats["texts"] += len(texts)
+        spans: List[List[Span]] = [self._pattern_spans(text) for text in texts]
+
+        candidates = [i for i, text in enumerate(texts) if self._may_contain_name(text)]
+        if candidates:
+            self._ensure_loaded()
+        if candidates and self.nlp is not None:
+            self.stats["ner_texts"] += len(candidates)
+            try:
+                docs = self.nlp.pipe((texts[i] for i in candidates), batch_size=self.batch_size)
+                for i, doc in zip(candidates, docs):
+                    spans[i].extend(
+                        (ent.start_char, ent.end_char, ENTITY_TAGS[ent.label_])
+                        for ent in doc.ents if ent.label_ in ENTITY_TAGS
+                    )
+            except Exception as e:
+                logger.warning(f"NER redaction failed: {e}")
+
+        return [self._apply(text, text_spans) for text, text_spans in zip(texts, spans)]
+
+    @staticmethod
+    def _may_contain_name(text: str) -> bool:
+        return any(m.group().lower() not in NON_NAMES for m in CAPITALIZED.finditer(text))
+
+    @staticmethod
+    def _pattern_spans(text: str) -> List[Span]:
+        spans = [(m.start(), m.end(), "<EMAIL>") for m in EMAIL.finditer(text)]
+        spans.extend((m.start(), m.end(), "<PHONE>") for m in PHONE.finditer(text))
+        return spans
+
+    @staticmethod
+    def _apply(text: str, spans: List[Span]) -> str:
+        """Replaces non-overlapping spans (earliest, then longest, wins)"""
+        if not spans:
             return text
+        parts, cursor = [], 0
+        for start, end, tag in sorted(spans, key=lambda s: (s[0], -s[1])):
+            if start < cursor:
+                continue
+            parts.append(text[cursor:start])
+            parts.append(tag)
+            cursor = end
+        parts.append(text[cursor:])
+        return "".join(parts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cache": self._cache.get_stats(), "ner_loaded": self.nlp is not None}
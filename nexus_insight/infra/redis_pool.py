@@ -0,0 +1,28 @@
+import asyncio
+import logging
+import weakref
+from typing import TYPE_CHECKING
+from nexus_insight.config import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# asyncio connections are bound to the loop that opened them: one client per loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+def get_redis() -> "Redis":
+    """
+    Shared async Redis client (and connection pool) for the running event loop.
+    Stores raw bytes; callers encode/decode their own values.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(settings.REDIS_URL, max_connections=settings.REDIS_MAX_CONNECTIONS)
+        _clients[loop] = client
+        logger.debug(f"Opened async Redis pool for {settings.REDIS_URL}")
+    return client
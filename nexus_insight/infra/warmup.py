@@ -0,0 +1,55 @@
+import time
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class WarmupManager:
+    """
+    Preloads models in the background after startup.
+
+    Registered steps run concurrently (sync steps on worker threads), so the service
+    accepts traffic immediately and `/v1/ready` reports when every step has finished.
+    A failed step does not block readiness; it is reported as degraded.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Callable[[], Any]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, step: Callable[[], Any]):
+        self._steps[name] = step
+        self._status[name] = {"status": "pending"}
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def run(self):
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self._steps.items()))
+
+    async def _run_step(self, name: str, step: Callable[[], Any]):
+        self._status[name] = {"status": "loading"}
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.to_thread(step)
+            self._status[name] = {"status": "ready", "seconds": round(time.perf_counter() - start, 2)}
+            logger.info(f"Warm-up of {name} finished in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            self._status[name] = {"status": "failed", "error": str(e), "seconds": round(time.perf_counter() - start, 2)}
+            logger.warning(f"Warm-up of {name} failed: {e}")
+
+    @property
+    def is_ready(self) -> bool:
+        return all(s["status"] in ("ready", "failed") for s in self._status.values())
+
+    def get_status(self) -> Dict[str, Any]:
+        degraded: List[str] = [name for name, s in self._status.items() if s["status"] == "failed"]
+        return {"ready": self.is_ready, "degraded": degraded, "components": dict(self._status)}
@@ -5,7 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from nexus_insight.api.routes import router, set_orchestrator
+from nexus_insight.api.routes import router, set_orchestrator, set_warmup
 from nexus_insight.agents.orchestrator import Orchestrator
 from nexus_insight.agents.researcher import ResearcherAgent
 from nexus_insight.agents.verifier import ChainOfVerificationVerifier
@@ -19,6 +19,7 @@ from nexus_insight.tools.pubmed_tool import PubmedTool
 from nexus_insight.cognition.graph import GraphExtractor
 from nexus_insight.cognition.embeddings import LocalEmbedder
 from nexus_insight.infra.llm_router import LLMRouter
+from nexus_insight.infra.warmup import WarmupManager
 from nexus_insight.config import settings
 
 logging.basicConfig(level=settings.LOG_LEVEL)
@@ -59,6 +60,20 @@ def create_app() -> FastAPI:
     
     # Inject orchestrator into routes
     set_orchestrator(orchestrator)
+
+    # Heavy models load lazily; the selected ones are preloaded concurrently after startup
+    warmup = WarmupManager()
+    warmup_steps = {
+        "embedder": lambda: pdf_tool.embeddings.warm_up().result(),
+        "privacy": orchestrator.privacy_service.warm_up,
+        "whisper": media_tool.jobs.warm_up,
+    }
+    for name in settings.WARMUP_COMPONENTS:
+        if name in warmup_steps:
+            warmup.register(name, warmup_steps[name])
+        else:
+            logger.warning(f"Unknown warm-up component: {name}")
+    set_warmup(warmup)
     
     app.include_router(router)
 
@@ -76,10 +91,13 @@ def create_app() -> FastAPI:
         # Proactively check backends
         info = await llm_router.get_backend_info()
         logger.info(f"Backend Status: {info}")
+        warmup.start()
 
     return app
 
-app = create_app()
+# Worker processes (forkserver/spawn) re-import the main module as __mp_main__; they must not build the app
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     uvicorn.run(app, host=settings.HOST, port=settings.PORT)
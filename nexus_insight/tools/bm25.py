@@ -0,0 +1,70 @@
+import re
+from typing import Dict, Iterable, List, Sequence
+import numpy as np
+
+# Words, plus numbers/dates/versions kept whole: "3.5", "2023-01-05", "1,200", "covid-19"
+_TOKEN = re.compile(r"\w+(?:[.,:/-]\w+)*")
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+class BM25Index:
+    """
+    Okapi BM25 over a document's chunks, as a CSR inverted index.
+
+    Each posting stores its precomputed BM25 impact (idf x saturated tf), so a query
+    is one vectorized scatter-add per query term over that term's posting list.
+    """
+
+    def __init__(self, chunks: Iterable[str], k1: float = 1.5, b: float = 0.75):
+        self._vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        lengths: List[int] = []
+        for text in chunks:
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            term_ids.extend(self._vocab.setdefault(t, len(self._vocab)) for t in tokens)
+
+        self.n_docs = len(lengths)
+        doc_len = np.array(lengths, dtype=np.float32)
+        terms = np.array(term_ids, dtype=np.int64)
+        docs = np.repeat(np.arange(self.n_docs, dtype=np.int64), lengths)
+
+        # Unique (term, doc) pairs sorted by term, then doc: CSR postings with term frequencies
+        pairs, tf = np.unique(terms * max(self.n_docs, 1) + docs, return_counts=True)
+        post_terms = pairs // max(self.n_docs, 1)
+        self._postings = (pairs % max(self.n_docs, 1)).astype(np.int32)
+        self._indptr = np.searchsorted(post_terms, np.arange(len(self._vocab) + 1))
+
+        df = np.diff(self._indptr).astype(np.float32)
+        idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+        avg_len = float(doc_len.mean()) if self.n_docs else 1.0
+        norm = k1 * (1 - b + b * doc_len[self._postings] / max(avg_len, 1e-9))
+        self._impacts = (np.repeat(idf, np.diff(self._indptr)) * tf * (k1 + 1) / (tf + norm)).astype(np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        return self._postings.nbytes + self._impacts.nbytes + self._indptr.nbytes + 64 * len(self._vocab)
+
+    def search(self, query: str, k: int) -> List[int]:
+        """Chunk indices of the top-k BM25 matches, best first (only chunks sharing a term)"""
+        term_ids = [self._vocab[t] for t in dict.fromkeys(tokenize(query)) if t in self._vocab]
+        if not term_ids or k <= 0:
+            return []
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for t in term_ids:
+            start, end = self._indptr[t], self._indptr[t + 1]
+            # Postings of one term are unique per chunk, so fancy-index add is safe
+            scores[self._postings[start:end]] += self._impacts[start:end]
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind="stable")].tolist()
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[int]:
+    """Merge ranked ID lists by sum of 1 / (k + rank); ties keep first-seen order"""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused, key=fused.__getitem__, reverse=True)
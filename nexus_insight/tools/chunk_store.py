@@ -0,0 +1,108 @@
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+PAGE_SEPARATOR = "\n\n"
+
+# Break preferences, strongest first: paragraph, line, sentence, word
+_BREAKS = ("\n\n", "\n", ". ", " ")
+_WHITESPACE = re.compile(r"\s+")
+
+class Chunk(str):
+    """A retrieved chunk: behaves as its text, and carries the 1-based page it starts on (None if unknown)."""
+
+    page: Optional[int]
+
+    def __new__(cls, text: str, page: Optional[int] = None):
+        chunk = super().__new__(cls, text)
+        chunk.page = page
+        return chunk
+
+class ChunkStore(Sequence):
+    """
+    All chunks of one document as a single text buffer plus an int64 (start, end, page) array.
+    Overlapping chunks share the buffer instead of duplicating text, and a chunk's
+    string is only materialized when it is retrieved.
+    """
+
+    def __init__(self, text: str, spans: np.ndarray):
+        self.text = text
+        self.spans = np.asarray(spans, dtype=np.int64).reshape(-1, 3)
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[str]) -> "ChunkStore":
+        """Wrap pre-split chunks laid end to end (pages unknown)"""
+        ends = np.cumsum([len(c) for c in chunks], dtype=np.int64)
+        starts = ends - np.array([len(c) for c in chunks], dtype=np.int64)
+        spans = np.stack([starts, ends, np.zeros_like(ends)], axis=1) if len(chunks) else np.empty((0, 3), np.int64)
+        return cls("".join(chunks), spans)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.text) + self.spans.nbytes
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        start, end, page = self.spans[i].tolist()
+        return Chunk(self.text[start:end], page or None)
+
+    def __iter__(self) -> Iterator[Chunk]:
+        for start, end, page in self.spans.tolist():
+            yield Chunk(self.text[start:end], page or None)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ChunkStore):
+            return self.text == other.text and np.array_equal(self.spans, other.spans)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+def chunk_pages(pages: List[str], chunk_size: int = 800, chunk_overlap: int = 100) -> ChunkStore:
+    """
+    Splits page texts into chunks of at most `chunk_size` characters, cutting at the
+    strongest break (paragraph, line, sentence, word) in the back half of each window.
+    Chunks never start or end inside a word, so no token is split in two.
+    """
+    text = PAGE_SEPARATOR.join(pages)
+    page_starts = np.cumsum([0] + [len(p) + len(PAGE_SEPARATOR) for p in pages[:-1]], dtype=np.int64)
+    spans: List[Tuple[int, int]] = []
+    n = len(text)
+
+    start = _skip_whitespace(text, 0)
+    while start < n:
+        end = min(start + chunk_size, n)
+        if end < n:
+            end = _find_break(text, start, end, chunk_size)
+        stripped = end - (len(text[start:end]) - len(text[start:end].rstrip()))
+        if stripped > start:
+            spans.append((start, stripped))
+        if end >= n:
+            break
+        # Step back by the overlap, then forward to the next word start
+        back = max(end - chunk_overlap, start + 1)
+        gap = _WHITESPACE.search(text, back, end)
+        start = _skip_whitespace(text, gap.end() if gap else end)
+
+    if not spans:
+        return ChunkStore(text, np.empty((0, 3), dtype=np.int64))
+    bounds = np.array(spans, dtype=np.int64)
+    pages_of = np.searchsorted(page_starts, bounds[:, 0], side="right")
+    return ChunkStore(text, np.column_stack([bounds, pages_of]))
+
+def _find_break(text: str, start: int, end: int, chunk_size: int) -> int:
+    floor = start + chunk_size // 2
+    for sep in _BREAKS:
+        pos = text.rfind(sep, floor, end)
+        if pos != -1:
+            return pos + len(sep.rstrip() or sep)
+    # No break in the window: cut before the word that straddles it
+    gap = text.rfind(" ", start + 1, end)
+    return gap if gap != -1 else end
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    match = _WHITESPACE.match(text, pos)
+    return match.end() if match else pos
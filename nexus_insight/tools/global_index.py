@@ -0,0 +1,356 @@
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Collection, Dict, List, Literal, Optional, Tuple
+import faiss
+import numpy as np
+from nexus_insight.infra.concurrency import FileLock
+
+logger = logging.getLogger(__name__)
+
+# Vector IDs pack the document ordinal (first 40 bits of its content hash) above the chunk number,
+# so each document owns one contiguous ID range and can be filtered with a range selector.
+CHUNK_BITS = 23
+MAX_CHUNKS = 1 << CHUNK_BITS
+
+def doc_ordinal(key: str) -> int:
+    return int(key[:10], 16)
+
+def vector_ids(key: str, n_chunks: int) -> np.ndarray:
+    return (doc_ordinal(key) << CHUNK_BITS) + np.arange(n_chunks, dtype=np.int64)
+
+def _doc_range(key: str) -> Tuple[int, int]:
+    start = doc_ordinal(key) << CHUNK_BITS
+    return start, start + MAX_CHUNKS
+
+class GlobalVectorIndex:
+    """
+    One approximate-nearest-neighbour index over every ingested document chunk.
+
+    The append-only vector log (`vectors.f32` + `ids.i64`) is the source of truth and is
+    shared by all worker processes; each process catches up on rows other processes
+    appended before searching. The ANN structure is rebuilt from the log by a background
+    maintenance thread:
+    - "hnsw": IndexHNSWFlat, grown incrementally; `ef_search` trades recall for latency.
+      With compressed `storage` the graph keeps float16 vectors (IndexHNSWSQ).
+    - "ivfpq": exact flat search until `train_min` vectors exist, then IVF-PQ trained in the
+      background and re-trained whenever the corpus doubles; `nprobe` is the knob.
+    """
+
+    PERSIST_DELAY = 2.0
+
+    def __init__(
+        self,
+        root: str,
+        kind: Literal["hnsw", "ivfpq"] = "hnsw",
+        nprobe: int = 16,
+        ef_search: int = 64,
+        hnsw_m: int = 32,
+        train_min: int = 20_000,
+        storage: str = "float32"
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.kind = kind
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.hnsw_m = hnsw_m
+        self.train_min = train_min
+        self.storage = storage
+
+        self.dim: Optional[int] = None
+        self._index: Optional[faiss.Index] = None
+        self._trained_rows = 0       # corpus size when the IVF-PQ quantizer was last trained
+        self._indexed_rows = 0       # log rows present in self._index
+        self._docs: Dict[int, str] = {}
+        self._docs_offset = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._ready = False
+
+        meta = self._read_json("meta.json")
+        if meta:
+            self.dim = meta["dim"]
+        self._load_docs()
+        self._maintenance = threading.Thread(target=self._maintenance_loop, name="nexus-global-index", daemon=True)
+        self._maintenance.start()
+        self._wake.set()
+
+    # ---- public API -------------------------------------------------------
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    @property
+    def ntotal(self) -> int:
+        return self._indexed_rows
+
+    def contains(self, key: str) -> bool:
+        return self._docs.get(doc_ordinal(key)) == key
+
+    def add(self, key: str, vectors: np.ndarray):
+        """Append a document's chunk vectors to the library (idempotent per document)"""
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        if self.contains(key) or len(vectors) == 0:
+            return
+        if len(vectors) > MAX_CHUNKS:
+            raise ValueError(f"Document {key} has more than {MAX_CHUNKS} chunks")
+
+        with self._lock:
+            with self._log_lock():
+                # Another process may have added the document since the unlocked check
+                self._load_docs()
+                if self.contains(key):
+                    return
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    self._write_json("meta.json", {"dim": self.dim})
+                with open(self.root / "vectors.f32", "ab") as f:
+                    vectors.tofile(f)
+                with open(self.root / "ids.i64", "ab") as f:
+                    vector_ids(key, len(vectors)).tofile(f)
+                with open(self.root / "docs.log", "a", encoding="utf-8") as f:
+                    f.write(key + "\n")
+            self._docs[doc_ordinal(key)] = key
+            self._catch_up()
+        self._wake.set()
+
+    def search(
+        self,
+        query_vecs: np.ndarray,
+        k: int,
+        include: Optional[Collection[str]] = None,
+        exclude: Optional[Collection[str]] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ) -> List[List[Tuple[str, int, float]]]:
+        """
+        Top-k chunks per query as (document key, chunk index, score), optionally restricted
+        to `include` documents and/or skipping `exclude` documents.
+        """
+        with self._lock:
+            self._load_docs()
+            self._catch_up()
+            if self._index is None or self._index.ntotal == 0:
+                return [[] for _ in range(len(query_vecs))]
+
+            keepalive = []
+            selector = self._selector(include, exclude, keepalive)
+            params = self._search_params(selector, nprobe, ef_search)
+            D, I = self._index.search(np.ascontiguousarray(query_vecs, dtype="float32"), k, params=params)
+
+        results = []
+        for scores, ids in zip(D, I):
+            row = []
+            for score, vid in zip(scores.tolist(), ids.tolist()):
+                if vid < 0:
+                    continue
+                key = self._docs.get(vid >> CHUNK_BITS)
+                if key is not None:
+                    row.append((key, vid & (MAX_CHUNKS - 1), score))
+            results.append(row)
+        return results
+
+    def get_stats(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "ready": self._ready,
+            "documents": len(self._docs),
+            "vectors": self._indexed_rows,
+            "trained_rows": self._trained_rows
+        }
+
+    # ---- index construction ----------------------------------------------
+
+    def _new_index(self, n_rows: int) -> Tuple[faiss.Index, int]:
+        """Empty index suited to the corpus size; returns (index, trained_rows)"""
+        if self.kind == "hnsw" and self.storage != "float32":
+            hnsw = faiss.IndexHNSWSQ(self.dim, faiss.ScalarQuantizer.QT_fp16, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            return faiss.IndexIDMap2(hnsw), 0
+        if self.kind == "hnsw":
+            return faiss.IndexIDMap2(faiss.IndexHNSWFlat(self.dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)), 0
+        if n_rows < self.train_min:
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.dim)), 0
+
+        nlist = int(min(max(4 * np.sqrt(n_rows), 64), n_rows // 39))
+        # PQ sub-quantizers: the largest common size that divides the dimension
+        m = next(m for m in (64, 48, 32, 24, 16, 12, 8, 4, 2, 1) if (self.dim % m == 0 and m <= self.dim // 4) or m == 1)
+        ivf = faiss.IndexIVFPQ(faiss.IndexFlatIP(self.dim), self.dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        sample = self._read_rows(0, n_rows)[0]
+        if len(sample) > 256 * nlist:
+            sample = sample[np.random.default_rng(0).choice(len(sample), 256 * nlist, replace=False)]
+        ivf.train(sample)
+        return faiss.IndexIDMap2(ivf), n_rows
+
+    def _needs_rebuild(self) -> bool:
+        if self.dim is None:
+            return False
+        if self._index is None:
+            return True
+        if self.kind != "ivfpq":
+            return False
+        rows = self._log_rows()
+        if self._trained_rows == 0:
+            return rows >= self.train_min
+        return rows >= 2 * self._trained_rows
+
+    def _rebuild(self):
+        """Build a fresh index from the log off-lock, then swap it in"""
+        saved = self._read_json("state.json")
+        index = None
+        if self._index is None and saved and (saved.get("kind"), saved.get("storage", "float32")) == (self.kind, self.storage):
+            try:
+                # state.json names the index file of its own generation, so the pair always matches
+                index = faiss.read_index(str(self.root / saved["file"]))
+                trained_rows, indexed_rows = saved["trained_rows"], saved["rows"]
+                logger.info(f"Loaded global {self.kind} index with {indexed_rows} vectors")
+            except Exception as e:
+                logger.warning(f"Saved global index unusable ({e}); rebuilding from the vector log")
+                index = None
+        if index is None:
+            n_rows = self._log_rows()
+            index, trained_rows = self._new_index(n_rows)
+            for start in range(0, n_rows, 50_000):
+                vectors, ids = self._read_rows(start, min(start + 50_000, n_rows))
+                index.add_with_ids(vectors, ids)
+            indexed_rows = n_rows
+            logger.info(f"Built global {self.kind} index over {n_rows} vectors")
+
+        with self._lock:
+            self._index, self._trained_rows, self._indexed_rows = index, trained_rows, indexed_rows
+            self._catch_up()
+            self._dirty = True
+            self._ready = True
+
+    def _catch_up(self):
+        """Add log rows appended since the index was built (by this or another process)"""
+        if self._index is None:
+            return
+        rows = self._log_rows()
+        if rows > self._indexed_rows:
+            vectors, ids = self._read_rows(self._indexed_rows, rows)
+            self._index.add_with_ids(vectors, ids)
+            self._indexed_rows = rows
+            self._dirty = True
+
+    def _persist(self):
+        """
+        Writes the index as a new generation file, then state.json pointing at it (both via
+        temp file + os.replace). Readers go through state.json, so they never pair an index
+        with another generation's row counts; the previous generation is kept for readers
+        that already hold its name.
+        """
+        with self._lock:
+            if not self._dirty or self._index is None:
+                return
+            with self._log_lock():
+                previous = self._read_json("state.json") or {}
+                generation = previous.get("generation", 0) + 1
+                name = f"global.{generation}.faiss"
+                tmp = self.root / f".{name}.{os.getpid()}.tmp"
+                faiss.write_index(self._index, str(tmp))
+                os.replace(tmp, self.root / name)
+                self._write_json("state.json", {
+                    "kind": self.kind, "storage": self.storage, "generation": generation, "file": name,
+                    "rows": self._indexed_rows, "trained_rows": self._trained_rows
+                })
+                for path in self.root.glob("global.*.faiss"):
+                    parts = path.name.split(".")
+                    if parts[1].isdigit() and int(parts[1]) < generation - 1:
+                        path.unlink(missing_ok=True)
+            self._dirty = False
+
+    def _maintenance_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.PERSIST_DELAY)  # Coalesce bursts of adds into one rebuild/persist
+            self._wake.clear()
+            try:
+                if self._needs_rebuild():
+                    self._rebuild()
+                self._persist()
+            except Exception as e:
+                logger.error(f"Global index maintenance failed: {e}")
+
+    # ---- helpers ------------------------------------------------------------
+
+    def _selector(self, include, exclude, keepalive: list) -> Optional[faiss.IDSelector]:
+        def ranges(keys):
+            sel = None
+            for key in keys:
+                r = faiss.IDSelectorRange(*_doc_range(key))
+                keepalive.append(r)
+                sel = r if sel is None else faiss.IDSelectorOr(sel, r)
+                keepalive.append(sel)
+            return sel
+
+        selector = None
+        if include is not None:
+            selector = ranges(include) or faiss.IDSelectorRange(0, 0)
+            keepalive.append(selector)
+        if exclude:
+            not_sel = faiss.IDSelectorNot(ranges(exclude))
+            keepalive.append(not_sel)
+            selector = not_sel if selector is None else faiss.IDSelectorAnd(selector, not_sel)
+            keepalive.append(selector)
+        return selector
+
+    def _search_params(self, selector, nprobe: Optional[int], ef_search: Optional[int]):
+        base = faiss.downcast_index(self._index.index)
+        if isinstance(base, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search or self.ef_search)
+        if isinstance(base, faiss.IndexIVF):
+            return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe or self.nprobe)
+        return faiss.SearchParameters(sel=selector) if selector is not None else None
+
+    def _log_rows(self) -> int:
+        if self.dim is None:
+            return 0
+        try:
+            return min(
+                os.path.getsize(self.root / "vectors.f32") // (4 * self.dim),
+                os.path.getsize(self.root / "ids.i64") // 8
+            )
+        except OSError:
+            return 0
+
+    def _read_rows(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        count = end - start
+        vectors = np.fromfile(self.root / "vectors.f32", dtype="float32", count=count * self.dim, offset=start * 4 * self.dim)
+        ids = np.fromfile(self.root / "ids.i64", dtype="int64", count=count, offset=start * 8)
+        return vectors.reshape(count, self.dim), ids
+
+    def _load_docs(self):
+        """Read document keys appended to docs.log since the last call"""
+        path = self.root / "docs.log"
+        if path.exists() and path.stat().st_size > self._docs_offset:
+            with open(path, "rb") as f:
+                f.seek(self._docs_offset)
+                tail = f.read()
+            complete = tail[:tail.rfind(b"\n") + 1]
+            self._docs_offset += len(complete)
+            for key in complete.decode("utf-8").split():
+                self._docs[doc_ordinal(key)] = key
+        if self.dim is None:
+            meta = self._read_json("meta.json")
+            if meta:
+                self.dim = meta["dim"]
+
+    def _log_lock(self):
+        return FileLock(self.root / ".lock")
+
+    def _read_json(self, name: str) -> Optional[Dict]:
+        try:
+            return json.loads((self.root / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_json(self, name: str, data: Dict):
+        tmp = self.root / f".{name}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.root / name)
@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional, Sequence
+import faiss
+import numpy as np
+from nexus_insight.tools.chunk_store import ChunkStore
+
+logger = logging.getLogger(__name__)
+
+VectorStorage = Literal["float32", "float16", "int8"]
+
+_SQ_TYPES = {"float16": faiss.ScalarQuantizer.QT_fp16, "int8": faiss.ScalarQuantizer.QT_8bit}
+
+def new_ip_index(dim: int, storage: VectorStorage = "float32") -> faiss.Index:
+    """Exact inner-product index storing vectors as float32, float16 (2x smaller) or int8 (4x smaller)"""
+    if storage == "float32":
+        return faiss.IndexFlatIP(dim)
+    return faiss.IndexScalarQuantizer(dim, _SQ_TYPES[storage], faiss.METRIC_INNER_PRODUCT)
+
+def index_nbytes(index: faiss.Index) -> int:
+    return index.ntotal * getattr(index, "code_size", index.d * 4)
+
+class IndexEntry:
+    """A loaded FAISS index with its chunks and document metadata."""
+
+    def __init__(self, index: faiss.Index, chunks: Sequence[str], meta: Dict[str, Any]):
+        self.index = index
+        self.chunks = chunks if isinstance(chunks, ChunkStore) else ChunkStore.from_chunks(chunks)
+        self.meta = meta
+        self.lexical = None  # BM25Index, built on first lexical query
+        self.nbytes = index_nbytes(index) + self.chunks.nbytes
+
+class IndexStore:
+    """
+    Content-hash keyed store for per-document FAISS indices.
+
+    On disk, each key has `<key>.faiss` (faiss.write_index), `<key>.txt` (the document
+    text), `<key>.spans.npy` ((start, end, page) per chunk) and `<key>.meta.json`.
+    Indices are read back memory-mapped. Hot entries are kept in an LRU bounded by
+    `max_bytes`; entries referenced by a live session are never evicted. Session
+    references expire after `ref_ttl` seconds so abandoned sessions cannot pin memory.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 512 * 1024 * 1024, ref_ttl: float = 3600.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ref_ttl = ref_ttl
+        self._hot: "OrderedDict[str, IndexEntry]" = OrderedDict()
+        self._hot_bytes = 0
+        self._refs: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.root / f"{key}{suffix}"
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            if key in self._hot:
+                return True
+        return self._path(key, ".meta.json").exists()
+
+    def put(self, key: str, index: faiss.Index, chunks: Sequence[str], meta: Dict[str, Any]):
+        """Persist an index atomically, then keep it hot. `chunks` is a ChunkStore or a list of strings."""
+        entry = IndexEntry(index, chunks, meta)
+        self._write_atomic(key, ".faiss", lambda p: faiss.write_index(index, str(p)))
+        self._write_atomic(key, ".txt", lambda p: p.write_text(entry.chunks.text, encoding="utf-8", newline=""))
+        self._write_atomic(key, ".spans.npy", lambda p: _save_npy(p, entry.chunks.spans))
+        # meta.json is written last: its presence marks a complete entry
+        self._write_atomic(key, ".meta.json", lambda p: p.write_text(json.dumps(meta, default=str), encoding="utf-8"))
+        self._insert(key, entry)
+
+    def get(self, key: str) -> Optional[IndexEntry]:
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+                return entry
+
+        entry = self._load(key)
+        if entry is not None:
+            self._insert(key, entry)
+        return entry
+
+    def acquire(self, key: str, session_id: str):
+        """Pin an entry for the lifetime of a session."""
+        with self._lock:
+            self._refs.setdefault(key, {})[session_id] = time.monotonic()
+
+    def release_session(self, session_id: str):
+        with self._lock:
+            for key in list(self._refs):
+                self._refs[key].pop(session_id, None)
+                if not self._refs[key]:
+                    del self._refs[key]
+            self._evict()
+
+    def attach_lexical(self, entry: IndexEntry, lexical: Any) -> Any:
+        """
+        Sets an entry's lazily built BM25 index and counts its size towards the memory
+        budget. If another thread got there first, its index is kept and returned.
+        """
+        with self._lock:
+            if entry.lexical is None:
+                entry.lexical = lexical
+                entry.nbytes += lexical.nbytes
+                if any(hot is entry for hot in self._hot.values()):
+                    self._hot_bytes += lexical.nbytes
+                    self._evict()
+            return entry.lexical
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hot_entries": len(self._hot), "hot_bytes": self._hot_bytes, "pinned": len(self._refs)}
+
+    def _is_pinned(self, key: str, now: float) -> bool:
+        refs = self._refs.get(key)
+        if not refs:
+            return False
+        for session_id, t in list(refs.items()):
+            if now - t > self.ref_ttl:
+                del refs[session_id]
+        return bool(refs)
+
+    def _insert(self, key: str, entry: IndexEntry):
+        with self._lock:
+            old = self._hot.pop(key, None)
+            if old is not None:
+                self._hot_bytes -= old.nbytes
+            self._hot[key] = entry
+            self._hot_bytes += entry.nbytes
+            self._evict()
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in list(self._hot):
+            if self._hot_bytes <= self.max_bytes:
+                break
+            if self._is_pinned(key, now):
+                continue
+            entry = self._hot.pop(key)
+            self._hot_bytes -= entry.nbytes
+            logger.debug(f"Evicted index {key} ({entry.nbytes} bytes) from memory")
+
+    def _load(self, key: str) -> Optional[IndexEntry]:
+        if not self._path(key, ".meta.json").exists():
+            return None
+        try:
+            index = faiss.read_index(str(self._path(key, ".faiss")), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            with open(self._path(key, ".txt"), encoding="utf-8", newline="") as f:
+                text = f.read()
+            chunks = ChunkStore(text, np.load(self._path(key, ".spans.npy"), allow_pickle=False))
+            meta = json.loads(self._path(key, ".meta.json").read_text(encoding="utf-8"))
+            return IndexEntry(index, chunks, meta)
+        except Exception as e:
+            logger.error(f"Failed to load index {key} from disk: {e}")
+            return None
+
+    def _write_atomic(self, key: str, suffix: str, write):
+        final = self._path(key, suffix)
+        tmp = final.with_name(f".{final.name}.{os.getpid()}.tmp")
+        write(tmp)
+        os.replace(tmp, final)
+
+def _save_npy(path: Path, array: np.ndarray):
+    # np.save on a path would append ".npy" to the temp name
+    with open(path, "wb") as f:
+        np.save(f, array, allow_pickle=False)
@@ -1,83 +1,73 @@
-import os
+import asyncio
 import logging
-import hashlib
-import json
 from datetime import datetime
-from typing import Optional, Dict, List
-import yt_dlp
-from faster_whisper import WhisperModel
-import redis
+from typing import Any, Callable, Dict, List, Optional
 from nexus_insight.cognition.state import RawSource, SourceType
-from nexus_insight.config import settings
+from nexus_insight.infra.cache import TTLCache
+from nexus_insight.tools.media_jobs import MediaJobQueue
+from nexus_insight.tools.media_worker import resolve_media_id
+from nexus_insight.tools.transcript_cache import TranscriptCache, format_segments
 
 logger = logging.getLogger(__name__)
 
 class MediaAnalyzer:
     """
     Video/Audio analyzer using yt-dlp for download and faster-whisper for local transcription.
-    Caches results in Redis.
+    Audio is decoded once to 16 kHz mono PCM in memory, without an intermediate MP3.
+    Jobs run in a dedicated process pool (see MediaJobQueue). Transcripts are cached in
+    Redis and jobs deduplicated by canonical media id, not by URL spelling.
     """
 
     def __init__(self):
-        self.redis_client = None
-        try:
-            self.redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-        except Exception as e:
-            logger.warning(f"Redis not available for media cache: {e}")
-        
-        self._whisper_model = None
+        self.cache = TranscriptCache()
+        self.jobs = MediaJobQueue()
+        self._media_ids = TTLCache(max_size=4096, ttl=86400.0)
 
-    def _get_whisper_model(self) -> WhisperModel:
-        if self._whisper_model is None:
-            logger.info(f"Loading Whisper model: {settings.WHISPER_MODEL}")
-            self._whisper_model = WhisperModel(
-                settings.WHISPER_MODEL, 
-                device="auto", 
-                compute_type="auto"
-            )
-        return self._whisper_model
+    async def resolve_media_id(self, url: str) -> str:
+        media_id = self._media_ids.get(url)
+        if media_id is None:
+            media_id = await asyncio.to_thread(resolve_media_id, url)
+            self._media_ids.set(url, media_id)
+        return media_id
+
+    async def process_video(
+        self,
+        url: str,
+        session_id: Optional[str] = None,
+        on_transcript: Optional[Callable[[RawSource, List[str]], None]] = None
+    ) -> RawSource:
+        """
+        Main entry point for video processing.
+
+        With `on_transcript`, the transcript is streamed while it is decoded: the callback
+        gets a partial source (same id as the final one, transcript so far) and the new lines.
+        """
+        media_id = await self.resolve_media_id(url)
 
-    async def process_video(self, url: str) -> RawSource:
-        """Main entry point for video processing"""
-        cache_key = f"transcript:{hashlib.sha256(url.encode()).hexdigest()}"
-        
         # Check cache
-        if self.redis_client:
-            cached = self.redis_client.get(cache_key)
-            if cached:
-                logger.info("Found transcript in cache")
-                data = json.loads(cached)
-                return RawSource(**data)
+        cached = await self.cache.get(media_id)
+        if cached:
+            logger.info(f"Found transcript for {media_id} in cache")
+            return self._source(url, media_id, format_segments(cached["segments"]), cached["metadata"])
 
         # Download and transcribe
         try:
-            audio_path, metadata = self._download_audio(url)
-            transcript = self._transcribe(audio_path)
-            
-            # Clean up audio file
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+            progress = None
+            if on_transcript:
+                lines: List[str] = []
 
-            source = RawSource(
-                id=f"media-{hash(url)}",
-                source_type=SourceType.VIDEO,
-                url=url,
-                content=transcript,
-                metadata=metadata,
-                trust_score=0.70,
-                fetched_at=datetime.now()
-            )
+                def progress(new_lines: List[str]):
+                    lines.extend(new_lines)
+                    on_transcript(self._source(url, media_id, "\n".join(lines), {"partial": True}), new_lines)
 
-            # Store in cache
-            if self.redis_client:
-                self.redis_client.setex(cache_key, 86400, source.model_dump_json())
-
-            return source
+            transcript, metadata = await self.jobs.transcribe(url, session_id, progress, key=media_id)
+            await self.cache.set(media_id, url, transcript, metadata)
+            return self._source(url, media_id, transcript, metadata)
 
         except Exception as e:
             logger.error(f"Failed to process video {url}: {e}")
             return RawSource(
-                id=f"media-error-{hash(url)}",
+                id=f"media-error-{media_id}",
                 source_type=SourceType.VIDEO,
                 url=url,
                 content="",
@@ -86,42 +76,18 @@ class MediaAnalyzer:
                 fetched_at=datetime.now()
             )
 
-    def _download_audio(self, url: str) -> tuple[str, Dict]:
-        temp_dir = "/tmp/nexus_media"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "quiet": True,
-            "outtmpl": f"{temp_dir}/%(id)s.%(ext)s",
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }],
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            audio_path = f"{temp_dir}/{info['id']}.mp3"
-            metadata = {
-                "title": info.get("title"),
-                "uploader": info.get("uploader"),
-                "duration": info.get("duration"),
-                "upload_date": info.get("upload_date"),
-                "description": info.get("description", "")[:500]
-            }
-            return audio_path, metadata
+    @staticmethod
+    def _source(url: str, media_id: str, transcript: str, metadata: Dict[str, Any]) -> RawSource:
+        return RawSource(
+            id=f"media-{media_id}",
+            source_type=SourceType.VIDEO,
+            url=url,
+            content=transcript,
+            metadata={**metadata, "media_id": media_id},
+            trust_score=0.70,
+            fetched_at=datetime.now()
+        )
 
-    def _transcribe(self, audio_path: str) -> str:
-        model = self._get_whisper_model()
-        segments, info = model.transcribe(audio_path, beam_size=5)
-        
-        full_transcript = []
-        for segment in segments:
-            m, s = divmod(int(segment.start), 60)
-            h, m = divmod(m, 60)
-            timestamp = f"[{h:02d}:{m:02d}:{s:02d}]"
-            full_transcript.append(f"{timestamp} {segment.text}")
-            
-        return "\n".join(full_transcript)
+    def release_session(self, session_id: str):
+        """Cancel media jobs that only this session was waiting for"""
+        self.jobs.release_session(session_id)
@@ -0,0 +1,211 @@
+import os
+import uuid
+import asyncio
+import functools
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from nexus_insight.infra.concurrency import worker_context
+from nexus_insight.tools.media_worker import JobCancelled, load_model, run_job
+from nexus_insight.config import settings
+
+logger = logging.getLogger(__name__)
+
+class MediaQueueFullError(RuntimeError):
+    """Raised when every worker is busy and the pending queue is full"""
+
+class _MediaJob:
+    def __init__(self, url: str, key: str, pool_future: Future, cancel_path: str, progress_path: str):
+        self.url = url
+        self.key = key
+        self.pool_future = pool_future
+        self.future = asyncio.wrap_future(pool_future)
+        self.cancel_path = cancel_path
+        self.progress_path = progress_path
+        self.waiters: Dict[Optional[str], int] = {}
+        self.cancelled = False
+
+class MediaJobQueue:
+    """
+    Runs media download + transcription in a dedicated process pool.
+
+    At most `workers + queue_size` jobs are admitted; further URLs are rejected with
+    MediaQueueFullError instead of piling up. Callers asking for a URL that is already
+    in flight join that job. A job is cancelled once no caller or session still wants
+    it: queued jobs are dropped, running ones stop at the next segment via a marker file.
+    Workers append finished transcript lines to a progress file that callers can follow.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        model_size: Optional[str] = None,
+        temp_dir: str = "/tmp/nexus_media",
+        job: Optional[Callable[[str, str, str, str, str], Tuple[str, Dict[str, Any]]]] = None,
+        warm: Optional[Callable[[str], Any]] = None
+    ):
+        self.workers = workers or settings.MEDIA_WORKERS
+        self.queue_size = settings.MEDIA_QUEUE_SIZE if queue_size is None else queue_size
+        self.model_size = model_size or settings.WHISPER_MODEL
+        self.temp_dir = temp_dir
+        self.progress_interval = settings.MEDIA_PROGRESS_INTERVAL
+        chunked = settings.MEDIA_TRANSCRIBE_MODE == "chunked"
+        parallelism = settings.MEDIA_TRANSCRIBE_PARALLELISM if chunked else 1
+        self._job = job or functools.partial(
+            run_job,
+            mode=settings.MEDIA_TRANSCRIBE_MODE,
+            parallelism=parallelism,
+            max_segment_seconds=settings.MEDIA_SEGMENT_MAX_SECONDS
+        )
+        self._warm = warm or functools.partial(load_model, parallelism=parallelism)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, _MediaJob] = {}
+        self._active: Set[_MediaJob] = set()
+        self._stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "cancelled": 0}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Not fork: warm-up creates this pool while the embedder loads on another thread
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=worker_context()
+            )
+        return self._pool
+
+    async def transcribe(
+        self,
+        url: str,
+        session_id: Optional[str] = None,
+        on_progress: Optional[Callable[[List[str]], Any]] = None,
+        key: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Returns (transcript, metadata) for `url`, joining an in-flight job with the same
+        `key` (default: the URL) if there is one. `on_progress` receives batches of new
+        transcript lines while the job runs.
+        """
+        key = key or url
+        job = self._jobs.get(key)
+        if job is None:
+            job = self._submit(url, key)
+        else:
+            self._stats["deduplicated"] += 1
+            logger.debug(f"Joining in-flight media job for {key}")
+
+        job.waiters[session_id] = job.waiters.get(session_id, 0) + 1
+        try:
+            if on_progress is None:
+                # Shield so one cancelled caller does not cancel the job for the others
+                return await asyncio.shield(job.future)
+            return await self._follow(job, on_progress)
+        except asyncio.CancelledError:
+            if job.future.cancelled():
+                # Dropped from the queue on behalf of another caller/session
+                raise JobCancelled(url)
+            self._drop_waiter(job, session_id)
+            raise
+
+    async def _follow(self, job: _MediaJob, on_progress: Callable[[List[str]], Any]) -> Tuple[str, Dict[str, Any]]:
+        """Polls the job's progress file until it finishes; the final transcript supplies any tail"""
+        offset, emitted = 0, 0
+        while not job.future.done():
+            # asyncio.wait leaves the job running if this caller is cancelled
+            await asyncio.wait([job.future], timeout=self.progress_interval)
+            if job.future.done():
+                break
+            try:
+                with open(job.progress_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            # Only complete lines; a partially flushed one is picked up next time
+            complete = data[:data.rfind(b"\n") + 1]
+            if complete:
+                offset += len(complete)
+                lines = complete.decode("utf-8").splitlines()
+                emitted += len(lines)
+                on_progress(lines)
+
+        transcript, metadata = job.future.result()
+        tail = transcript.split("\n")[emitted:] if transcript else []
+        if tail:
+            on_progress(tail)
+        return transcript, metadata
+
+    def _submit(self, url: str, key: str) -> _MediaJob:
+        if len(self._active) >= self.workers + self.queue_size:
+            self._stats["rejected"] += 1
+            raise MediaQueueFullError(f"Media queue full ({len(self._active)} jobs)")
+
+        os.makedirs(self.temp_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        cancel_path = os.path.join(self.temp_dir, f"{job_id}.cancel")
+        progress_path = os.path.join(self.temp_dir, f"{job_id}.partial")
+        pool_future = self._get_pool().submit(self._job, url, self.temp_dir, self.model_size, cancel_path, progress_path)
+        job = _MediaJob(url, key, pool_future, cancel_path, progress_path)
+        self._jobs[key] = job
+        self._active.add(job)
+        job.future.add_done_callback(lambda _, j=job: self._finish(j))
+        self._stats["submitted"] += 1
+        return job
+
+    def _finish(self, job: _MediaJob):
+        self._active.discard(job)
+        if job.cancelled and not job.future.cancelled():
+            job.future.exception()  # JobCancelled may have no caller left to retrieve it
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        # A marker written just as the job finished is never consumed by the worker
+        for path in (job.cancel_path, job.progress_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _drop_waiter(self, job: _MediaJob, session_id: Optional[str]):
+        remaining = job.waiters.get(session_id, 0) - 1
+        if remaining > 0:
+            job.waiters[session_id] = remaining
+        else:
+            job.waiters.pop(session_id, None)
+        if not job.waiters:
+            self._cancel(job)
+
+    def _cancel(self, job: _MediaJob):
+        if job.cancelled or job.future.done():
+            return
+        job.cancelled = True
+        self._stats["cancelled"] += 1
+        # Later requests for the URL start a fresh job rather than joining a dying one
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        if job.pool_future.cancel():
+            logger.info(f"Dropped queued media job for {job.url}")
+        else:
+            open(job.cancel_path, "w").close()
+            logger.info(f"Cancelling running media job for {job.url}")
+
+    def release_session(self, session_id: str):
+        """Withdraws the session from every job; jobs nobody else wants are cancelled"""
+        for job in list(self._active):
+            if job.waiters.pop(session_id, None) and not job.waiters:
+                self._cancel(job)
+
+    def warm_up(self):
+        """Loads the Whisper model in each worker process (blocking)"""
+        pool = self._get_pool()
+        for future in [pool.submit(self._warm, self.model_size) for _ in range(self.workers)]:
+            future.result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "active": len(self._active),
+            **self._stats
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
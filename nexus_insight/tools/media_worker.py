@@ -0,0 +1,278 @@
+# Process-pool entry points for media download and transcription.
+# yt-dlp, PyAV and faster-whisper are imported inside the worker only; each worker keeps
+# its Whisper model loaded between jobs.
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLING_RATE = 16000
+
+_model = None
+_model_key: Optional[Tuple[str, int]] = None
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job's cancel marker appears"""
+
+def check_cancelled(cancel_path: str):
+    if cancel_path and os.path.exists(cancel_path):
+        raise JobCancelled(cancel_path)
+
+def load_model(model_size: str, parallelism: int = 1):
+    """
+    One model per worker process. With parallelism > 1 CTranslate2 keeps that many
+    decoders, so segments transcribed from parallel threads really run on separate cores.
+    """
+    global _model, _model_key
+    if _model is None or _model_key != (model_size, parallelism):
+        from faster_whisper import WhisperModel
+
+        logger.info(f"Loading Whisper model: {model_size} x{parallelism} (pid {os.getpid()})")
+        _model = WhisperModel(
+            model_size,
+            device="auto",
+            compute_type="auto",
+            num_workers=parallelism,
+            cpu_threads=max(1, (os.cpu_count() or 1) // parallelism)
+        )
+        _model_key = (model_size, parallelism)
+    return _model
+
+def format_timestamp(seconds: float) -> str:
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"[{h:02d}:{m:02d}:{s:02d}]"
+
+def _metadata(info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": info.get("title"),
+        "uploader": info.get("uploader"),
+        "duration": info.get("duration"),
+        "upload_date": info.get("upload_date"),
+        "description": (info.get("description") or "")[:500]
+    }
+
+def local_media_id(url: str) -> Optional[str]:
+    """
+    "extractor:id" from yt-dlp's URL patterns alone, without any network call. Only for
+    URLs whose extractor returns single videos: playlist-capable ones (e.g. a watch URL
+    inside a playlist) may resolve to another id.
+    """
+    from yt_dlp.extractor import gen_extractor_classes
+
+    # The first suitable extractor is the one YoutubeDL itself would pick
+    for ie in gen_extractor_classes():
+        if ie.suitable(url):
+            if getattr(ie, "_RETURN_TYPE", None) != "video":
+                return None
+            video_id = ie.get_temp_id(url)
+            return f"{ie.ie_key()}:{video_id}" if video_id else None
+    return None
+
+def resolve_media_id(url: str) -> str:
+    """
+    Canonical "extractor:id" for a media URL, so youtu.be links, timestamped and playlist
+    watch URLs of one video agree. Derived locally from the URL when possible; otherwise
+    yt-dlp's extractor runs (no format resolution, no download). Falls back to a hash of
+    the URL when nothing matches, or when only the Generic extractor does: its id is just
+    the file name, which unrelated hosts share.
+    """
+    import yt_dlp
+
+    try:
+        media_id = local_media_id(url)
+        if media_id:
+            return media_id
+        with yt_dlp.YoutubeDL({"quiet": True, "noplaylist": True}) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+        extractor = info.get("ie_key") or info.get("extractor_key")
+        if extractor and extractor != "Generic" and info.get("id"):
+            return f"{extractor}:{info['id']}"
+    except Exception as e:
+        logger.debug(f"Could not resolve media id for {url}: {e}")
+    return f"url:{hashlib.sha256(url.encode()).hexdigest()[:32]}"
+
+def decode_pcm(source: str, headers: Optional[Dict[str, str]] = None, cancel_path: str = "") -> np.ndarray:
+    """
+    Decodes a file path or stream URL once, straight to 16 kHz mono float32 PCM in
+    memory (the format Whisper consumes). Undecodable frames are skipped.
+    """
+    import av
+
+    options = {}
+    if headers:
+        options["headers"] = "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLING_RATE)
+    parts: List[np.ndarray] = []
+
+    with av.open(source, mode="r", options=options, metadata_errors="ignore") as container:
+        frames = container.decode(audio=0)
+        while True:
+            try:
+                frame = next(frames)
+            except StopIteration:
+                break
+            except av.error.InvalidDataError:
+                continue
+            if len(parts) % 256 == 0:
+                check_cancelled(cancel_path)
+            parts.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(frame))
+        parts.extend(out.to_ndarray().reshape(-1) for out in resampler.resample(None))
+
+    if not parts:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(parts).astype(np.float32) / 32768.0
+
+def fetch_audio(url: str, temp_dir: str, cancel_path: str = "") -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Returns (16 kHz mono PCM, metadata) for the best audio stream, without re-encoding.
+    Progressive HTTP streams are decoded directly from the network; other protocols
+    (HLS/DASH fragments) are downloaded as-is to `temp_dir`, decoded, then removed.
+    """
+    import yt_dlp
+
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "noplaylist": True,
+        "outtmpl": f"{temp_dir}/%(id)s.%(ext)s",
+        # Abort between download chunks once the job is cancelled
+        "progress_hooks": [lambda _: check_cancelled(cancel_path)],
+    }
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+        metadata = _metadata(info)
+        check_cancelled(cancel_path)
+
+        if info.get("protocol") in ("http", "https") and info.get("url"):
+            return decode_pcm(info["url"], info.get("http_headers"), cancel_path), metadata
+
+        os.makedirs(temp_dir, exist_ok=True)
+        ydl.process_info(info)
+        path = ydl.prepare_filename(info)
+        try:
+            return decode_pcm(path, cancel_path=cancel_path), metadata
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+def emit_lines(progress_path: str, lines: Sequence[str]):
+    """Appends finished transcript lines for the parent process to stream"""
+    if progress_path and lines:
+        with open(progress_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{line}\n" for line in lines))
+
+def transcribe(audio: Union[str, np.ndarray], model_size: str, cancel_path: str = "", progress_path: str = "") -> str:
+    """Single pass: the whole recording goes through one sequential decode"""
+    model = load_model(model_size)
+    return "\n".join(_decode(model, audio, 0.0, cancel_path, progress_path))
+
+def _decode(model, audio, offset: float, cancel_path: str, progress_path: str = "") -> List[str]:
+    segments, _ = model.transcribe(audio, beam_size=5)
+    lines = []
+    # Segments are decoded lazily, so cancellation is checked between them
+    for segment in segments:
+        check_cancelled(cancel_path)
+        line = f"{format_timestamp(offset + segment.start)} {segment.text}"
+        emit_lines(progress_path, [line])
+        lines.append(line)
+    return lines
+
+def plan_segments(speech: Sequence[Dict[str, int]], max_samples: int) -> List[Tuple[int, int]]:
+    """
+    Groups VAD speech spans (sample offsets) into segments of at most `max_samples`,
+    cutting only in the silence between spans. A single span longer than the limit
+    is split at the limit.
+    """
+    segments: List[Tuple[int, int]] = []
+    start = end = None
+    for span in speech:
+        if start is not None and span["end"] - start > max_samples:
+            segments.append((start, end))
+            start = None
+        if start is None:
+            start = span["start"]
+        end = span["end"]
+        while end - start > max_samples:
+            segments.append((start, start + max_samples))
+            start += max_samples
+    if start is not None:
+        segments.append((start, end))
+    return segments
+
+def transcribe_segments(
+    model,
+    audio,
+    segments: Sequence[Tuple[int, int]],
+    parallelism: int,
+    cancel_path: str = "",
+    progress_path: str = ""
+) -> str:
+    """
+    Decodes each (start, end) slice of `audio` on its own thread and stitches the lines
+    in order. Each segment's lines are emitted once every earlier segment is done.
+    """
+    def decode(segment: Tuple[int, int]) -> List[str]:
+        check_cancelled(cancel_path)
+        start, end = segment
+        return _decode(model, audio[start:end], start / SAMPLING_RATE, cancel_path)
+
+    lines: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, parallelism)) as pool:
+        for part in pool.map(decode, segments):
+            emit_lines(progress_path, part)
+            lines.extend(part)
+    return "\n".join(lines)
+
+def transcribe_chunked(
+    audio: Union[str, np.ndarray],
+    model_size: str,
+    cancel_path: str = "",
+    progress_path: str = "",
+    parallelism: int = 2,
+    max_segment_seconds: float = 120.0
+) -> str:
+    """
+    VAD-segmented mode: speech is split at silences into segments of bounded length,
+    decoded concurrently and stitched back with absolute timestamps.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    model = load_model(model_size, parallelism)
+    if isinstance(audio, str):
+        audio = decode_pcm(audio, cancel_path=cancel_path)
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    segments = plan_segments(speech, int(max_segment_seconds * SAMPLING_RATE))
+    logger.info(f"Transcribing {len(audio) / SAMPLING_RATE:.0f}s of audio as {len(segments)} segments x{parallelism}")
+    return transcribe_segments(model, audio, segments, parallelism, cancel_path, progress_path)
+
+def run_job(
+    url: str,
+    temp_dir: str,
+    model_size: str,
+    cancel_path: str,
+    progress_path: str = "",
+    mode: str = "single",
+    parallelism: int = 1,
+    max_segment_seconds: float = 120.0
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Fetch and transcribe one URL, appending transcript lines to `progress_path` as
+    they are final. The cancel marker is always removed.
+    """
+    try:
+        check_cancelled(cancel_path)
+        audio, metadata = fetch_audio(url, temp_dir, cancel_path)
+        if mode == "chunked":
+            transcript = transcribe_chunked(audio, model_size, cancel_path, progress_path, parallelism, max_segment_seconds)
+        else:
+            transcript = transcribe(audio, model_size, cancel_path, progress_path)
+        return transcript, metadata
+    finally:
+        if os.path.exists(cancel_path):
+            os.remove(cancel_path)
@@ -1,14 +1,21 @@
-import os
+import asyncio
+import functools
+import hashlib
 import logging
-import fitz  # PyMuPDF
-import faiss
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import httpx
 from datetime import datetime
-from typing import List, Optional, Dict
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from typing import Collection, List, Optional, Dict, Sequence
 from nexus_insight.cognition.state import RawSource, SourceType
 from nexus_insight.cognition.embeddings import LocalEmbedder
+from nexus_insight.cognition.embedding_service import EmbeddingService
+from nexus_insight.tools.index_store import IndexStore, IndexEntry, new_ip_index
+from nexus_insight.tools.chunk_store import ChunkStore, chunk_pages
+from nexus_insight.tools.bm25 import BM25Index, reciprocal_rank_fusion
+from nexus_insight.tools.global_index import GlobalVectorIndex
+from nexus_insight.tools.pdf_parsing import read_document_info, extract_pages, page_ranges
+from nexus_insight.infra.concurrency import SingleFlight, worker_context
 from nexus_insight.config import settings
 
 logger = logging.getLogger(__name__)
@@ -16,54 +23,94 @@ logger = logging.getLogger(__name__)
 class PDFEngine:
     """
     PDF engine for extraction, chunking, and local vector indexing.
+    Indices are keyed by a hash of the PDF bytes and persisted in an IndexStore,
+    so the same document is embedded once across sessions and restarts.
+
+    All CPU work is kept off the event loop: large documents are parsed across a
+    process pool, and embedding goes through an EmbeddingService whose worker thread owns
+    the model and batches requests from concurrent sessions together.
     """
 
-    def __init__(self, embedder: LocalEmbedder):
+    SNIPPET_CHARS = 5000
+    CHUNK_SIZE = 800
+    CHUNK_OVERLAP = 100
+
+    def __init__(
+        self,
+        embedder: LocalEmbedder,
+        index_store: Optional[IndexStore] = None,
+        global_index: Optional[GlobalVectorIndex] = None,
+        embedding_service: Optional[EmbeddingService] = None
+    ):
         self.embedder = embedder
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800, 
-            chunk_overlap=100
+        self.index_store = index_store or IndexStore(
+            settings.INDEX_STORE_DIR,
+            max_bytes=settings.INDEX_CACHE_MAX_BYTES,
+            ref_ttl=settings.INDEX_SESSION_REF_TTL
+        )
+        self.global_index = global_index
+        if self.global_index is None and settings.GLOBAL_INDEX_ENABLED:
+            self.global_index = GlobalVectorIndex(
+                f"{settings.INDEX_STORE_DIR}/global",
+                kind=settings.GLOBAL_INDEX_KIND,
+                nprobe=settings.GLOBAL_INDEX_NPROBE,
+                ef_search=settings.GLOBAL_INDEX_EF_SEARCH,
+                train_min=settings.GLOBAL_INDEX_TRAIN_MIN,
+                storage=settings.INDEX_VECTOR_STORAGE
+            )
+        self.embeddings = embedding_service or EmbeddingService(
+            embedder,
+            max_batch=settings.EMBED_BATCH_MAX,
+            max_wait_ms=settings.EMBED_BATCH_WAIT_MS
         )
-        self.indices: Dict[str, faiss.Index] = {}
-        self.chunk_store: Dict[str, List[str]] = {}
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._inflight_ingests = SingleFlight()
+
+    @staticmethod
+    def _source_id(key: str) -> str:
+        return f"pdf-{key}"
+
+    @staticmethod
+    def _store_key(source_id: str) -> str:
+        return source_id.removeprefix("pdf-")
 
-    async def process_source(self, url_or_path: str) -> RawSource:
+    async def process_source(self, url_or_path: str, session_id: Optional[str] = None) -> RawSource:
         """Download (if needed) and extract content from PDF"""
         try:
-            content = ""
-            metadata = {}
-            
             if url_or_path.startswith("http"):
-                local_path = f"/tmp/nexus_{hash(url_or_path)}.pdf"
                 async with httpx.AsyncClient() as client:
                     response = await client.get(url_or_path, timeout=settings.TIMEOUT_PDF)
-                    with open(local_path, "wb") as f:
-                        f.write(response.content)
+                    pdf_bytes = response.content
             else:
-                local_path = url_or_path
-
-            doc = fitz.open(local_path)
-            metadata = {
-                "title": doc.metadata.get("title", "Unknown"),
-                "author": doc.metadata.get("author", "Unknown"),
-                "pages": len(doc)
-            }
-            
-            full_text = []
-            for page in doc:
-                full_text.append(page.get_text())
-            
-            content = "\n\n".join(full_text)
-            
-            source_id = f"pdf-{hash(url_or_path)}"
-            await self._index_content(source_id, content)
+                with open(url_or_path, "rb") as f:
+                    pdf_bytes = f.read()
+
+            key = hashlib.sha256(pdf_bytes).hexdigest()[:32]
+            source_id = self._source_id(key)
+            # Pin before loading/ingesting so the entry cannot be evicted under us
+            if session_id:
+                self.index_store.acquire(key, session_id)
+
+            entry = self.index_store.get(key)
+            if entry is not None and not self._matches_config(entry):
+                logger.info(f"Stored index for {url_or_path} was built with {entry.meta.get('index')}; rebuilding")
+                entry = None
+            if entry is not None:
+                logger.info(f"Reusing stored index for {url_or_path}")
+                meta = entry.meta
+                if self.global_index is not None and not self.global_index.contains(key):
+                    # Documents ingested before the library was enabled join it on first reuse
+                    await asyncio.to_thread(self._add_to_library, key, entry)
+            else:
+                # Concurrent sessions uploading the same document share one ingestion
+                meta = await self._inflight_ingests.do(key, lambda: self._ingest(key, pdf_bytes, url_or_path))
 
             return RawSource(
                 id=source_id,
                 source_type=SourceType.PDF,
                 url=url_or_path,
-                content=content[:5000],  # Store snippet in state
-                metadata=metadata,
+                content=meta["snippet"],  # Store snippet in state
+                metadata=meta["metadata"],
                 trust_score=0.90,  # PDFs are usually high trust
                 fetched_at=datetime.now(),
                 embedding_index_id=source_id
@@ -80,31 +127,252 @@ class PDFEngine:
                 fetched_at=datetime.now()
             )
 
-    async def _index_content(self, source_id: str, content: str):
-        """Chunk and index content using FAISS"""
-        chunks = self.text_splitter.split_text(content)
-        vectors = self.embedder.embed_documents(chunks)
-        
-        dim = self.embedder.get_dimension()
-        index = faiss.IndexFlatIP(dim)
-        index.add(np.array(vectors).astype('float32'))
-        
-        self.indices[source_id] = index
-        self.chunk_store[source_id] = chunks
+    def _index_config(self) -> Dict:
+        """What a stored index depends on besides the PDF bytes"""
+        return {
+            "model": getattr(self.embedder, "model_name", None),
+            "backend": getattr(self.embedder, "backend", None),
+            "truncate_dim": getattr(self.embedder, "truncate_dim", None),
+            "storage": settings.INDEX_VECTOR_STORAGE,
+            "chunk_size": self.CHUNK_SIZE,
+            "chunk_overlap": self.CHUNK_OVERLAP
+        }
+
+    def _matches_config(self, entry: IndexEntry) -> bool:
+        """False for indices built under another model, dimension or chunking; they are rebuilt"""
+        built = entry.meta.get("index") or {}
+        expected = self._index_config()
+        if any(built.get(name) != value for name, value in expected.items()):
+            return False
+        # The model (and so the dimension) is only known for sure once it has loaded
+        return not getattr(self.embedder, "is_loaded", False) or built.get("dim") == self.embedder.get_dimension()
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_PARSE_WORKERS,
+                mp_context=worker_context()
+            )
+        return self._parse_pool
+
+    async def _ingest(self, key: str, pdf_bytes: bytes, url: str) -> Dict:
+        """Extract text, then chunk, embed and persist the index"""
+        metadata = await asyncio.to_thread(read_document_info, pdf_bytes)
+        pages = await self._extract_text(pdf_bytes, metadata["pages"])
+
+        chunks = await asyncio.to_thread(chunk_pages, pages, self.CHUNK_SIZE, self.CHUNK_OVERLAP)
+        meta = {"metadata": metadata, "snippet": chunks.text[:self.SNIPPET_CHARS], "url": url}
+        await self._index_content(key, chunks, meta)
+        return meta
+
+    async def _extract_text(self, pdf_bytes: bytes, n_pages: int) -> List[str]:
+        """Small documents parse on a thread; large ones are split across the process pool"""
+        if n_pages < settings.PDF_PARALLEL_MIN_PAGES or settings.PDF_PARSE_WORKERS <= 1:
+            return await asyncio.to_thread(extract_pages, pdf_bytes, 0, n_pages)
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_parse_pool()
+        parts = await asyncio.gather(*[
+            loop.run_in_executor(pool, extract_pages, pdf_bytes, start, end)
+            for start, end in page_ranges(n_pages, settings.PDF_PARSE_WORKERS)
+        ])
+        return [page for part in parts for page in part]
+
+    async def _index_content(self, key: str, chunks: ChunkStore, meta: Dict):
+        """Embed chunks and index them using FAISS"""
+        vectors = await self.embeddings.aembed_documents(list(chunks))
+        await asyncio.to_thread(self._build_and_store, key, vectors, vectors.shape[1], chunks, meta)
+
+    def _build_and_store(self, key: str, vectors: np.ndarray, dim: int, chunks: ChunkStore, meta: Dict):
+        # Recorded after embedding: a failed primary model switches the embedder to its fallback
+        meta = {**meta, "index": {**self._index_config(), "dim": dim}}
+        index = new_ip_index(dim, settings.INDEX_VECTOR_STORAGE)
+        if len(vectors):
+            if not index.is_trained:
+                index.train(vectors)  # int8: per-dimension value ranges
+            index.add(vectors)
+        self.index_store.put(key, index, chunks, meta)
+        entry = self.index_store.get(key)
+        if entry is not None:
+            self._lexical_index(entry)
+        if self.global_index is not None:
+            self.global_index.add(key, vectors)
+
+    def _add_to_library(self, key: str, entry: IndexEntry):
+        if entry.index.ntotal:
+            self.global_index.add(key, entry.index.reconstruct_n(0, entry.index.ntotal))
 
     def query_index(self, source_id: str, query: str, k: int = 5) -> List[str]:
         """Perform similarity search on a specific indexed PDF"""
-        if source_id not in self.indices:
-            return []
-        
-        query_vec = self.embedder.embed_query(query)
-        index = self.indices[source_id]
-        
-        D, I = index.search(np.array([query_vec]).astype('float32'), k)
-        
+        return self.query_index_batch([source_id], [query], k)[0].get(source_id, [])
+
+    def query_index_batch(
+        self,
+        source_ids: List[str],
+        queries: List[str],
+        k: int = 5,
+        exclude: Optional[Sequence[Collection[str]]] = None
+    ) -> List[Dict[str, List[str]]]:
+        """
+        Searches several indexed PDFs with several queries at once.
+        Dense and BM25 candidates are merged with reciprocal-rank fusion (RETRIEVAL_MODE);
+        all queries are embedded in one encode call. `exclude[i]` lists source IDs to skip
+        for query i. Returns, per query, {source_id: [chunks]}; each chunk is a `Chunk`
+        carrying its page.
+        """
+        results: List[Dict[str, List[str]]] = [{} for _ in queries]
+        entries = {}
+        for source_id in dict.fromkeys(source_ids):
+            entry = self.index_store.get(self._store_key(source_id))
+            if entry is not None and len(entry.chunks) > 0:
+                entries[source_id] = entry
+        if not queries or not entries:
+            return results
+
+        mode = self._retrieval_mode()
+        depth = k * settings.RETRIEVAL_CANDIDATES if mode == "hybrid" else k
+        rankings: List[List[Dict[str, List[int]]]] = []
+        if mode != "lexical":
+            rankings.append(self._dense_candidates(queries, entries, depth, exclude))
+        if mode != "dense":
+            rankings.append(self._lexical_candidates(queries, entries, depth, exclude))
+
+        for row in range(len(queries)):
+            for source_id, entry in entries.items():
+                if exclude and source_id in exclude[row]:
+                    continue
+                lists = [ranking[row].get(source_id, []) for ranking in rankings]
+                ids = reciprocal_rank_fusion(lists, settings.RRF_K) if len(lists) > 1 else lists[0]
+                results[row][source_id] = [entry.chunks[idx] for idx in ids[:k]]
+
+        return results
+
+    def _retrieval_mode(self) -> str:
+        if settings.RETRIEVAL_MODE != "dense" and not getattr(self.embedder, "is_loaded", True):
+            # Serve lexical results now and load the model in the background for later queries
+            self.embeddings.warm_up()
+            return "lexical"
+        return settings.RETRIEVAL_MODE
+
+    def _lexical_candidates(
+        self,
+        queries: List[str],
+        entries: Dict[str, IndexEntry],
+        k: int,
+        exclude: Optional[Sequence[Collection[str]]]
+    ) -> List[Dict[str, List[int]]]:
+        candidates: List[Dict[str, List[int]]] = [{} for _ in queries]
+        for source_id, entry in entries.items():
+            lexical = self._lexical_index(entry)
+            for row, query in enumerate(queries):
+                if not exclude or source_id not in exclude[row]:
+                    candidates[row][source_id] = lexical.search(query, k)
+        return candidates
+
+    def _lexical_index(self, entry: IndexEntry) -> BM25Index:
+        if entry.lexical is None:
+            return self.index_store.attach_lexical(entry, BM25Index(entry.chunks))
+        return entry.lexical
+
+    def _dense_candidates(
+        self,
+        queries: List[str],
+        entries: Dict[str, IndexEntry],
+        k: int,
+        exclude: Optional[Sequence[Collection[str]]]
+    ) -> List[Dict[str, List[int]]]:
+        candidates: List[Dict[str, List[int]]] = [{} for _ in queries]
+        query_vecs = self.embeddings.embed_queries(queries)
+
+        dim = query_vecs.shape[1]
+        stale = [sid for sid, entry in entries.items() if entry.index.d != dim]
+        if stale:
+            # Built under another embedding model (rebuilt on their next process_source)
+            logger.warning(f"Indices {stale} do not match query dimension {dim}; skipping their dense search")
+            entries = {sid: entry for sid, entry in entries.items() if sid not in stale}
+
+        for source_id, entry in entries.items():
+            if entry.index.ntotal == 0:
+                continue
+            rows = [i for i in range(len(queries)) if not exclude or source_id not in exclude[i]]
+            if not rows:
+                continue
+            # Exact search within the document: a filtered ANN search over the library
+            # loses recall when the filter keeps only one document's chunks
+            D, I = entry.index.search(query_vecs[rows], min(k, entry.index.ntotal))
+            for row, ids in zip(rows, I):
+                candidates[row][source_id] = [idx for idx in ids.tolist() if 0 <= idx < len(entry.chunks)]
+        return candidates
+
+    def search_library(self, queries: List[str], k: int = 10, exclude: Optional[Collection[str]] = None) -> List[List[Dict]]:
+        """
+        Searches every document ever ingested (requires GLOBAL_INDEX_ENABLED).
+        Returns, per query, [{"source_id", "chunk", "page", "score"}] best first.
+        """
+        if self.global_index is None or not self.global_index.ready or not queries:
+            return [[] for _ in queries]
+
+        query_vecs = self.embeddings.embed_queries(queries)
+        if self.global_index.dim != query_vecs.shape[1]:
+            logger.warning(f"Library dimension {self.global_index.dim} does not match the embedder; skipping library search")
+            return [[] for _ in queries]
+        excluded_keys = [self._store_key(sid) for sid in exclude] if exclude else None
         results = []
-        for idx in I[0]:
-            if idx != -1 and idx < len(self.chunk_store[source_id]):
-                results.append(self.chunk_store[source_id][idx])
-        
+        for row_hits in self.global_index.search(query_vecs, k, exclude=excluded_keys):
+            row = []
+            for key, chunk_idx, score in row_hits:
+                entry = self.index_store.get(key)
+                if entry is not None and chunk_idx < len(entry.chunks):
+                    chunk = entry.chunks[chunk_idx]
+                    row.append({"source_id": self._source_id(key), "chunk": str(chunk), "page": chunk.page, "score": score})
+            results.append(row)
         return results
+
+    async def library_sources(self, queries: List[str], limit: int, session_id: Optional[str] = None) -> List[RawSource]:
+        """
+        The `limit` library documents that best match the queries, as PDF sources (pinned
+        for the session). Empty while the library is disabled, still building, or the
+        embedder is not loaded yet.
+        """
+        if self.global_index is None or not self.global_index.ready or limit <= 0 or self._retrieval_mode() == "lexical":
+            return []
+        hits = await asyncio.to_thread(self.search_library, queries, limit * 4)
+
+        best: Dict[str, float] = {}
+        for row in hits:
+            for hit in row:
+                best[hit["source_id"]] = max(best.get(hit["source_id"], hit["score"]), hit["score"])
+
+        sources = []
+        for source_id in sorted(best, key=best.get, reverse=True)[:limit]:
+            key = self._store_key(source_id)
+            if session_id:
+                self.index_store.acquire(key, session_id)
+            entry = self.index_store.get(key)
+            if entry is None:
+                continue
+            sources.append(RawSource(
+                id=source_id,
+                source_type=SourceType.PDF,
+                url=entry.meta.get("url") or f"library://{key}",
+                content=entry.meta.get("snippet", ""),
+                metadata={**entry.meta.get("metadata", {}), "library_score": best[source_id]},
+                trust_score=0.90,
+                fetched_at=datetime.now(),
+                embedding_index_id=source_id
+            ))
+        return sources
+
+    async def aquery_index_batch(
+        self,
+        source_ids: List[str],
+        queries: List[str],
+        k: int = 5,
+        exclude: Optional[Sequence[Collection[str]]] = None
+    ) -> List[Dict[str, List[str]]]:
+        """query_index_batch off the event loop; concurrent calls share embedding batches"""
+        return await asyncio.to_thread(functools.partial(self.query_index_batch, source_ids, queries, k, exclude))
+
+    def release_session(self, session_id: str):
+        """Unpin every index the session referenced so it becomes evictable"""
+        self.index_store.release_session(session_id)
@@ -0,0 +1,32 @@
+# Process-pool entry points for PDF text extraction.
+# Workers are started by forkserver/spawn (see worker_context) and import this module fresh,
+# so it is kept free of heavy imports; PyMuPDF is imported on first use.
+from typing import Any, Dict, List, Tuple
+
+def read_document_info(pdf_bytes: bytes) -> Dict[str, Any]:
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return {
+            "title": doc.metadata.get("title", "Unknown"),
+            "author": doc.metadata.get("author", "Unknown"),
+            "pages": len(doc)
+        }
+
+def extract_pages(pdf_bytes: bytes, start: int, end: int) -> List[str]:
+    """Text of pages [start, end), one string per page"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, min(end, len(doc)))]
+
+def page_ranges(n_pages: int, n_parts: int) -> List[Tuple[int, int]]:
+    """Split n_pages into at most n_parts contiguous, near-equal ranges"""
+    n_parts = max(1, min(n_parts, n_pages))
+    step, extra = divmod(n_pages, n_parts)
+    ranges, start = [], 0
+    for i in range(n_parts):
+        end = start + step + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
@@ -0,0 +1,67 @@
+import re
+import json
+import zlib
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from nexus_insight.infra.redis_pool import get_redis
+from nexus_insight.tools.media_worker import format_timestamp
+
+logger = logging.getLogger(__name__)
+
+_LINE = re.compile(r"^\[(\d+):(\d{2}):(\d{2})\] ?(.*)$")
+
+def parse_segments(transcript: str) -> List[Dict[str, Any]]:
+    """`[hh:mm:ss] text` lines -> [{"start": seconds, "text": ...}]"""
+    segments = []
+    for line in transcript.splitlines():
+        match = _LINE.match(line)
+        if match:
+            h, m, s, text = match.groups()
+            segments.append({"start": int(h) * 3600 + int(m) * 60 + int(s), "text": text})
+        elif segments:
+            segments[-1]["text"] += "\n" + line
+        elif line:
+            segments.append({"start": 0, "text": line})
+    return segments
+
+def format_segments(segments: List[Dict[str, Any]]) -> str:
+    return "\n".join(f"{format_timestamp(s['start'])} {s['text']}" for s in segments)
+
+class TranscriptCache:
+    """
+    Transcripts in Redis keyed by canonical media id (extractor:id), so every URL form of
+    a video shares one entry. Values are zlib-compressed JSON holding the metadata and
+    the timestamped segments. Redis being down only costs cache misses.
+    """
+
+    PREFIX = "transcript:v2:"
+
+    def __init__(self, ttl: int = 86400, client: Callable[[], Any] = get_redis):
+        self.ttl = ttl
+        self._client = client
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, media_id: str) -> Optional[Dict[str, Any]]:
+        """Returns {"url", "metadata", "segments"} or None"""
+        try:
+            raw = await self._client().get(self.PREFIX + media_id)
+        except Exception as e:
+            logger.debug(f"Transcript cache read failed for {media_id}: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(raw))
+
+    async def set(self, media_id: str, url: str, transcript: str, metadata: Dict[str, Any]):
+        payload = {"url": url, "metadata": metadata, "segments": parse_segments(transcript)}
+        raw = zlib.compress(json.dumps(payload, default=str).encode("utf-8"), 6)
+        try:
+            await self._client().set(self.PREFIX + media_id, raw, ex=self.ttl)
+        except Exception as e:
+            logger.debug(f"Transcript cache write failed for {media_id}: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,42 +1,90 @@
 import asyncio
 import logging
+import re
+import time
 import httpx
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from duckduckgo_search import DDGS
-from trafilatura import extract
+from duckduckgo_search.exceptions import RatelimitException
 from nexus_insight.cognition.state import RawSource, SourceType
 from nexus_insight.config import settings
 from nexus_insight.infra.resilience import exponential_backoff
+from nexus_insight.infra.concurrency import SingleFlight
+from nexus_insight.infra.fetch_scheduler import FetchScheduler
+from nexus_insight.infra.cache import TTLCache
+from nexus_insight.tools.domain_trust import DomainTrustMatcher
 
 logger = logging.getLogger(__name__)
 
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid", "ref_src")
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for deduplication: lowercase scheme and host,
+    no default port, fragment, trailing slash or tracking parameters.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ))
+    return urlunsplit((scheme, host, path, query, ""))
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query, used as a cache key."""
+    return re.sub(r"\s+", " ", query.strip().lower()).rstrip("?!. ")
+
 class WebSearchTool:
     """
     Web search tool using DuckDuckGo as primary and SearXNG as fallback.
     No paid APIs required.
     """
 
-    def __init__(self):
-        pass  # No shared session — each search creates its own
+    def __init__(self, scheduler: Optional[FetchScheduler] = None, trust: Optional[DomainTrustMatcher] = None):
+        # No shared HTTP session — each search creates its own.
+        # Fetches are coalesced per normalized URL across all concurrent sessions
+        # and admitted through a shared politeness scheduler.
+        self._inflight_fetches = SingleFlight()
+        self.trust = trust or DomainTrustMatcher.from_files(settings.TRUST_LIST_PATH, settings.BLOCK_LIST_PATH)
+        self.scheduler = scheduler or FetchScheduler(
+            max_in_flight=settings.FETCH_MAX_IN_FLIGHT,
+            per_domain=settings.FETCH_PER_DOMAIN_CONCURRENCY,
+            min_interval=settings.FETCH_DOMAIN_MIN_INTERVAL,
+            backoff_max=settings.FETCH_BACKOFF_MAX
+        )
+        # Search result pages keyed by (normalized query, backend, max_results)
+        self.result_cache = TTLCache(
+            max_size=settings.SEARCH_CACHE_SIZE,
+            ttl=settings.SEARCH_CACHE_TTL,
+            stale_ttl=settings.SEARCH_CACHE_STALE_TTL
+        )
+        self._inflight_searches = SingleFlight()
+        self._revalidations = set()
+        self._ddg_throttled_until = 0.0
 
-    @exponential_backoff(max_retries=2, base_delay=settings.DDG_RATE_LIMIT_DELAY * 2)
     async def search(self, query: str, max_results: int = 7) -> List[RawSource]:
-        results = []
-        try:
-            logger.info(f"Searching DuckDuckGo for: {query}")
-            # Fresh session per call avoids "Exception occurred in previous call"
-            with DDGS() as ddgs:
-                ddg_results = list(ddgs.text(query, max_results=max_results, backend="lite"))
-            for res in ddg_results:
-                results.append({
-                    "url": res["href"],
-                    "title": res["title"],
-                    "snippet": res["body"]
-                })
-        except Exception as e:
-            logger.warning(f"DuckDuckGo search failed for '{query}': {e}. Trying SearXNG...")
-            results = await self._searxng_fallback(query, max_results)
+        """Search and fetch the content of every hit."""
+        hits = await self.search_hits(query, max_results)
+        return await self.fetch_many(hits)
+
+    async def search_hits(self, query: str, max_results: int = 7) -> List[Dict]:
+        """Return search hits ({url, title, snippet}) without fetching page content."""
+        results = await self._cached_search("ddg", query, max_results)
+        if not results:
+            logger.warning(f"DuckDuckGo returned nothing for '{query}'. Trying SearXNG...")
+            results = list(await self._cached_search("searxng", query, max_results))
 
         if not results:
              logger.warning(f"No results found for query: {query}")
@@ -44,18 +92,101 @@ class WebSearchTool:
 
         if len(results) < 3:
             logger.info(f"Few results ({len(results)}) for '{query}'. Supplementing with SearXNG...")
-            searx_results = await self._searxng_fallback(query, max_results)
+            searx_results = await self._cached_search("searxng", query, max_results)
             # Deduplicate by URL
-            seen_urls = {res["url"] for res in results}
+            results = list(results)
+            seen_urls = {normalize_url(res["url"]) for res in results}
             for res in searx_results:
-                if res["url"] not in seen_urls:
+                key = normalize_url(res["url"])
+                if key not in seen_urls:
                     results.append(res)
-                    seen_urls.add(res["url"])
+                    seen_urls.add(key)
+
+        return results[:max_results]
+
+    async def _cached_search(self, backend: str, query: str, max_results: int) -> List[Dict]:
+        """
+        Cache-first search against one backend. Stale entries are served immediately
+        and refreshed in the background, so rate-limit sleeps stay off the request path.
+        """
+        key = (normalize_query(query), backend, max_results)
+        entry = self.result_cache.get_entry(key)
+        if entry is not None:
+            hits, is_stale = entry
+            if is_stale:
+                self._schedule_revalidation(key, backend, query, max_results)
+            return hits
+
+        try:
+            return await self._inflight_searches.do(key, lambda: self._search_backend(key, backend, query, max_results))
+        except Exception as e:
+            logger.warning(f"{backend} search failed for '{query}': {e}")
+            return []
 
-        # Fetch contents in parallel
-        sources = await asyncio.gather(*[self._fetch_content(res) for res in results[:max_results]])
+    async def _search_backend(self, key: Tuple, backend: str, query: str, max_results: int) -> List[Dict]:
+        if backend == "ddg":
+            hits = await self._ddg_search(query, max_results)
+        else:
+            hits = await self._searxng_fallback(query, max_results)
+        if hits:
+            self.result_cache.set(key, hits)
+        return hits
+
+    def _schedule_revalidation(self, key: Tuple, backend: str, query: str, max_results: int):
+        if key in self._inflight_searches:
+            return
+        task = asyncio.ensure_future(
+            self._inflight_searches.do(key, lambda: self._revalidate(key, backend, query, max_results))
+        )
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._revalidations.add(task)
+        task.add_done_callback(self._on_revalidated)
+
+    def _on_revalidated(self, task: asyncio.Task):
+        self._revalidations.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"Background search refresh failed: {task.exception()}")
+
+    @exponential_backoff(max_retries=2, base_delay=settings.DDG_RATE_LIMIT_DELAY * 2)
+    async def _revalidate(self, key: Tuple, backend: str, query: str, max_results: int) -> List[Dict]:
+        logger.debug(f"Refreshing stale {backend} results for '{query}'")
+        return await self._search_backend(key, backend, query, max_results)
+
+    async def _ddg_search(self, query: str, max_results: int) -> List[Dict]:
+        """Primary search via DuckDuckGo. Raises on failure; skips DDG while it is throttling us."""
+        if time.monotonic() < self._ddg_throttled_until:
+            raise RatelimitException("DuckDuckGo is rate limiting; cooling down")
+
+        logger.info(f"Searching DuckDuckGo for: {query}")
+        try:
+            ddg_results = await asyncio.to_thread(self._ddg_text, query, max_results)
+        except RatelimitException:
+            self._ddg_throttled_until = time.monotonic() + settings.DDG_THROTTLE_COOLDOWN
+            raise
+        return [{"url": res["href"], "title": res["title"], "snippet": res["body"]} for res in ddg_results]
+
+    @staticmethod
+    def _ddg_text(query: str, max_results: int) -> List[Dict]:
+        # Fresh session per call avoids "Exception occurred in previous call"
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results, backend="lite"))
+
+    async def fetch_many(self, hits: List[Dict]) -> List[RawSource]:
+        """Fetch each unique URL once, in parallel, preserving hit order."""
+        unique_hits = {}
+        for hit in hits:
+            unique_hits.setdefault(normalize_url(hit["url"]), hit)
+
+        hits = list(unique_hits.values())
+        scores = self.trust.score_many([hit["url"] for hit in hits])
+        sources = await asyncio.gather(*[self.fetch(hit, score) for hit, score in zip(hits, scores)])
         return [s for s in sources if s is not None]
 
+    async def fetch(self, search_res: Dict, trust_score: Optional[float] = None) -> Optional[RawSource]:
+        """Fetch a single hit, joining any in-flight fetch of the same URL."""
+        key = normalize_url(search_res["url"])
+        return await self._inflight_fetches.do(key, lambda: self._fetch_content(search_res, trust_score))
+
     async def _searxng_fallback(self, query: str, max_results: int) -> List[Dict]:
         """Secondary search via self-hosted SearXNG"""
         try:
@@ -70,49 +201,41 @@ class WebSearchTool:
             logger.error(f"SearXNG fallback failed: {e}")
         return []
 
-    async def _fetch_content(self, search_res: Dict) -> Optional[RawSource]:
+    async def _fetch_content(self, search_res: Dict, trust_score: Optional[float] = None) -> Optional[RawSource]:
         url = search_res["url"]
+        if trust_score is None:
+            trust_score = self._calculate_trust_score(url)
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(url, timeout=settings.TIMEOUT_WEB)
-                if response.status_code != 200:
-                    return None
-                
-                content = extract(response.text)
-                if not content or len(content) < 200:
-                    return None
-
-                return RawSource(
-                    id=f"web-{hash(url)}",
-                    source_type=SourceType.WEB,
-                    url=url,
-                    content=content,
-                    metadata={
-                        "title": search_res["title"],
-                        "snippet": search_res["snippet"]
-                    },
-                    trust_score=self._calculate_trust_score(url),
-                    fetched_at=datetime.now()
-                )
+            # Higher expected trust gets admitted first when the global limit is saturated
+            async with self.scheduler.slot(url, priority=trust_score, max_wait=settings.TIMEOUT_WEB):
+                async with httpx.AsyncClient(follow_redirects=True) as client:
+                    response = await client.get(url, timeout=settings.TIMEOUT_WEB)
+            self.scheduler.record_response(url, response.status_code, response.headers.get("Retry-After"))
+            if response.status_code != 200:
+                return None
+
+            from trafilatura import extract  # lxml-heavy; imported on first fetch
+
+            content = extract(response.text)
+            if not content or len(content) < 200:
+                return None
+
+            return RawSource(
+                id=f"web-{hash(normalize_url(url))}",
+                source_type=SourceType.WEB,
+                url=url,
+                content=content,
+                metadata={
+                    "title": search_res["title"],
+                    "snippet": search_res["snippet"]
+                },
+                trust_score=trust_score,
+                fetched_at=datetime.now()
+            )
         except Exception as e:
             logger.warning(f"Failed to fetch content from {url}: {e}")
             return None
 
     def _calculate_trust_score(self, url: str) -> float:
-        """Domain trust heuristics"""
-        trust_map = {
-            ".gov": 0.95, ".edu": 0.90, ".ac.uk": 0.90,
-            "arxiv.org": 0.90, "pubmed.ncbi": 0.95,
-            "wikipedia.org": 0.75, "github.com": 0.70,
-            "bbc.com": 0.80, "reuters.com": 0.80
-        }
-        score = 0.50
-        for domain, s in trust_map.items():
-            if domain in url:
-                score = max(score, s)
-        
-        # Blacklist check
-        if any(bad in url for bad in ["ads.", "tracker.", "sponsored"]):
-            score = 0.10
-            
-        return score
+        """Domain trust heuristics (most specific suffix match, see DomainTrustMatcher)"""
+        return self.trust.score(url)
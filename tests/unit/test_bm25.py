@@ -0,0 +1,27 @@
+from nexus_insight.tools.bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+
+CHUNKS = [
+    "Revenue grew in 2021 as demand recovered.",
+    "Revenue grew 12.5% in 2023, driven by lithium sales.",
+    "The company was founded in 2003 in Oslo.",
+    "Lithium lithium lithium prices and lithium supply.",
+]
+
+def test_tokenize_keeps_numbers_and_dates_whole():
+    assert tokenize("Up 12.5% on 2023-01-05, COVID-19") == ["up", "12.5", "on", "2023-01-05", "covid-19"]
+
+def test_exact_figures_rank_first():
+    index = BM25Index(CHUNKS)
+    assert index.search("revenue growth in 2023", k=2) == [1, 0]
+    assert index.search("12.5", k=5) == [1]
+    assert index.search("unrelated words", k=5) == []
+
+def test_term_frequency_and_rarity_both_count():
+    index = BM25Index(CHUNKS)
+    assert index.search("lithium", k=2) == [3, 1]
+    # "2003" is rarer than "revenue", so the single-term match wins over chunk 0
+    assert index.search("revenue 2003", k=1) == [2]
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    assert reciprocal_rank_fusion([[1, 2, 3], [2, 9, 1]])[:2] == [2, 1]
+    assert reciprocal_rank_fusion([[4, 5]]) == [4, 5]
@@ -0,0 +1,37 @@
+import faiss
+import numpy as np
+from nexus_insight.tools.chunk_store import ChunkStore, chunk_pages
+from nexus_insight.tools.index_store import IndexStore
+
+def test_chunks_are_bounded_whole_words_and_overlap():
+    words = [f"word{i}" for i in range(600)]
+    store = chunk_pages([" ".join(words[:300]), " ".join(words[300:])], chunk_size=200, chunk_overlap=40)
+
+    assert len(store) > 1
+    vocabulary = set(words)
+    for chunk in store:
+        assert 0 < len(chunk) <= 200
+        assert all(token in vocabulary for token in chunk.split())
+
+    # Consecutive chunks share text through the buffer, not through copies
+    starts, ends = store.spans[:, 0], store.spans[:, 1]
+    assert (starts[1:] < ends[:-1]).all()
+    assert store.nbytes < sum(len(c) for c in store) + store.spans.nbytes
+
+def test_chunks_carry_pages_and_round_trip(tmp_path):
+    store = chunk_pages(["alpha " * 50, "beta " * 50], chunk_size=120, chunk_overlap=0)
+    assert store[0].page == 1 and store[-1].page == 2
+    assert all(chunk.page == (1 if chunk.startswith("alpha") else 2) for chunk in store)
+
+    index = faiss.IndexFlatIP(4)
+    index.add(np.random.rand(len(store), 4).astype("float32"))
+    IndexStore(str(tmp_path)).put("doc", index, store, {})
+    loaded = IndexStore(str(tmp_path)).get("doc").chunks
+    assert loaded == store
+    assert [c.page for c in loaded] == [c.page for c in store]
+
+def test_from_chunks_keeps_list_semantics():
+    store = ChunkStore.from_chunks(["one", "two", "three"])
+    assert store == ["one", "two", "three"]
+    assert store[1:] == ["two", "three"]
+    assert store[0].page is None
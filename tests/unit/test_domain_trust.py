@@ -0,0 +1,41 @@
+import gzip
+from nexus_insight.tools.domain_trust import DomainTrustMatcher, BLOCKED_SCORE, DEFAULT_SCORE
+
+def test_suffix_matching_is_label_aligned():
+    matcher = DomainTrustMatcher()
+    assert matcher.score("https://www.nasa.gov/news") == 0.95
+    assert matcher.score("https://en.wikipedia.org/wiki/Graph") == 0.75
+    assert matcher.score("https://notwikipedia.org/page") == DEFAULT_SCORE
+    assert matcher.score("https://example.com/gov/report") == DEFAULT_SCORE
+
+def test_country_code_government_and_academic_domains():
+    matcher = DomainTrustMatcher()
+    assert matcher.score("https://www.health.gov.au/topics") == 0.95
+    assert matcher.score("https://canada.gc.ca/en") == 0.95
+    assert matcher.score("https://www.unimelb.edu.au/") == 0.90
+    assert matcher.score("https://www.u-tokyo.ac.jp/") == 0.90
+    assert matcher.score("https://www.ox.ac.uk/") == 0.90
+    # Only a second-level label under a country code counts
+    assert matcher.score("https://gov.example.com/") == DEFAULT_SCORE
+    assert matcher.score("https://ads.health.gov.au/x") == BLOCKED_SCORE
+
+def test_blocklist_rules():
+    matcher = DomainTrustMatcher()
+    assert matcher.score("https://ads.example.com/x") == BLOCKED_SCORE
+    assert matcher.score("https://downloads.example.com/x") == DEFAULT_SCORE
+    assert matcher.score("https://example.com/sponsored/post") == BLOCKED_SCORE
+    assert matcher.score("https://example.com/unsponsored-review") == DEFAULT_SCORE
+
+def test_load_from_files(tmp_path):
+    trust = tmp_path / "trust.tsv.gz"
+    with gzip.open(trust, "wt") as f:
+        f.write("# domain\tscore\nnature.com\t0.92\nbbc.com 0.85\n")
+    block = tmp_path / "block.txt"
+    block.write_text("spam.nature.com\n")
+
+    matcher = DomainTrustMatcher.from_files(str(trust), str(block))
+    assert matcher.score_many([
+        "https://www.nature.com/articles/1",
+        "https://spam.nature.com/x",
+        "https://bbc.com/news",
+    ]) == [0.92, BLOCKED_SCORE, 0.85]
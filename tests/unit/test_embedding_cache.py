@@ -0,0 +1,86 @@
+import multiprocessing
+import numpy as np
+from nexus_insight.cognition.embedding_cache import EmbeddingCache, content_key
+from nexus_insight.cognition.embeddings import LocalEmbedder
+from nexus_insight.config import settings
+
+def _vectors(n, dim=8, seed=0):
+    v = np.random.default_rng(seed).random((n, dim)).astype("float32")
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def test_round_trip_and_sharing_between_instances(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "org/model")
+    keys = [content_key(t) for t in ("a", "b", "c")]
+    vectors = _vectors(3)
+    cache.put_many(keys, vectors)
+    cache.put_many(keys[:1], vectors[:1])  # already cached: not appended again
+
+    other = EmbeddingCache(str(tmp_path), "org/model")
+    found = other.get_many([keys[2], content_key("missing"), keys[0]])
+    assert found[1] is None
+    np.testing.assert_allclose(found[0], vectors[2], atol=1e-3)
+    np.testing.assert_allclose(found[2], vectors[0], atol=1e-3)
+    assert other.get_stats()["entries"] == 3
+
+def test_recovers_from_a_writer_that_died_mid_append(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "m")
+    keys = [content_key(t) for t in ("a", "b", "c")]
+    vectors = _vectors(3)
+    cache.put_many(keys[:1], vectors[:1])
+
+    # A crashed writer left one extra vector row and half of its key
+    root = cache.root
+    with open(root / "vectors.f16", "ab") as f:
+        _vectors(1, seed=9).astype(np.float16).tofile(f)
+    with open(root / "keys.bin", "ab") as f:
+        f.write(content_key("lost")[:7])
+
+    cache.put_many(keys[1:], vectors[1:])
+
+    reopened = EmbeddingCache(str(tmp_path), "m")
+    found = reopened.get_many(keys)
+    for got, want in zip(found, vectors):
+        np.testing.assert_allclose(got, want, atol=1e-3)
+    assert reopened.get_stats()["entries"] == 3
+
+def _append(root, start):
+    cache = EmbeddingCache(root, "m")
+    keys = [content_key(f"text-{i}") for i in range(start, start + 200)]
+    for i in range(0, 200, 20):
+        cache.put_many(keys[i:i + 20], _vectors(20, seed=start + i))
+
+def test_concurrent_processes_append_whole_rows(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_append, args=(str(tmp_path), start)) for start in (0, 1000, 2000)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    cache = EmbeddingCache(str(tmp_path), "m")
+    found = cache.get_many([content_key(f"text-{i}") for start in (0, 1000, 2000) for i in range(start, start + 200)])
+    assert all(v is not None for v in found)
+    np.testing.assert_allclose(found[0], _vectors(20, seed=0)[0], atol=1e-3)
+
+class CountingModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.stack([_vectors(1, seed=len(t))[0] for t in texts])
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+def test_embed_documents_encodes_only_misses(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_DIR", str(tmp_path))
+    embedder = LocalEmbedder()
+    embedder._model = CountingModel()
+
+    first = embedder.embed_documents(["alpha", "beta", "alpha"])
+    second = embedder.embed_documents(["beta", "gamma!", "alpha"])
+
+    assert embedder._model.encoded == ["alpha", "beta", "gamma!"]
+    assert second[0] == first[1] and second[2] == first[0]
+    assert isinstance(second[0][0], float)
@@ -0,0 +1,35 @@
+import numpy as np
+from nexus_insight.cognition import embeddings
+from nexus_insight.evaluation.embedding_parity import cosine_parity, neighbour_agreement
+
+def test_parity_metrics_tolerate_quantization_noise():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(size=(50, 32)).astype("float32")
+    quantized = np.round(reference * 16) / 16  # int8-like rounding
+
+    parity = cosine_parity(reference, quantized)
+    assert parity["min"] > 0.99
+    assert neighbour_agreement(reference, quantized) > 0.9
+    assert cosine_parity(reference, rng.normal(size=(50, 32)))["mean"] < 0.5
+
+def test_onnx_backend_falls_back_to_torch_and_reports_it(monkeypatch):
+    class TorchModel:
+        device = "cpu"
+
+        def __init__(self, name):
+            self.name = name
+
+        def get_sentence_embedding_dimension(self):
+            return 4
+
+    def load(model_name, backend, *args):
+        if backend == "onnx-int8":
+            raise ImportError("optimum is not installed")
+        return TorchModel(model_name)
+
+    monkeypatch.setattr(embeddings, "load_sentence_transformer", load)
+    embedder = embeddings.LocalEmbedder(backend="onnx-int8", use_cache=False)
+
+    info = embedder.get_model_info()
+    assert info["backend"] == "torch"
+    assert info["dimension"] == 4
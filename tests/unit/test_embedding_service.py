@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+import numpy as np
+import pytest
+from nexus_insight.cognition.embedding_service import EmbeddingService
+
+class SlowEmbedder:
+    """Per-call overhead dominates, like a CPU transformer at small batch sizes."""
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def _encode(self, texts):
+        self.calls.append(len(texts))
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.02)
+        return np.array([[len(t), 1.0] for t in texts], dtype="float32")
+
+    def embed_queries(self, texts):
+        return self._encode(texts)
+
+    def encode_documents(self, texts):
+        if "boom" in texts:
+            raise RuntimeError("encode failed")
+        return self._encode(texts)
+
+    def get_dimension(self):
+        return 2
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_share_batches_and_get_their_own_rows():
+    embedder = SlowEmbedder()
+    service = EmbeddingService(embedder, max_batch=64, max_wait_ms=20)
+    texts = ["x" * n for n in range(1, 41)]
+
+    vectors = await asyncio.gather(*[service.aembed_query(t) for t in texts])
+
+    assert [v[0] for v in vectors] == [len(t) for t in texts]
+    assert len(embedder.calls) < 5 and sum(embedder.calls) == 40
+    assert embedder.threads == {"nexus-embed"}
+    stats = service.get_stats()
+    assert stats["queue_depth"] == 0
+    assert sum(stats["batch_size_histogram"].values()) == stats["batches"]
+    service.close()
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_size_and_isolates_kinds():
+    embedder = SlowEmbedder()
+    service = EmbeddingService(embedder, max_batch=8, max_wait_ms=50)
+
+    docs, queries = await asyncio.gather(
+        service.aembed_documents(["aa", "bbb"]),
+        asyncio.gather(*[service.aembed_queries(["q"] * 4) for _ in range(4)])
+    )
+
+    assert docs[:, 0].tolist() == [2, 3]
+    assert all(q.shape == (4, 2) for q in queries)
+    assert max(embedder.calls) <= 12  # at most one request overshoots the cap
+    service.close()
+
+@pytest.mark.asyncio
+async def test_failures_reach_only_the_failed_kind():
+    service = EmbeddingService(SlowEmbedder(), max_wait_ms=20)
+    bad, good = await asyncio.gather(
+        service.aembed_documents(["boom"]),
+        service.aembed_queries(["fine"]),
+        return_exceptions=True
+    )
+    assert isinstance(bad, RuntimeError)
+    assert good.shape == (1, 2)
+    service.close()
@@ -0,0 +1,47 @@
+from datetime import datetime
+from nexus_insight.cognition.fingerprint import NearDuplicateDetector, simhash, hamming
+from nexus_insight.cognition.state import RawSource, SourceType
+
+ARTICLE = " ".join(
+    f"Researchers at the institute reported on day {i} that the new battery chemistry retained most of its capacity."
+    for i in range(20)
+)
+
+def _source(id, url, content, trust):
+    return RawSource(
+        id=id,
+        source_type=SourceType.WEB,
+        url=url,
+        content=content,
+        metadata={},
+        trust_score=trust,
+        fetched_at=datetime.now()
+    )
+
+def test_simhash_is_stable_for_near_duplicates():
+    mirror = ARTICLE.replace("day 7", "day seven") + " Share this article."
+    unrelated = " ".join(f"The football club signed a striker for season {i} after a long pursuit." for i in range(20))
+    assert hamming(simhash(ARTICLE), simhash(mirror)) <= 6
+    assert hamming(simhash(ARTICLE), simhash(unrelated)) > 6
+
+def test_deduplicate_keeps_highest_trust_and_records_merged_urls():
+    sources = [
+        _source("a", "https://mirror.example/a", ARTICLE + " Subscribe now.", 0.5),
+        _source("b", "https://news.gov/a", ARTICLE, 0.95),
+        _source("c", "https://other.org/c", " ".join(f"Unrelated sentence number {i} about gardening tools." for i in range(30)), 0.5),
+    ]
+    kept = NearDuplicateDetector(threshold=0.90).deduplicate(sources)
+
+    assert [s.id for s in kept] == ["b", "c"]
+    assert kept[0].metadata["merged_urls"] == ["https://mirror.example/a"]
+
+def test_deduplicate_leaves_shared_sources_untouched():
+    keeper = _source("b", "https://news.gov/a", ARTICLE, 0.95)
+    detector = NearDuplicateDetector(threshold=0.90)
+
+    first = detector.deduplicate([keeper, _source("a", "https://mirror.example/a", ARTICLE + " Subscribe now.", 0.5)])
+    second = detector.deduplicate([keeper, _source("m", "https://mirror.example/m", ARTICLE + " Read more.", 0.5)])
+
+    assert keeper.metadata == {}
+    assert first[0].metadata["merged_urls"] == ["https://mirror.example/a"]
+    assert second[0].metadata["merged_urls"] == ["https://mirror.example/m"]
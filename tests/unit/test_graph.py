@@ -0,0 +1,238 @@
+import re
+import json
+import asyncio
+import numpy as np
+import networkx as nx
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from nexus_insight.cognition.graph import GraphExtractor
+from nexus_insight.cognition.global_graph import GlobalKnowledgeGraph
+from nexus_insight.cognition.state import RawSource, SourceType
+from nexus_insight.config import settings
+
+class FakeLLM:
+    """Returns the edges listed in each numbered text as 'A>B' pairs; records prompts."""
+
+    def __init__(self):
+        self.prompts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        body = prompt.split("Texts:\n", 1)[1].split("\n\nRespond", 1)[0]
+        rels = []
+        for i, text in enumerate(re.split(r"(?:^|\n\n)\[\d+\] ", body)[1:]):
+            rels.extend({"text": i, "source_entity": a, "target_entity": b, "relationship": "r", "context": ""}
+                        for a, b in (pair.split(">") for pair in text.split()))
+        return SimpleNamespace(content=json.dumps(rels), response_metadata={"token_usage": {"total_tokens": 5}})
+
+class FakeRouter:
+    def __init__(self):
+        self.llm = FakeLLM()
+
+    async def get_llm(self, kind):
+        return self.llm
+
+def _source(i, text, trust=0.5):
+    return RawSource(
+        id=f"s{i}", source_type=SourceType.WEB, url=f"http://x/{i}", content=text,
+        metadata={}, trust_score=trust, fetched_at=datetime.now()
+    )
+
+def _random_edges(n, m, seed):
+    rng = np.random.default_rng(seed)
+    return [(f"E{a}", f"E{b}") for a, b in rng.integers(0, n, size=(m, 2)) if a != b]
+
+@pytest.mark.asyncio
+async def test_sessions_get_isolated_graphs():
+    extractor = GraphExtractor(FakeRouter())
+
+    a = await extractor.extract_and_build([_source(0, "alpha>beta")], "q", session_id="s1")
+    b = await extractor.extract_and_build([_source(0, "gamma>delta")], "q", session_id="s2")
+    a2 = await extractor.extract_and_build([_source(0, "beta>gamma")], "q", session_id="s1")
+
+    assert {n["id"] for n in a["data"]["nodes"]} == {"ALPHA", "BETA"}
+    assert {n["id"] for n in b["data"]["nodes"]} == {"GAMMA", "DELTA"}
+    assert {n["id"] for n in a2["data"]["nodes"]} == {"ALPHA", "BETA", "GAMMA"}
+
+    extractor.release_session("s1")
+    assert extractor.session_graph("s1").number_of_nodes() == 0
+
+@pytest.mark.asyncio
+async def test_session_graph_is_capped():
+    extractor = GraphExtractor(FakeRouter())
+    extractor.max_edges = 3
+
+    res = await extractor.extract_and_build([_source(0, "a>b b>c c>d d>e e>f")], "q", session_id="s1")
+
+    assert len(res["data"]["edges"]) == 3
+
+@pytest.mark.asyncio
+async def test_short_sources_share_prompts_and_run_concurrently(monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_BATCH_CHARS", 20)
+    monkeypatch.setattr(settings, "GRAPH_EXTRACTION_CONCURRENCY", 2)
+    router = FakeRouter()
+    extractor = GraphExtractor(router)
+    sources = [_source(i, f"a{i}>b{i}") for i in range(12)]
+
+    res = await extractor.extract_and_build(sources, "q", session_id="s1")
+
+    # Twelve 5-7 char sources packed into 20-char prompts
+    assert len(router.llm.prompts) == 4
+    assert router.llm.peak == 2
+    assert len(res["data"]["edges"]) == 12
+    assert res["tokens"] == 20
+
+@pytest.mark.asyncio
+async def test_most_trusted_sources_are_extracted_first(monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_MAX_SOURCES", 2)
+    extractor = GraphExtractor(FakeRouter())
+    extractor.max_edges = 1
+    sources = [_source(0, "low>x", 0.2), _source(1, "", 0.9), _source(2, "high>y", 0.8), _source(3, "mid>z", 0.5)]
+
+    res = await extractor.extract_and_build(sources, "q", session_id="s1")
+
+    assert [(e["from"], e["to"]) for e in res["data"]["edges"]] == [("HIGH", "Y")]
+    assert "low>x" not in extractor.llm_router.llm.prompts[0]
+
+@pytest.mark.asyncio
+async def test_triples_are_cached_by_content():
+    router = FakeRouter()
+    extractor = GraphExtractor(router)
+
+    await extractor.extract_and_build([_source(0, "a>b"), _source(1, "c>d")], "q", session_id="s1")
+    res = await extractor.extract_and_build([_source(5, "c>d"), _source(6, "a>b"), _source(7, "e>f")], "q", session_id="s2")
+
+    assert len(router.llm.prompts) == 2
+    assert "a>b" not in router.llm.prompts[1] and "e>f" in router.llm.prompts[1]
+    assert {n["id"] for n in res["data"]["nodes"]} == {"A", "B", "C", "D", "E", "F"}
+
+@pytest.mark.asyncio
+async def test_deltas_stream_per_source_in_trust_order(monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_BATCH_CHARS", 1)
+    extractor = GraphExtractor(FakeRouter())
+    deltas = []
+    sources = [_source(0, "c>d", 0.4), _source(1, "a>b", 0.9)]
+
+    res = await extractor.extract_and_build(sources, "q", session_id="s1", on_delta=deltas.append)
+
+    assert len(deltas) == 2
+    assert {n["id"] for n in deltas[0]["nodes"]["upsert"]} == {"A", "B"}
+    assert {n["id"] for n in deltas[1]["nodes"]["upsert"]} >= {"C", "D"}
+    assert {e["id"] for d in deltas for e in d["edges"]["upsert"]} == {"A->B", "C->D"}
+    assert {n["id"] for n in res["data"]["nodes"]} == {"A", "B", "C", "D"}
+
+class ScriptedLLM:
+    def __init__(self, content):
+        self.content = content
+
+    async def ainvoke(self, prompt):
+        return SimpleNamespace(content=self.content, response_metadata={"token_usage": {"total_tokens": 7}})
+
+@pytest.mark.asyncio
+async def test_batch_relations_need_a_valid_text_number():
+    extractor = GraphExtractor(FakeRouter())
+    batch = [(b"k0", "first"), (b"k1", "second")]
+    rels = [
+        {"text": "1", "source_entity": "a", "target_entity": "b"},
+        {"source_entity": "c", "target_entity": "d"},
+        {"text": "two", "source_entity": "e", "target_entity": "f"},
+        {"text": None, "source_entity": "g", "target_entity": "h"},
+        {"text": 5, "source_entity": "i", "target_entity": "j"},
+    ]
+
+    tokens = await extractor._extract_batch(ScriptedLLM(json.dumps(rels)), batch, "q")
+
+    assert tokens == 7
+    assert extractor._triples.get(b"k0") == []
+    assert [r["source_entity"] for r in extractor._triples.get(b"k1")] == ["a"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", ["not json", json.dumps({"text": 0, "source_entity": "a"})])
+async def test_unusable_batch_output_counts_tokens_and_is_not_cached(content):
+    extractor = GraphExtractor(FakeRouter())
+
+    tokens = await extractor._extract_batch(ScriptedLLM(content), [(b"k0", "first")], "q")
+
+    assert tokens == 7
+    assert extractor._triples.get(b"k0") is None
+
+def test_view_is_pruned_to_central_nodes_with_stable_positions(monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_VIEW_MAX_NODES", 5)
+    extractor = GraphExtractor(FakeRouter())
+    graph = extractor.session_graph("s1")
+    extractor._add_triples(graph, [{"source_entity": f"leaf{i}", "target_entity": "hub"} for i in range(8)])
+
+    first = extractor.graph_delta(graph)
+    shown = {n["id"]: (n["x"], n["y"]) for n in first["nodes"]["upsert"]}
+    assert len(shown) == 5 and "HUB" in shown
+    assert all(e["to"] == "HUB" and e["from"] in shown for e in first["edges"]["upsert"])
+
+    # A new, more central node pushes a leaf out; placed nodes keep their coordinates
+    extractor._add_triples(graph, [{"source_entity": "hub", "target_entity": "root"}])
+    second = extractor.graph_delta(graph)
+    assert "ROOT" in {n["id"] for n in second["nodes"]["upsert"]}
+    assert len(second["nodes"]["remove"]) == 1
+    assert len(second["edges"]["remove"]) == 1
+    current = {n["id"]: (n["x"], n["y"]) for n in extractor.export_graph_data(graph)["nodes"]}
+    assert all(current[n] == xy for n, xy in shown.items() if n in current)
+
+    assert extractor.graph_delta(graph) == {
+        "nodes": {"upsert": [], "remove": []}, "edges": {"upsert": [], "remove": []}
+    }
+
+def test_global_pagerank_matches_networkx(tmp_path):
+    graph = GlobalKnowledgeGraph(str(tmp_path))
+    edges = _random_edges(200, 1500, seed=1)
+    graph.add_edges(edges)
+    graph.refresh()
+
+    reference = nx.pagerank(nx.MultiDiGraph(edges), tol=1e-10)
+    ours = graph.scores(reference)
+
+    assert max(abs(ours[n] - reference[n]) for n in reference) < 1e-4
+    assert graph.top(1)[0][0] == max(reference, key=reference.get)
+
+def test_incremental_refresh_warm_starts(tmp_path):
+    graph = GlobalKnowledgeGraph(str(tmp_path))
+    graph.add_edges(_random_edges(300, 3000, seed=2))
+    graph.refresh()
+    cold = graph.get_stats()["last_sweeps"]
+
+    graph.add_edges(_random_edges(300, 20, seed=3) + [("E1", "NEW")])
+    graph.refresh()
+
+    assert graph.get_stats()["last_sweeps"] < cold
+    assert "NEW" in graph.scores(["NEW"])
+
+def test_global_graph_persists_and_shares_ids(tmp_path):
+    first = GlobalKnowledgeGraph(str(tmp_path))
+    second = GlobalKnowledgeGraph(str(tmp_path))
+    first.add_edges([("A", "B"), ("B", "C")])
+    second.add_edges([("C", "A"), ("D", "A")])
+    first.refresh()
+
+    reopened = GlobalKnowledgeGraph(str(tmp_path))
+
+    assert reopened.get_stats()["entities"] == 4
+    assert reopened.get_stats()["edges"] == 4
+    assert reopened.scores(["A", "B", "C", "D"]) == pytest.approx(first.scores(["A", "B", "C", "D"]))
+
+def test_entity_names_with_line_breaks_keep_their_ids(tmp_path):
+    graph = GlobalKnowledgeGraph(str(tmp_path))
+    graph.add_edges([("LITHIUM\nPRICES", "EV DEMAND"), ("EV DEMAND", "BATTERY\r\x0bCOST"), ("A", "B")])
+
+    reopened = GlobalKnowledgeGraph(str(tmp_path))
+
+    assert reopened.get_stats()["entities"] == 5
+    assert reopened._ids == graph._ids
+    reopened.refresh()
+    assert set(reopened.scores(["LITHIUM\nPRICES", "EV DEMAND", "BATTERY COST", "A", "B"])) == {
+        "LITHIUM\nPRICES", "EV DEMAND", "BATTERY COST", "A", "B"
+    }
@@ -0,0 +1,48 @@
+import faiss
+import numpy as np
+from nexus_insight.tools.bm25 import BM25Index
+from nexus_insight.tools.index_store import IndexStore
+
+def _index(n, dim=8):
+    index = faiss.IndexFlatIP(dim)
+    index.add(np.random.rand(n, dim).astype("float32"))
+    return index
+
+def test_index_round_trips_through_disk(tmp_path):
+    store = IndexStore(str(tmp_path))
+    chunks = ["first chunk", "second chunk ünïcode", "third"]
+    store.put("abc", _index(3), chunks, {"snippet": "first", "metadata": {"pages": 1}})
+
+    reopened = IndexStore(str(tmp_path))
+    entry = reopened.get("abc")
+    assert entry.chunks == chunks
+    assert entry.meta["metadata"]["pages"] == 1
+    assert entry.index.ntotal == 3
+    assert reopened.get("missing") is None
+
+def test_lru_respects_byte_budget_and_session_pins(tmp_path):
+    store = IndexStore(str(tmp_path), max_bytes=1)
+    store.acquire("a", "session-1")
+    store.put("a", _index(4), ["x"] * 4, {})
+    store.put("b", _index(4), ["y"] * 4, {})
+
+    # "a" is pinned, so only "b" could be evicted
+    assert store.get_stats()["hot_entries"] == 1
+    store.release_session("session-1")
+    assert store.get_stats()["hot_entries"] == 0
+    assert store.get("a") is not None  # reloaded from disk
+
+def test_lexical_index_counts_towards_the_byte_budget(tmp_path):
+    chunks = [f"chunk {i} about lithium prices" for i in range(4)]
+    store = IndexStore(str(tmp_path))
+    store.put("a", _index(4), chunks, {})
+    entry = store.get("a")
+    before = store.get_stats()["hot_bytes"]
+
+    lexical = store.attach_lexical(entry, BM25Index(entry.chunks))
+
+    assert store.get_stats()["hot_bytes"] == before + lexical.nbytes
+    assert store.attach_lexical(entry, BM25Index(entry.chunks)) is lexical  # Built once
+    store.max_bytes = before
+    store.put("b", _index(1), ["z"], {})
+    assert store.get_stats()["hot_entries"] == 1  # "a" no longer fits alongside "b"
@@ -0,0 +1,134 @@
+import os
+import time
+import uuid
+import asyncio
+import pytest
+from nexus_insight.tools.media_jobs import MediaJobQueue, MediaQueueFullError
+from nexus_insight.tools.media_worker import JobCancelled, check_cancelled, emit_lines
+
+def fake_job(url, temp_dir, model_size, cancel_path, progress_path):
+    """CPU-bound stand-in for download + transcription that honours cancellation."""
+    deadline = time.time() + (1.0 if "slow" in url else 0.2)
+    while time.time() < deadline:
+        check_cancelled(cancel_path)
+    return f"{url} {uuid.uuid4().hex}", {"pid": os.getpid()}
+
+def streaming_job(url, temp_dir, model_size, cancel_path, progress_path):
+    lines = [f"[00:00:{i:02d}] line {i}" for i in range(6)]
+    for i, line in enumerate(lines[:4]):
+        emit_lines(progress_path, [line])
+        time.sleep(0.15)
+    # The last lines only show up in the returned transcript
+    return "\n".join(lines), {"title": url}
+
+@pytest.fixture
+def queue(tmp_path):
+    q = MediaJobQueue(workers=1, queue_size=1, model_size="tiny", temp_dir=str(tmp_path), job=fake_job)
+    yield q
+    q.close()
+
+@pytest.mark.asyncio
+async def test_duplicate_urls_share_one_job(queue):
+    a, b = await asyncio.gather(
+        queue.transcribe("https://v/1", "s1"),
+        queue.transcribe("https://v/1", "s2")
+    )
+
+    assert a == b
+    assert queue.get_stats()["submitted"] == 1
+    assert queue.get_stats()["deduplicated"] == 1
+    assert queue.get_stats()["active"] == 0
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_new_urls(queue):
+    jobs = [asyncio.create_task(queue.transcribe(f"https://v/slow-{i}")) for i in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(MediaQueueFullError):
+        await queue.transcribe("https://v/slow-2")
+    # A URL already in flight is still accepted
+    joined = asyncio.create_task(queue.transcribe("https://v/slow-0"))
+
+    results = await asyncio.gather(*jobs, joined)
+    assert results[0] == results[2]
+    assert queue.get_stats()["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_release_session_cancels_running_job(queue, tmp_path):
+    job = asyncio.create_task(queue.transcribe("https://v/slow", "s1"))
+    await asyncio.sleep(0.3)
+
+    start = time.perf_counter()
+    queue.release_session("s1")
+    with pytest.raises(JobCancelled):
+        await job
+
+    assert time.perf_counter() - start < 0.5
+    assert queue.get_stats()["cancelled"] == 1
+    assert not list(tmp_path.glob("*.cancel"))
+
+@pytest.mark.asyncio
+async def test_job_survives_while_another_session_waits(queue):
+    first = asyncio.create_task(queue.transcribe("https://v/1", "s1"))
+    second = asyncio.create_task(queue.transcribe("https://v/1", "s2"))
+    await asyncio.sleep(0.05)
+
+    queue.release_session("s1")
+    first.cancel()
+
+    transcript, _ = await second
+    assert transcript.startswith("https://v/1")
+    assert queue.get_stats()["cancelled"] == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_drops_queued_job(queue):
+    running = asyncio.create_task(queue.transcribe("https://v/slow-0"))
+    queued = asyncio.create_task(queue.transcribe("https://v/slow-1"))
+    await asyncio.sleep(0.05)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    await running
+    # The worker may already hold the job; it then stops before doing any work
+    for _ in range(100):
+        if not queue.get_stats()["active"]:
+            break
+        await asyncio.sleep(0.01)
+
+    assert queue.get_stats()["cancelled"] == 1
+    assert queue.get_stats()["active"] == 0
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_during_transcription(queue):
+    job = asyncio.create_task(queue.transcribe("https://v/slow"))
+
+    worst = 0.0
+    while not job.done():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start)
+
+    await job
+    assert worst < 0.1
+
+@pytest.mark.asyncio
+async def test_progress_streams_lines_before_the_job_finishes(tmp_path):
+    queue = MediaJobQueue(workers=1, queue_size=1, model_size="tiny", temp_dir=str(tmp_path), job=streaming_job)
+    queue.progress_interval = 0.05
+    batches = []
+
+    try:
+        job = asyncio.create_task(queue.transcribe("https://v/1", on_progress=batches.append))
+        while not batches:
+            await asyncio.sleep(0.01)
+        assert not job.done()
+
+        transcript, metadata = await job
+    finally:
+        queue.close()
+
+    assert [line for batch in batches for line in batch] == transcript.split("\n")
+    assert len(batches) > 1
+    assert metadata == {"title": "https://v/1"}
+    assert not list(tmp_path.glob("*.partial"))
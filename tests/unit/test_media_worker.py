@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+import yt_dlp
+from types import SimpleNamespace
+from nexus_insight.tools import media_worker
+from nexus_insight.tools.media_worker import (
+    SAMPLING_RATE, JobCancelled, decode_pcm, format_timestamp, plan_segments, resolve_media_id, transcribe_segments
+)
+
+class FakeWhisper:
+    """One "segment" per 10 s of audio, labelled with the sample the slice starts at."""
+
+    def transcribe(self, audio, beam_size=5):
+        seconds = len(audio) / SAMPLING_RATE
+        segments = [
+            SimpleNamespace(start=float(t), text=f"chunk@{int(audio[0])}+{t}")
+            for t in range(0, int(seconds), 10)
+        ]
+        return iter(segments), None
+
+def _span(start_s, end_s):
+    return {"start": int(start_s * SAMPLING_RATE), "end": int(end_s * SAMPLING_RATE)}
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "[00:00:00]"
+    assert format_timestamp(3725.9) == "[01:02:05]"
+
+def test_plan_segments_cuts_only_at_silence_and_respects_the_limit():
+    speech = [_span(0, 40), _span(42, 80), _span(85, 130), _span(131, 150)]
+
+    segments = plan_segments(speech, 100 * SAMPLING_RATE)
+
+    assert segments == [(_span(0, 80)["start"], _span(0, 80)["end"]), (_span(85, 150)["start"], _span(85, 150)["end"])]
+    assert all(end - start <= 100 * SAMPLING_RATE for start, end in segments)
+
+def test_plan_segments_splits_a_span_longer_than_the_limit():
+    segments = plan_segments([_span(0, 250)], 100 * SAMPLING_RATE)
+
+    assert [(s / SAMPLING_RATE, e / SAMPLING_RATE) for s, e in segments] == [(0, 100), (100, 200), (200, 250)]
+
+def test_plan_segments_empty():
+    assert plan_segments([], SAMPLING_RATE) == []
+
+def test_transcribe_segments_stitches_absolute_timestamps_in_order():
+    audio = np.arange(400 * SAMPLING_RATE, dtype="float32")
+    segments = [(0, 20 * SAMPLING_RATE), (360 * SAMPLING_RATE, 380 * SAMPLING_RATE)]
+    lines = transcribe_segments(FakeWhisper(), audio, segments, parallelism=2).split("\n")
+
+    assert lines == [
+        "[00:00:00] chunk@0+0",
+        "[00:00:10] chunk@0+10",
+        f"[00:06:00] chunk@{360 * SAMPLING_RATE}+0",
+        f"[00:06:10] chunk@{360 * SAMPLING_RATE}+10",
+    ]
+
+def test_transcribe_segments_honours_cancellation(tmp_path):
+    cancel = tmp_path / "job.cancel"
+    cancel.touch()
+
+    with pytest.raises(JobCancelled):
+        transcribe_segments(FakeWhisper(), np.zeros(SAMPLING_RATE * 20, dtype="float32"), [(0, SAMPLING_RATE * 20)], 2, str(cancel))
+
+def test_transcribe_segments_emits_lines_in_order(tmp_path):
+    audio = np.arange(100 * SAMPLING_RATE, dtype="float32")
+    segments = [(i * 20 * SAMPLING_RATE, (i + 1) * 20 * SAMPLING_RATE) for i in range(5)]
+    progress = tmp_path / "job.partial"
+
+    transcript = transcribe_segments(FakeWhisper(), audio, segments, 3, progress_path=str(progress))
+
+    assert progress.read_text().splitlines() == transcript.split("\n")
+
+def test_decode_pcm_resamples_to_16k_mono(tmp_path):
+    import wave
+    rate, seconds = 44100, 2
+    t = np.arange(rate * seconds) / rate
+    tone = (np.sin(2 * np.pi * 440 * t) * 0.5 * 32767).astype("<i2")
+    path = tmp_path / "tone.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(np.repeat(tone, 2).tobytes())
+
+    pcm = decode_pcm(str(path))
+
+    assert pcm.dtype == np.float32
+    assert abs(len(pcm) - SAMPLING_RATE * seconds) < SAMPLING_RATE * 0.05
+    assert 0.45 < np.abs(pcm).max() <= 0.55
+
+def test_media_ids_resolve_locally_without_network(monkeypatch):
+    class Offline:
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("network lookup")
+
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", Offline)
+
+    ids = {resolve_media_id(url) for url in [
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=30s",
+    ]}
+    assert ids == {"Youtube:dQw4w9WgXcQ"}
+    assert resolve_media_id("https://vimeo.com/76979871") == "Vimeo:76979871"
+
+def test_playlist_and_unknown_urls_still_go_to_the_extractor(monkeypatch):
+    calls = []
+
+    class FakeYDL:
+        def __init__(self, opts):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, url, download, process):
+            calls.append(url)
+            return {"ie_key": "Youtube", "id": "dQw4w9WgXcQ"}
+
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", FakeYDL)
+
+    assert resolve_media_id("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PL123") == "Youtube:dQw4w9WgXcQ"
+    assert media_worker.local_media_id("https://example.com/talk.mp4") is None
+    assert len(calls) == 1
+
+def test_generic_file_names_do_not_collide_across_hosts(monkeypatch):
+    class FakeYDL:
+        def __init__(self, opts):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, url, download, process):
+            # Generic ids are the file name without its extension
+            return {"ie_key": "Generic", "id": "lecture"}
+
+    monkeypatch.setattr(yt_dlp, "YoutubeDL", FakeYDL)
+
+    a = resolve_media_id("https://a.com/x/lecture.mp4")
+    b = resolve_media_id("https://b.org/lecture.mp4")
+
+    assert a != b
+    assert a.startswith("url:") and b.startswith("url:")
+    assert resolve_media_id("https://a.com/x/lecture.mp4") == a
@@ -0,0 +1,173 @@
+import faiss
+import fitz
+import numpy as np
+import pytest
+from nexus_insight.tools.pdf_engine import PDFEngine
+from nexus_insight.tools.index_store import IndexStore
+from nexus_insight.tools.global_index import GlobalVectorIndex
+
+class FakeEmbedder:
+    """Deterministic one-hot embeddings over a tiny vocabulary."""
+    VOCAB = ["battery", "lithium", "solar", "wind"]
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def _vec(self, text):
+        v = np.array([text.lower().count(w) for w in self.VOCAB], dtype="float32") + 1e-3
+        return v / np.linalg.norm(v)
+
+    def embed_documents(self, texts):
+        return [self._vec(t).tolist() for t in texts]
+
+    def encode_documents(self, texts):
+        return np.array(self.embed_documents(texts), dtype="float32")
+
+    def embed_queries(self, texts):
+        self.encode_calls += 1
+        return np.stack([self._vec(t) for t in texts])
+
+    def get_dimension(self):
+        return len(self.VOCAB)
+
+@pytest.fixture
+def engine(tmp_path):
+    embedder = FakeEmbedder()
+    engine = PDFEngine(embedder, IndexStore(str(tmp_path)))
+    for key, chunks in {"a": ["battery battery", "solar panels"], "b": ["wind farms", "lithium mining"]}.items():
+        index = faiss.IndexFlatIP(embedder.get_dimension())
+        index.add(np.array(embedder.embed_documents(chunks), dtype="float32"))
+        engine.index_store.put(key, index, chunks, {})
+    return engine
+
+def test_query_index_batch_embeds_once_and_honours_exclusions(engine):
+    results = engine.query_index_batch(
+        ["pdf-a", "pdf-b", "pdf-missing"],
+        ["battery", "wind", "lithium"],
+        k=1,
+        exclude=[set(), {"pdf-b"}, {"pdf-a"}]
+    )
+
+    assert engine.embedder.encode_calls == 1
+    assert set(results[0]) == {"pdf-a", "pdf-b"}
+    assert results[0]["pdf-a"] == ["battery battery"]
+    assert set(results[1]) == {"pdf-a"}
+    assert results[2] == {"pdf-b": ["lithium mining"]}
+
+def test_lexical_only_until_embedder_is_loaded(engine):
+    engine.embedder.is_loaded = False
+    results = engine.query_index_batch(["pdf-a", "pdf-b"], ["lithium"], k=1)
+
+    assert engine.embedder.encode_calls == 0
+    assert results[0] == {"pdf-a": [], "pdf-b": ["lithium mining"]}
+
+def test_index_from_another_model_does_not_break_the_batch(engine):
+    stale = faiss.IndexFlatIP(3)
+    stale.add(np.eye(3, dtype="float32"))
+    engine.index_store.put("c", stale, ["battery", "solar", "wind"], {})
+
+    results = engine.query_index_batch(["pdf-a", "pdf-c"], ["battery"], k=1)
+
+    assert results[0]["pdf-a"] == ["battery battery"]
+    assert results[0]["pdf-c"] == ["battery"]  # lexical candidates only
+
+def test_query_index_matches_batch(engine):
+    assert engine.query_index("pdf-b", "wind", k=1) == ["wind farms"]
+    assert engine.query_index("pdf-missing", "wind") == []
+
+def test_library_search_serves_batched_queries(tmp_path, engine):
+    library = GlobalVectorIndex(str(tmp_path / "global"))
+    engine.global_index = library
+    for key in ("a", "b"):
+        engine._add_to_library(key, engine.index_store.get(key))
+    library._rebuild()
+    assert library.ready and library.ntotal == 4
+
+    results = engine.query_index_batch(
+        ["pdf-a", "pdf-b"],
+        ["battery lithium", "lithium"],
+        k=1,
+        exclude=[set(), {"pdf-b"}]
+    )
+    assert results[0] == {"pdf-a": ["battery battery"], "pdf-b": ["lithium mining"]}
+    assert set(results[1]) == {"pdf-a"}
+
+    hits = engine.search_library(["wind"], k=1, exclude={"pdf-a"})
+    assert [h["chunk"] for h in hits[0]] == ["wind farms"]
+
+@pytest.mark.asyncio
+async def test_library_documents_join_the_session(tmp_path, engine):
+    library = GlobalVectorIndex(str(tmp_path / "global"))
+    engine.global_index = library
+    for key in ("a", "b"):
+        engine._add_to_library(key, engine.index_store.get(key))
+    library._rebuild()
+
+    sources = await engine.library_sources(["wind power"], limit=1, session_id="s1")
+
+    assert [s.id for s in sources] == ["pdf-b"]
+    assert sources[0].embedding_index_id == "pdf-b"
+    assert engine.index_store.get_stats()["pinned"] == 1
+
+def test_library_adds_each_document_once_across_processes(tmp_path):
+    first = GlobalVectorIndex(str(tmp_path))
+    second = GlobalVectorIndex(str(tmp_path))
+    vectors = np.eye(4, dtype="float32")
+
+    first.add("a" * 32, vectors)
+    second.add("a" * 32, vectors)
+
+    assert second._log_rows() == 4
+
+def test_library_persists_index_and_state_as_one_generation(tmp_path):
+    library = GlobalVectorIndex(str(tmp_path))
+    for i in range(3):
+        library.add(f"{i:x}" * 32, np.eye(4, dtype="float32"))
+        library._rebuild()
+        library._persist()
+
+    state = library._read_json("state.json")
+    assert state["generation"] == 3 and state["rows"] == 12
+    assert sorted(p.name for p in tmp_path.glob("global.*.faiss")) == ["global.2.faiss", "global.3.faiss"]
+
+    reopened = GlobalVectorIndex(str(tmp_path))
+    reopened._rebuild()
+    assert reopened.ntotal == 12
+
+@pytest.mark.asyncio
+async def test_ingested_pdf_chunks_cite_their_page(tmp_path):
+    doc = fitz.open()
+    for text in ("Solar output rose sharply.", "Lithium battery prices fell."):
+        doc.new_page().insert_text((72, 72), text)
+    path = tmp_path / "report.pdf"
+    doc.save(str(path))
+
+    engine = PDFEngine(FakeEmbedder(), IndexStore(str(tmp_path / "indices")))
+    engine.CHUNK_SIZE, engine.CHUNK_OVERLAP = 30, 0
+    source = await engine.process_source(str(path))
+
+    chunks = engine.query_index(source.embedding_index_id, "lithium battery", k=1)
+    assert chunks == ["Lithium battery prices fell."]
+    assert chunks[0].page == 2
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_when_model_or_chunking_changes(tmp_path):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Lithium battery prices fell.")
+    path = tmp_path / "report.pdf"
+    doc.save(str(path))
+    embedder = FakeEmbedder()
+    embedder.model_name = "model-a"
+    engine = PDFEngine(embedder, IndexStore(str(tmp_path / "indices")))
+
+    source = await engine.process_source(str(path))
+    key = engine._store_key(source.embedding_index_id)
+    assert engine.index_store.get(key).meta["index"]["model"] == "model-a"
+
+    embedder.model_name = "model-b"
+    await engine.process_source(str(path))
+    assert engine.index_store.get(key).meta["index"]["model"] == "model-b"
+
+    engine.CHUNK_SIZE = 20
+    await engine.process_source(str(path))
+    assert engine.index_store.get(key).meta["index"]["chunk_size"] == 20
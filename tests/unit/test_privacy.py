@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from nexus_insight.infra.privacy import PrivacyService
+
+class FakeNlp:
+    """Tags known names; records how many texts reach the NER."""
+
+    ENTITIES = {"Alice Smith": "PERSON", "Paris": "GPE", "Acme": "ORG"}
+
+    def __init__(self):
+        self.seen = []
+
+    def pipe(self, texts, batch_size=64):
+        for text in texts:
+            self.seen.append(text)
+            ents = []
+            for name, label in self.ENTITIES.items():
+                start = text.find(name)
+                if start >= 0:
+                    ents.append(SimpleNamespace(start_char=start, end_char=start + len(name), label_=label))
+            yield SimpleNamespace(ents=ents)
+
+@pytest.fixture
+def service():
+    svc = PrivacyService()
+    svc.nlp = FakeNlp()
+    svc._loaded = True
+    return svc
+
+def test_regex_tier_redacts_without_ner(service):
+    text = "write to jane.doe@example.org or call +1 415-555-0132 about lithium prices"
+
+    assert service.redact(text) == "write to <EMAIL> or call <PHONE> about lithium prices"
+    assert service.nlp.seen == []
+
+def test_ner_only_runs_on_candidate_texts(service):
+    texts = [
+        "what is the price of lithium in 2023",
+        "How did battery costs fall?",
+        "the report by Alice Smith was presented in Paris",
+    ]
+
+    redacted = service.redact_batch(texts)
+
+    assert redacted == [
+        "what is the price of lithium in 2023",
+        "How did battery costs fall?",
+        "the report by <PERSON> was presented in <LOCATION>",
+    ]
+    assert service.nlp.seen == [texts[2]]
+
+def test_sentence_initial_and_single_names_reach_ner(service):
+    texts = ["Paris was chosen where?", "What did Alice Smith say?\nParis", "alice"]
+
+    redacted = service.redact_batch(texts)
+
+    assert redacted == ["<LOCATION> was chosen where?", "What did <PERSON> say?\n<LOCATION>", "alice"]
+    assert service.nlp.seen == texts[:2]
+
+def test_phone_shapes_are_redacted(service):
+    for phone in ["+1 415-555-0132", "+44 20 7946 0958", "(415) 555-0132", "415.555.0132", "020 7946 0958"]:
+        assert service.redact(f"call {phone} today") == "call <PHONE> today"
+
+def test_numbers_that_are_not_phones_are_kept(service):
+    texts = [
+        "sales went 100 200 300 in three quarters",
+        "prices in 1990 2000 2010 2020",
+        "output grew 1000 2000 3000 4000 tonnes",
+        "revenue 2021-2023 rose 12.5 13.7 14.2 percent",
+        "order 1234567890 shipped",
+        "values 415 555 0132 5555 in the table",
+    ]
+
+    assert service.redact_batch(texts) == texts
+
+def test_cache_and_duplicates_skip_the_pipeline(service):
+    text = "notes from Alice Smith, alice@example.com"
+
+    first = service.redact_batch([text, text])
+    second = service.redact(text)
+
+    assert first == [second, second] == ["notes from <PERSON>, <EMAIL>"] * 2
+    assert len(service.nlp.seen) == 1
+    assert service.get_stats()["cache"]["hits"] == 1
+
+def test_unrecognised_labels_and_empty_text_pass_through(service):
+    assert service.redact("") == ""
+    assert service.redact("the deal between Acme and them") == "the deal between Acme and them"
+
+def test_regex_tier_still_applies_without_a_model():
+    svc = PrivacyService(model_name="not-an-installed-model")
+
+    assert svc.redact("mail Bob at bob@example.com") == "mail Bob at <EMAIL>"
+    assert svc.get_stats()["ner_loaded"] is False
+
+@pytest.mark.asyncio
+async def test_batch_runs_off_the_event_loop(service, monkeypatch):
+    texts = [f"update {i}: contact ops{i}@example.com or 020 7946 {i:04d} re. battery supply" for i in range(5000)]
+    loop_ran = threading.Event()
+    redact_batch = service.redact_batch
+
+    def gated(batch):
+        # Only completes if the event loop keeps running while the batch is redacted
+        assert loop_ran.wait(5)
+        return redact_batch(batch)
+
+    async def tick():
+        await asyncio.sleep(0)
+        loop_ran.set()
+
+    monkeypatch.setattr(service, "redact_batch", gated)
+    redacted, _ = await asyncio.gather(service.aredact_batch(texts), tick())
+
+    assert redacted[7] == "update 7: contact <EMAIL> or <PHONE> re. battery supply"
+    assert service.nlp.seen == []  # No candidate names: the NER tier is skipped entirely
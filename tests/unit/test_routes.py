@@ -0,0 +1,36 @@
+import pytest
+from types import SimpleNamespace
+from nexus_insight.api import routes
+
+class FailingGraph:
+    async def astream(self, state, **kwargs):
+        yield "updates", {"intake": {"current_node": "intake"}}
+        raise RuntimeError("llm backend down")
+
+    async def ainvoke(self, state, **kwargs):
+        raise RuntimeError("llm backend down")
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    released = []
+
+    async def release_session(session_id):
+        released.append(session_id)
+
+    orch = SimpleNamespace(graph=FailingGraph(), release_session=release_session, released=released)
+    monkeypatch.setattr(routes, "_orchestrator", orch)
+    return orch
+
+@pytest.mark.asyncio
+async def test_failed_stream_releases_the_session(orchestrator):
+    events = [event async for event in routes._run_research_stream({"session_id": "s1"})]
+
+    assert events[-1].event == "error"
+    assert orchestrator.released == ["s1"]
+
+@pytest.mark.asyncio
+async def test_failed_blocking_run_releases_the_session(orchestrator):
+    with pytest.raises(RuntimeError):
+        await routes.start_research(query="lithium prices", stream=False, api_key="k")
+
+    assert len(orchestrator.released) == 1
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import asyncio
+import threading
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from nexus_insight.api import routes
+from nexus_insight.infra.warmup import WarmupManager
+
+HEAVY_MODULES = [
+    "torch", "transformers", "sentence_transformers", "presidio_analyzer", "spacy",
+    "faster_whisper", "yt_dlp", "langchain_groq", "langchain_ollama", "trafilatura", "fitz"
+]
+
+PROBE = """
+import json, sys
+import nexus_insight.main
+print(json.dumps({"modules": sorted(sys.modules)}))
+"""
+
+@pytest.fixture(scope="module")
+def cold_import():
+    env = dict(os.environ, OTEL_EXPORTER_ENDPOINT="", PYTHONWARNINGS="ignore")
+    out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, env=env, timeout=120)
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def test_app_import_leaves_heavy_dependencies_unloaded(cold_import):
+    assert [m for m in HEAVY_MODULES if m in cold_import["modules"]] == []
+
+@pytest.mark.asyncio
+async def test_ready_is_separate_from_health(monkeypatch):
+    warmup = WarmupManager()
+    warmup.register("slow-model", lambda: None)
+    monkeypatch.setattr(routes, "_orchestrator", object())
+    monkeypatch.setattr(routes, "_warmup", warmup)
+    app = FastAPI()
+    app.include_router(routes.router)
+    client = TestClient(app)
+
+    pending = client.get("/v1/ready")
+    assert pending.status_code == 503
+    assert pending.json()["components"]["slow-model"]["status"] == "pending"
+
+    await warmup.run()
+    ready = client.get("/v1/ready")
+    assert ready.status_code == 200 and ready.json()["ready"] is True
+
+@pytest.mark.asyncio
+async def test_warmup_runs_steps_concurrently_and_reports_failures():
+    def broken():
+        raise RuntimeError("model missing")
+
+    # Each step waits for the other; run one after another, both would time out and fail
+    both_running = threading.Barrier(2, timeout=5)
+    warmup = WarmupManager()
+    warmup.register("a", both_running.wait)
+    warmup.register("b", both_running.wait)
+    warmup.register("c", broken)
+
+    await warmup.run()
+    status = warmup.get_status()
+    assert status["ready"] is True and status["degraded"] == ["c"]
+
+@pytest.mark.asyncio
+async def test_warmup_start_schedules_without_waiting():
+    loaded = threading.Event()
+    warmup = WarmupManager()
+    warmup.register("slow-model", lambda: loaded.wait(5))
+
+    task = warmup.start()
+    await asyncio.sleep(0.01)
+
+    assert not task.done() and not warmup.is_ready
+    assert warmup.get_status()["components"]["slow-model"]["status"] == "loading"
+    assert warmup.start() is task
+
+    loaded.set()
+    await task
+    assert warmup.is_ready
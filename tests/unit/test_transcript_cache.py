@@ -0,0 +1,82 @@
+import asyncio
+import zlib
+import pytest
+from nexus_insight.tools import media_analyzer
+from nexus_insight.tools.media_analyzer import MediaAnalyzer
+from nexus_insight.tools.transcript_cache import TranscriptCache, format_segments, parse_segments
+
+TRANSCRIPT = "[00:00:00] Hello there.\n[00:01:05] Second line.\n[01:00:00] An hour in."
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+class DownRedis:
+    async def get(self, key):
+        raise ConnectionError("redis down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+class FakeJobs:
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe(self, url, session_id=None, on_progress=None, key=None):
+        self.calls.append((url, key))
+        await asyncio.sleep(0.05)
+        return TRANSCRIPT, {"title": "Talk"}
+
+    def release_session(self, session_id):
+        pass
+
+def test_segments_round_trip():
+    segments = parse_segments(TRANSCRIPT)
+
+    assert segments[1] == {"start": 65, "text": "Second line."}
+    assert segments[2]["start"] == 3600
+    assert format_segments(segments) == TRANSCRIPT
+
+@pytest.mark.asyncio
+async def test_cache_stores_compressed_structured_segments():
+    redis = FakeRedis()
+    cache = TranscriptCache(client=lambda: redis)
+
+    await cache.set("Youtube:abc", "https://youtu.be/abc", TRANSCRIPT, {"title": "Talk"})
+    raw = redis.data["transcript:v2:Youtube:abc"]
+    entry = await cache.get("Youtube:abc")
+
+    assert isinstance(raw, bytes) and zlib.decompress(raw)
+    assert entry["metadata"] == {"title": "Talk"}
+    assert entry["segments"][0] == {"start": 0, "text": "Hello there."}
+    assert await cache.get("Youtube:other") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+@pytest.mark.asyncio
+async def test_cache_degrades_to_misses_without_redis():
+    cache = TranscriptCache(client=lambda: DownRedis())
+
+    await cache.set("Youtube:abc", "u", TRANSCRIPT, {})
+    assert await cache.get("Youtube:abc") is None
+
+@pytest.mark.asyncio
+async def test_url_variants_share_one_job_and_one_cache_entry(monkeypatch):
+    monkeypatch.setattr(media_analyzer, "resolve_media_id", lambda url: "Youtube:abc")
+    redis = FakeRedis()
+    analyzer = MediaAnalyzer()
+    analyzer.cache = TranscriptCache(client=lambda: redis)
+    analyzer.jobs = FakeJobs()
+
+    first = await analyzer.process_video("https://youtu.be/abc")
+    again = await analyzer.process_video("https://www.youtube.com/watch?v=abc&t=30")
+
+    assert analyzer.jobs.calls == [("https://youtu.be/abc", "Youtube:abc")]
+    assert first.id == again.id == "media-Youtube:abc"
+    assert again.content == TRANSCRIPT
+    assert again.metadata["title"] == "Talk"
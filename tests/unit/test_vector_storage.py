@@ -0,0 +1,36 @@
+import numpy as np
+from nexus_insight.cognition.embeddings import truncate_embeddings
+from nexus_insight.evaluation.vector_storage import measure_storage_recall
+from nexus_insight.tools.index_store import IndexStore, new_ip_index
+
+def _normalized(n, dim, seed):
+    v = np.random.default_rng(seed).normal(size=(n, dim)).astype("float32")
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+def test_compressed_storage_keeps_recall_and_shrinks_index():
+    docs, queries = _normalized(2000, 64, 0), _normalized(50, 64, 1)
+    report = {(r["storage"], r["dimension"]): r for r in measure_storage_recall(docs, queries, k=10, truncate_dims=(None, 32))}
+
+    assert report[("float32", 64)]["recall_at_k"] == 1.0
+    assert report[("float16", 64)]["recall_at_k"] >= 0.98
+    assert report[("int8", 64)]["recall_at_k"] >= 0.85
+    assert report[("float16", 64)]["compression"] == 2.0
+    assert report[("int8", 64)]["compression"] == 4.0
+    assert report[("float16", 32)]["compression"] == 4.0
+
+def test_truncation_renormalizes():
+    truncated = truncate_embeddings(_normalized(5, 16, 2), 8)
+    assert truncated.shape == (5, 8)
+    np.testing.assert_allclose(np.linalg.norm(truncated, axis=1), 1.0, rtol=1e-5)
+
+def test_quantized_index_round_trips_through_store(tmp_path):
+    docs = _normalized(20, 16, 3)
+    index = new_ip_index(16, "int8")
+    index.train(docs)
+    index.add(docs)
+    IndexStore(str(tmp_path)).put("q8", index, [f"chunk {i}" for i in range(20)], {})
+
+    entry = IndexStore(str(tmp_path)).get("q8")
+    _, ids = entry.index.search(docs[:3], 1)
+    assert ids[:, 0].tolist() == [0, 1, 2]
+    assert entry.nbytes < 20 * 16 * 4 + 200
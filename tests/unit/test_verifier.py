@@ -79,3 +79,33 @@ async def test_verify_claims_cross_verification(mock_router, dummy_source, other
     assert verified_claims[0].verified is True
     assert verified_claims[0].confidence > 0.5
     assert len(contradictions) == 0
+
+@pytest.mark.asyncio
+async def test_prefetched_extraction_is_reused_for_the_final_source(dummy_source):
+    from types import SimpleNamespace
+    prompts = []
+
+    async def ainvoke(prompt, **kwargs):
+        prompts.append(prompt)
+        return SimpleNamespace(
+            content='{"claims": [{"content": "Early claim", "confidence": 0.8}]}',
+            response_metadata={"token_usage": {"total_tokens": 7}}
+        )
+
+    router = AsyncMock()
+    router.get_llm.return_value = SimpleNamespace(ainvoke=ainvoke)
+    verifier = ChainOfVerificationVerifier(router)
+
+    window = "x" * verifier.EXTRACTION_WINDOW
+    short = dummy_source.model_copy(update={"id": "media-1", "content": "x" * 100})
+    partial = dummy_source.model_copy(update={"id": "media-1", "content": window + "[00:12:00] more"})
+    final = dummy_source.model_copy(update={"id": "media-1", "content": window + "[00:12:00] more\n[00:59:00] end"})
+
+    assert verifier.prefetch_claims(short) is False
+    assert verifier.prefetch_claims(partial) is True
+    assert verifier.prefetch_claims(partial) is False
+    claims, tokens = await verifier.extract_claims([final])
+
+    assert [c.content for c in claims] == ["Early claim"]
+    assert tokens == 7
+    assert len(prompts) == 1
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+from nexus_insight.tools.web_search import WebSearchTool, normalize_url
+from nexus_insight.agents.researcher import ResearcherAgent
+from nexus_insight.infra.fetch_scheduler import FetchScheduler, DomainBackoffError
+from nexus_insight.cognition.state import RawSource, SourceType
+
+def test_normalize_url():
+    assert normalize_url("https://WWW.Example.com/a/?utm_source=x&b=2&a=1#frag") == "https://example.com/a?a=1&b=2"
+    assert normalize_url("http://example.com:80") == "http://example.com/"
+    assert normalize_url("https://example.com/a") == normalize_url("https://example.com/a/")
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_are_coalesced():
+    tool = WebSearchTool()
+    calls = 0
+
+    async def fake_fetch(search_res, trust_score=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return RawSource(
+            id="web-1",
+            source_type=SourceType.WEB,
+            url=search_res["url"],
+            content="x" * 300,
+            metadata={},
+            trust_score=0.5,
+            fetched_at=datetime.now()
+        )
+
+    tool._fetch_content = fake_fetch
+    hit = {"url": "https://example.com/page", "title": "t", "snippet": "s"}
+    twin = {"url": "https://www.example.com/page/?utm_medium=feed", "title": "t", "snippet": "s"}
+
+    results = await asyncio.gather(tool.fetch(hit), tool.fetch(twin), tool.fetch_many([hit, twin]))
+
+    assert calls == 1
+    assert results[0] is results[1]
+    assert len(results[2]) == 1
+
+@pytest.mark.asyncio
+async def test_explore_fetches_each_url_once():
+    web_tool = AsyncMock()
+    web_tool.search_hits.side_effect = [
+        [{"url": "https://a.com/x", "title": "A", "snippet": ""}, {"url": "https://b.com/y", "title": "B", "snippet": ""}],
+        [{"url": "https://www.a.com/x/", "title": "A", "snippet": ""}],
+    ]
+    web_tool.fetch_many.return_value = []
+
+    researcher = ResearcherAgent(web_tool, AsyncMock(), AsyncMock(), AsyncMock(), AsyncMock())
+    await researcher.explore(["quantum computing basics", "Quantum computing basics?", "qubit error rates"], ["web"])
+
+    assert web_tool.search_hits.await_count == 2
+    hits = web_tool.fetch_many.await_args.args[0]
+    assert [h["url"] for h in hits] == ["https://a.com/x", "https://b.com/y"]
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_domain_concurrency_and_backs_off():
+    scheduler = FetchScheduler(max_in_flight=8, per_domain=1, min_interval=0.0)
+    active = peak = 0
+
+    async def fetch(url):
+        nonlocal active, peak
+        async with scheduler.slot(url):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*[fetch(f"https://slow.example/{i}") for i in range(4)])
+    assert peak == 1
+
+    scheduler.record_response("https://slow.example/x", 429, retry_after="30")
+    with pytest.raises(DomainBackoffError):
+        async with scheduler.slot("https://www.slow.example/y", max_wait=1.0):
+            pass
+    assert scheduler.get_stats()["domains_backing_off"] == 1
+
+@pytest.mark.asyncio
+async def test_scheduler_admits_higher_priority_waiters_first():
+    scheduler = FetchScheduler(max_in_flight=1, per_domain=4, min_interval=0.0)
+    started = []
+    release = asyncio.Event()
+
+    async def fetch(url, priority):
+        async with scheduler.slot(url, priority=priority):
+            started.append(url)
+            if url == "https://first.example/":
+                await release.wait()
+
+    holder = asyncio.create_task(fetch("https://first.example/", 0.5))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(fetch(f"https://{name}.example/", p))
+               for name, p in [("low", 0.1), ("high", 0.9), ("mid", 0.5)]]
+    await asyncio.sleep(0.01)
+    assert scheduler.get_stats()["queued"] == 3
+
+    release.set()
+    await asyncio.gather(holder, *waiters)
+    assert started == ["https://first.example/", "https://high.example/", "https://mid.example/", "https://low.example/"]
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_domain_state_while_callers_wait(monkeypatch):
+    monkeypatch.setattr(FetchScheduler, "_MAX_IDLE_DOMAINS", 2)
+    scheduler = FetchScheduler(max_in_flight=1, per_domain=1, min_interval=0.0)
+    release = asyncio.Event()
+
+    async def fetch(url):
+        async with scheduler.slot(url):
+            await release.wait()
+
+    # busy.example has no fetch running, only callers queued behind the global slot
+    tasks = [asyncio.create_task(fetch(url)) for url in
+             ["https://holder.example/", "https://busy.example/1", "https://busy.example/2"]]
+    await asyncio.sleep(0.01)
+    busy = scheduler._domains["busy.example"]
+
+    # Tracking a new domain prunes idle states, but not one with queued callers
+    scheduler.record_response("https://other.example/", 200)
+    assert scheduler._domains.get("busy.example") is busy
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+@pytest.mark.asyncio
+async def test_search_hits_are_cached_and_stale_entries_revalidate_in_background():
+    tool = WebSearchTool()
+    calls = 0
+
+    async def fake_ddg(query, max_results):
+        nonlocal calls
+        calls += 1
+        return [{"url": f"https://site{i}.com/{calls}", "title": "t", "snippet": ""} for i in range(3)]
+
+    tool._ddg_search = fake_ddg
+    first = await tool.search_hits("Solid State Batteries ")
+    assert await tool.search_hits("solid state batteries?") == first
+    assert calls == 1
+
+    tool.result_cache.ttl = 0.0  # everything is now stale but inside the stale window
+    stale = await tool.search_hits("solid state batteries")
+    assert stale == first
+    await asyncio.gather(*tool._revalidations)
+    assert calls == 2
+    tool.result_cache.ttl = 3600.0
+    assert (await tool.search_hits("solid state batteries"))[0]["url"].endswith("/2")